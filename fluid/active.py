@@ -0,0 +1,253 @@
+import os
+import sys
+import numpy as np
+from typing import List, Tuple
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+from fluid.const import R
+from fluid.cubic import CubicModel, get_model, component_parameters, ln_fugacity_coefficients
+from fluid.eos import MixtureEoS
+from fluid.mixing import WilkeMixer, PrausnitzGunn
+
+
+class ActiveSet:
+
+    """
+    Active-set pruning of zero and trace components
+
+    Components with mole fractions not above the threshold are dropped, the remaining fractions are renormalized and the
+    component arrays are compacted before the EoS and the mixing rules are called, so the O(n**2) sums run over the active
+    components only. Per-component results are scattered back to the full index space, logarithms of fugacity coefficients
+    of the pruned components are the ones at infinite dilution in the active mixture. The compacted EoS is cached per
+    composition, the mixing rule objects per active set
+
+    Args:
+        Tcs (list(float)): Critical temperatures of all components in K
+        Pcs (list(float)): Critical pressures of all components in Pa
+        MWs (list(float)): Molecular weights of all components in kg/mol
+        ws (list(float)): Acentric factors of all components
+        vcs (list(float)): Critical molar specific volumes of all components in m^3/mol. Optional. Default None, needed for Aungier EoS and Prausnitz-Gunn properties
+        k_ij (list(list(float))): Binary interaction parameters of all components. Optional. Default None
+        eos (str | CubicModel): EoS. Optional. Default "peng_robinson"
+        threshold (float): Mole fractions not above the threshold are pruned. Optional. Default 0.0, only zero fractions
+        cache_size (int): Maximum number of cached compositions and of cached mixing rule objects. Optional. Default 128
+
+    Attributes:
+        threshold (float): Pruning threshold
+        size (int): Number of all components
+    """
+
+    def __init__(self, Tcs: List[float], Pcs: List[float], MWs: List[float], ws: List[float], vcs: List[float]=None, k_ij: List[List[float]]=None, eos: str | CubicModel="peng_robinson", threshold: float=0.0, cache_size: int=128):
+
+        self.__Tcs = np.array(Tcs, dtype=float)
+        self.__Pcs = np.array(Pcs, dtype=float)
+        self.__MWs = np.array(MWs, dtype=float)
+        self.__ws = np.array(ws, dtype=float)
+        self.__vcs = None if vcs is None else np.array(vcs, dtype=float)
+        self.__k_ij = None if k_ij is None else np.array(k_ij, dtype=float)
+        self.__eos = eos
+        self.__model = get_model(eos)
+        self.__a, self.__b, self.__c, self.__kappa = component_parameters(self.__model, self.__Tcs, self.__Pcs, self.__ws, self.__vcs)
+        self.__threshold = float(threshold)
+        self.__cache_size = cache_size
+        self.__mixtures = {}
+        self.__mixers = {}
+
+    @property
+    def threshold(self):
+        return self.__threshold
+
+    @property
+    def size(self):
+        return self.__Tcs.size
+
+    def active(self, ys: np.ndarray) -> Tuple[np.ndarray]:
+
+        """
+        Selects active components of a composition
+
+        Args:
+            ys (np.ndarray): Mole fractions of all components of shape (n,)
+
+        Returns:
+            tuple: Indices of the active components and their renormalized mole fractions
+        """
+
+        ys = np.asarray(ys, dtype=float)
+        index = np.flatnonzero(ys > self.__threshold)
+        if index.size == 0:
+            raise ValueError(f"No component has mole fraction above the threshold {self.__threshold}")
+        ys_active = ys[index]
+        return index, ys_active / ys_active.sum()
+
+    def mixture(self, ys: np.ndarray) -> Tuple[MixtureEoS, np.ndarray]:
+
+        """
+        Builds EoS of the active components of a composition, cached per composition
+
+        Args:
+            ys (np.ndarray): Mole fractions of all components of shape (n,)
+
+        Returns:
+            tuple: EoS of the active components and their indices
+        """
+
+        ys = np.asarray(ys, dtype=float)
+        key = ys.tobytes()
+        if key not in self.__mixtures:
+            index, ys_active = self.active(ys)
+            select = lambda x: None if x is None else x[index]
+            k_ij = None if self.__k_ij is None else self.__k_ij[np.ix_(index, index)]
+            mixture = MixtureEoS(
+                ys_active, self.__Tcs[index], self.__Pcs[index], self.__MWs[index], self.__ws[index], select(self.__vcs),
+                k_ij=k_ij, eos=self.__eos
+            )
+            if len(self.__mixtures) >= self.__cache_size:
+                # Evict the oldest composition
+                del self.__mixtures[next(iter(self.__mixtures))]
+            self.__mixtures[key] = (mixture, index)
+        return self.__mixtures[key]
+
+    def scatter(self, values: np.ndarray, index: np.ndarray, fill: float=np.nan) -> np.ndarray:
+
+        """
+        Scatters per-component values of the active components to the full index space
+
+        Args:
+            values (np.ndarray): Values of shape (..., active components)
+            index (np.ndarray): Indices of the active components
+            fill (float): Value of the pruned components. Optional. Default NaN
+
+        Returns:
+            np.ndarray: Values of shape (..., n)
+        """
+
+        values = np.asarray(values)
+        full = np.full(values.shape[:-1] + (self.size,), fill, dtype=np.result_type(values, fill))
+        full[..., index] = values
+        return full
+
+    def residual_properties(self, T: np.ndarray, P: np.ndarray, ys: np.ndarray, phase: str="vapour", fill: float=None) -> dict:
+
+        """
+        Computes residual properties of a composition on its active components, see MixtureEoS.residual_properties.
+        Logarithms of fugacity coefficients are scattered to the full index space
+
+        Args:
+            T (np.ndarray): Temperatures in K. Broadcast against P
+            P (np.ndarray): Pressures in Pa. Broadcast against T
+            ys (np.ndarray): Mole fractions of all components of shape (n,)
+            phase (str): Root of the EoS. Optional. Default "vapour"
+            fill (float): Logarithm of fugacity coefficients of the pruned components, e.g. NaN. Optional. Default None, infinite dilution in the active mixture
+
+        Returns:
+            dict: Residual properties, ln_phi of shape (..., n)
+        """
+
+        mixture, index = self.mixture(ys)
+        properties = mixture.residual_properties(T, P, phase=phase)
+        ln_phi = self.scatter(properties["ln_phi"], index, np.nan if fill is None else fill)
+        pruned = np.setdiff1d(np.arange(self.size), index)
+        if fill is None and pruned.size:
+            ln_phi[..., pruned] = self.__dilution__(T, P, properties["Z"], mixture, index, pruned)
+        properties["ln_phi"] = ln_phi
+        return properties
+
+    def __dilution__(self, T: np.ndarray, P: np.ndarray, Z: np.ndarray, mixture: MixtureEoS, index: np.ndarray, pruned: np.ndarray) -> np.ndarray:
+
+        """
+        Computes logarithms of fugacity coefficients of the pruned components at infinite dilution in the mixture of the
+        active components. The cross attraction terms cost O(active * pruned)
+
+        Args:
+            T (np.ndarray): Temperatures in K. Broadcast against P
+            P (np.ndarray): Pressures in Pa. Broadcast against T
+            Z (np.ndarray): Compressibility factor of the active mixture
+            mixture (MixtureEoS): EoS of the active components
+            index (np.ndarray): Indices of the active components
+            pruned (np.ndarray): Indices of the pruned components
+
+        Returns:
+            np.ndarray: Logarithms of fugacity coefficients of shape (..., pruned components)
+        """
+
+        T, P = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P, dtype=float))
+        s_active = np.sqrt(self.__model.alpha(T[..., np.newaxis], self.__Tcs[index], self.__kappa[index]))
+        s_pruned = np.sqrt(self.__model.alpha(T[..., np.newaxis], self.__Tcs[pruned], self.__kappa[pruned]))
+        k_cross = 1.0 if self.__k_ij is None else 1 - self.__k_ij[np.ix_(index, pruned)]
+        a_cross = k_cross * np.sqrt(np.outer(self.__a[index], self.__a[pruned]))
+        psi = s_pruned * ((mixture.ys * s_active) @ a_cross)
+
+        a_mix = mixture.attraction(T)[0]
+        RT = R * T
+        A, B, C = a_mix * P / RT**2, mixture.b_mix * P / RT, mixture.c_mix * P / RT
+        return ln_fugacity_coefficients(
+            self.__model, Z, A, B, C,
+            2 * psi / a_mix[..., np.newaxis], self.__b[pruned] / mixture.b_mix, self.__c[pruned] / mixture.b_mix
+        )
+
+    def __mixer__(self, index: np.ndarray, Tc_method: str=None, Vc_method: str=None) -> WilkeMixer | PrausnitzGunn:
+
+        """
+        Builds a mixing rule object of an active set, cached per active set and methods like the compositions
+
+        Args:
+            index (np.ndarray): Indices of the active components
+            Tc_method, Vc_method (str): Prausnitz-Gunn methods. Optional. Default None, Wilke's rule
+
+        Returns:
+            WilkeMixer | PrausnitzGunn: Mixing rule of the active components
+        """
+
+        key = (index.tobytes(), Tc_method, Vc_method)
+        if key not in self.__mixers:
+            if Tc_method is None:
+                mixer = WilkeMixer(self.__MWs[index])
+            else:
+                mixer = PrausnitzGunn(self.__Tcs[index], self.__vcs[index], self.__ws[index], self.__MWs[index], Tc_method, Vc_method)
+            if len(self.__mixers) >= self.__cache_size:
+                # Evict the oldest mixing rule
+                del self.__mixers[next(iter(self.__mixers))]
+            self.__mixers[key] = mixer
+        return self.__mixers[key]
+
+    def wilke(self, ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+
+        """
+        Mixes a property of the components by Wilke's rule over the active components
+
+        Args:
+            ys (np.ndarray): Mole fractions of all components of shape (n,)
+            xs (np.ndarray): Property of all components of shape (..., n)
+
+        Returns:
+            np.ndarray: Property of the mixture of shape (...)
+        """
+
+        index, ys_active = self.active(ys)
+        return self.__mixer__(index)(ys_active, np.asarray(xs, dtype=float)[..., index])
+
+    def prausnitz_gunn(self, ys: np.ndarray, Tc_method: str="kay", Vc_method: str="kay") -> dict:
+
+        """
+        Computes Prausnitz-Gunn pseudo critical properties over the active components
+
+        Args:
+            ys (np.ndarray): Mole fractions of all components of shape (n,)
+            Tc_method (str): Method to mix critical temperature. Optional. Default "kay"
+            Vc_method (str): Method to mix critical molar specific volume. Optional. Default "kay"
+
+        Returns:
+            dict: Pseudocritical parameters (Tc_mix [K], Pc_mix [Pa], Vc_mix [m^3/mol], rhoc_mix [kg/m^3], Zc_mix) and acentric factor ws_mix of the mixture
+        """
+
+        if self.__vcs is None:
+            raise ValueError(f"Critical volumes are needed for Prausnitz-Gunn properties")
+        index, ys_active = self.active(ys)
+        return self.__mixer__(index, Tc_method, Vc_method)(ys_active)
@@ -0,0 +1,218 @@
+import os
+import sys
+import warnings
+import numpy as np
+from typing import List, Tuple
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+from fluid.const import R, P0
+from fluid.eos import MixtureEoS
+from fluid.flash import ph_flash, ps_flash
+import fluid.nasa as nasa
+
+
+def __state__(mixture: MixtureEoS, coefficients: List, T: np.ndarray, P: np.ndarray) -> Tuple[np.ndarray]:
+
+    """
+    Computes molar enthalpy, entropy and volume of the mixture on the stable root of the EoS
+
+    Args:
+        mixture (MixtureEoS): EoS of the mixture
+        coefficients (list): NASA coefficients of the components in database format
+        T (np.ndarray): Temperatures in K
+        P (np.ndarray): Pressures in Pa
+
+    Returns:
+        tuple: Enthalpy [J/mol], entropy [J/(mol K)] and volume [m^3/mol]
+    """
+
+    ys = mixture.ys
+    ideal = nasa.compute_species(T, coefficients)
+    residual = mixture.residual_properties(T, P, phase="stable")
+    s_mixing = -np.sum(ys[ys > 0] * np.log(ys[ys > 0]))
+
+    h = R * T * (ideal["h0"] @ ys) + residual["H_dep"]
+    s = R * (ideal["s0"] @ ys + s_mixing - np.log(P / P0)) + residual["S_dep"]
+    v = residual["Z"] * R * T / P
+    return h, s, v
+
+
+def schultz(mixture: MixtureEoS, coefficients: List, T1: np.ndarray, P1: np.ndarray, T2: np.ndarray, P2: np.ndarray, stability: bool=False) -> dict:
+
+    """
+    Computes polytropic head and efficiency of compression cases from suction and discharge states by Schultz's method.
+    The isentropic discharge state is found by the PS flash warm started from the actual discharge temperature.
+    The polytropic head n / (n - 1) * (P2 * v2 - P1 * v1) is corrected by Schultz's factor
+    f = (h2s - h1) / (ns / (ns - 1) * (P2 * v2s - P1 * v1)), where n and ns are the volume exponents of the actual
+    and the isentropic compression
+
+    Args:
+        mixture (MixtureEoS): EoS of the gas
+        coefficients (list): NASA coefficients of the components in database format
+        T1 (np.ndarray): Suction temperatures in K
+        P1 (np.ndarray): Suction pressures in Pa
+        T2 (np.ndarray): Discharge temperatures in K
+        P2 (np.ndarray): Discharge pressures in Pa
+        stability (bool): Test stability of the isentropic discharge states. Optional. Default False
+
+    Returns:
+        dict: Polytropic head polytropic_head and isentropic head isentropic_head [J/kg], actual enthalpy rise work [J/kg],
+        polytropic and isentropic efficiencies polytropic_efficiency, isentropic_efficiency, volume exponents n, ns,
+        Schultz's factor f and isentropic discharge temperatures T2s [K] of the broadcast shape of the cases
+    """
+
+    T1, P1, T2, P2 = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (T1, P1, T2, P2)])
+    h1, s1, v1 = __state__(mixture, coefficients, T1, P1)
+    h2, _, v2 = __state__(mixture, coefficients, T2, P2)
+
+    T2s = ps_flash(mixture, coefficients, P2, s1, T0=T2, stability=stability)["T"]
+    h2s, _, v2s = __state__(mixture, coefficients, T2s, P2)
+
+    ln_pr = np.log(P2 / P1)
+    n = ln_pr / np.log(v1 / v2)
+    ns = ln_pr / np.log(v1 / v2s)
+    f = (h2s - h1) / (ns / (ns - 1) * (P2 * v2s - P1 * v1))
+    head = f * n / (n - 1) * (P2 * v2 - P1 * v1)
+
+    MW = mixture.MW_mix
+    return {
+        "polytropic_head": head / MW,
+        "isentropic_head": (h2s - h1) / MW,
+        "work": (h2 - h1) / MW,
+        "polytropic_efficiency": head / (h2 - h1),
+        "isentropic_efficiency": (h2s - h1) / (h2 - h1),
+        "n": n,
+        "ns": ns,
+        "f": f,
+        "T2s": T2s
+    }
+
+
+def __integrate_path__(mixture: MixtureEoS, coefficients: List, T1: np.ndarray, P1: np.ndarray, P2: np.ndarray, efficiency: np.ndarray, steps: int, stability: bool, T_guess: np.ndarray=None) -> Tuple[np.ndarray]:
+
+    """
+    Integrates the polytropic path dh = v dP / efficiency from suction to discharge pressure in geometric pressure steps.
+    Every step is a trapezoidal predictor-corrector in ln P, the integrand P * v = Z * R * T changes slowly in ln P.
+    The PH flash of the predictor is warm started by the temperatures of a previous path or by extrapolation of the
+    temperature ratio of the previous step, the PH flash of the corrector by the predictor
+
+    Args:
+        mixture (MixtureEoS): EoS of the gas
+        coefficients (list): NASA coefficients of the components in database format
+        T1, P1, P2 (np.ndarray): Suction temperatures in K, suction and discharge pressures in Pa
+        efficiency (np.ndarray): Polytropic efficiencies
+        steps (int): Number of pressure steps
+        stability (bool): Test stability of the states on the path
+        T_guess (np.ndarray): Temperatures of a previous path of shape (steps + 1, ...). Optional. Default None
+
+    Returns:
+        tuple: Temperatures and pressures of the path of shape (steps + 1, ...), polytropic head [J/mol] and convergence
+        flags of the PH flashes of the path
+    """
+
+    h, _, v = __state__(mixture, coefficients, T1, P1)
+    ratio = (P2 / P1)**(1 / steps)
+    ln_ratio = np.log(ratio)
+    T, P = T1, P1
+    T_ratio = ratio**0.25
+    head = np.zeros(T1.shape)
+    converged = np.ones(T1.shape, dtype=bool)
+    Ts, Ps = [T1], [P1]
+    for k in range(steps):
+        P_next = P * ratio
+
+        predictor = ph_flash(mixture, coefficients, P_next, h + P * v * ln_ratio / efficiency, T0=T * T_ratio if T_guess is None else T_guess[k + 1], stability=stability)
+        dhp = 0.5 * (P * v + predictor["Z"] * R * predictor["T"]) * ln_ratio
+        corrector = ph_flash(mixture, coefficients, P_next, h + dhp / efficiency, T0=predictor["T"], stability=stability)
+
+        converged &= predictor["converged"] & corrector["converged"]
+        T_ratio = corrector["T"] / T
+        T, P = corrector["T"], P_next
+        h, v = h + dhp / efficiency, corrector["Z"] * R * T / P
+        head += dhp
+        Ts.append(T)
+        Ps.append(P)
+
+    return np.stack(Ts), np.stack(Ps), head, converged
+
+
+def compression_path(mixture: MixtureEoS, coefficients: List, T1: np.ndarray, P1: np.ndarray, P2: np.ndarray, efficiency: np.ndarray=None, T2: np.ndarray=None, steps: int=10, tol: float=1e-8, max_iter: int=20, stability: bool=False) -> dict:
+
+    """
+    Computes real gas polytropic compression of many cases at once by stepwise integration of dh = v dP / efficiency.
+    Either polytropic efficiency or discharge temperature must be given. With efficiency the path gives discharge
+    temperature and head. With discharge temperature the efficiency is found by secant iteration on the fixed point
+    efficiency = polytropic head / (h2 - h1) started from Schultz's efficiency, every path after the first one is
+    warm started from the temperatures of the previous one. RuntimeWarning is issued for the cases not converged
+
+    Args:
+        mixture (MixtureEoS): EoS of the gas
+        coefficients (list): NASA coefficients of the components in database format
+        T1 (np.ndarray): Suction temperatures in K
+        P1 (np.ndarray): Suction pressures in Pa
+        P2 (np.ndarray): Discharge pressures in Pa
+        efficiency (np.ndarray): Polytropic efficiencies. Optional. Default None
+        T2 (np.ndarray): Discharge temperatures in K. Optional. Default None
+        steps (int): Number of pressure steps of the path. Optional. Default 10
+        tol (float): Tolerance of efficiency when discharge temperature is given. Optional. Default 1e-8
+        max_iter (int): Maximum number of efficiency iterations. Optional. Default 20
+        stability (bool): Test stability of the states on the path. Optional. Default False
+
+    Returns:
+        dict: Discharge temperatures T2 [K], polytropic head polytropic_head and actual enthalpy rise work [J/kg],
+        polytropic efficiencies polytropic_efficiency of the path and convergence flags converged of the broadcast shape
+        of the cases, temperatures T_path [K] and pressures P_path [Pa] of the path of shape (steps + 1, ...)
+    """
+
+    if (efficiency is None) == (T2 is None):
+        raise ValueError(f"Either polytropic efficiency or discharge temperature must be given")
+
+    T1, P1, P2 = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (T1, P1, P2)])
+    MW = mixture.MW_mix
+
+    if efficiency is not None:
+        efficiency = np.broadcast_to(np.asarray(efficiency, dtype=float), T1.shape)
+        Ts, Ps, head, converged = __integrate_path__(mixture, coefficients, T1, P1, P2, efficiency, steps, stability)
+        if not np.all(converged):
+            warnings.warn(f"PH flash of the compression path has not converged for {np.sum(~converged)} cases", RuntimeWarning)
+        h1, _, _ = __state__(mixture, coefficients, T1, P1)
+        h2, _, _ = __state__(mixture, coefficients, Ts[-1], P2)
+        return {
+            "T2": Ts[-1], "polytropic_head": head / MW, "work": (h2 - h1) / MW,
+            "polytropic_efficiency": efficiency, "converged": converged, "T_path": Ts, "P_path": Ps
+        }
+
+    T2 = np.broadcast_to(np.asarray(T2, dtype=float), T1.shape)
+    h1, _, _ = __state__(mixture, coefficients, T1, P1)
+    h2, _, _ = __state__(mixture, coefficients, T2, P2)
+    efficiency = schultz(mixture, coefficients, T1, P1, T2, P2, stability=stability)["polytropic_efficiency"]
+    Ts, previous = None, None
+    for it in range(max_iter):
+        Ts, Ps, head, flashed = __integrate_path__(mixture, coefficients, T1, P1, P2, efficiency, steps, stability, Ts)
+        g = head / (h2 - h1) - efficiency
+        converged = (np.abs(g) <= tol * np.abs(efficiency)) & flashed
+        if np.all(converged) or it == max_iter - 1:
+            break
+
+        # Secant step on the residual of the fixed point, plain substitution for the first iteration
+        step = g
+        if previous is not None:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                secant = -g * (efficiency - previous[0]) / (g - previous[1])
+            step = np.where(np.isfinite(secant), secant, g)
+        previous = (efficiency, g)
+        efficiency = efficiency + step
+
+    # The efficiency is the one of the returned path, it is not updated after the last path
+    if not np.all(converged):
+        warnings.warn(f"Polytropic efficiency has not converged in {max_iter} iterations for {np.sum(~converged)} cases", RuntimeWarning)
+    return {
+        "T2": Ts[-1], "polytropic_head": head / MW, "work": (h2 - h1) / MW,
+        "polytropic_efficiency": efficiency, "converged": converged, "T_path": Ts, "P_path": Ps
+    }
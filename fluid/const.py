@@ -1,3 +1,4 @@
 R = 8.3144626 # J / mol K. Universal gas constant
 NA = 6.02214076e23 # Avogadro's nimber
 kB = 1.380649e-23 # J / K. Bolzman's constant
+P0 = 1e5 # Pa. Standard state pressure of NASA polynomials
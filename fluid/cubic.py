@@ -0,0 +1,389 @@
+"""
+Provides generalized two-parameter cubic equation of state
+
+P = R * T / (v - b + c) - a * alpha(T) / ((v + delta1 * b) * (v + delta2 * b))
+
+where   a = Omega_a * (R * Tc) ** 2 / Pc is the attraction parameter
+        b = Omega_b * R * Tc / Pc is the co-volume
+        alpha(T) is the temperature dependence of the attraction parameter
+        c is the volume correction of the repulsive term (zero for most models)
+
+Every supported EoS is a parameter set of the generalized cubic:
+Redlich-Kwong (delta1 = 1, delta2 = 0), Soave-Redlich-Kwong, Redlich-Kwong-Aungier and
+Peng-Robinson (delta1 = 1 + sqrt(2), delta2 = 1 - sqrt(2))
+"""
+
+import os
+import sys
+import numpy as np
+from dataclasses import dataclass
+from typing import Callable, Tuple
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+from fluid.const import R
+from fluid.roots import cubic_roots, horner
+
+
+def power_alpha(T: np.ndarray, Tc: np.ndarray, kappa: np.ndarray, derivatives: bool=False) -> np.ndarray | Tuple[np.ndarray]:
+
+    """
+    Computes alpha function alpha = (T / Tc) ** -kappa of Redlich-Kwong and Redlich-Kwong-Aungier EoS
+
+    Args:
+        T (np.ndarray): Temperature in K
+        Tc (np.ndarray): Critical temperature in K
+        kappa (np.ndarray): Temperature exponent
+        derivatives (bool): Return the first and second temperature derivatives too. Optional. Default False
+
+    Returns:
+        np.ndarray | tuple: alpha function or alpha function with its first and second temperature derivatives
+    """
+
+    alpha = (T / Tc)**(-kappa)
+    if not derivatives:
+        return alpha
+    return alpha, -kappa * alpha / T, kappa * (kappa + 1) * alpha / T**2
+
+
+def soave_alpha(T: np.ndarray, Tc: np.ndarray, kappa: np.ndarray, derivatives: bool=False) -> np.ndarray | Tuple[np.ndarray]:
+
+    """
+    Computes Soave alpha function alpha = (1 + kappa * (1 - sqrt(T / Tc))) ** 2 of Soave-Redlich-Kwong and Peng-Robinson EoS
+
+    Args:
+        T (np.ndarray): Temperature in K
+        Tc (np.ndarray): Critical temperature in K
+        kappa (np.ndarray): Slope of the alpha function
+        derivatives (bool): Return the first and second temperature derivatives too. Optional. Default False
+
+    Returns:
+        np.ndarray | tuple: alpha function or alpha function with its first and second temperature derivatives
+    """
+
+    g = 1 + kappa * (1 - np.sqrt(T / Tc))
+    if not derivatives:
+        return g**2
+    dg = -kappa / (2 * np.sqrt(T * Tc))
+    d2g = -dg / (2 * T)
+    return g**2, 2 * g * dg, 2 * (dg**2 + g * d2g)
+
+
+def aungier_liquid_alpha(T: np.ndarray, Tc: np.ndarray, kappa: np.ndarray, derivatives: bool=False) -> np.ndarray | Tuple[np.ndarray]:
+
+    """
+    Computes alpha function of Redlich-Kwong-Aungier EoS corrected below the critical temperature.
+    The temperature exponent is increased by n_liquid / kappa where n_liquid is a polynomial of temperature
+
+    Args:
+        T (np.ndarray): Temperature in K
+        Tc (np.ndarray): Critical temperature in K
+        kappa (np.ndarray): Temperature exponent
+        derivatives (bool): Return the first and second temperature derivatives too. Optional. Default False
+
+    Returns:
+        np.ndarray | tuple: alpha function or alpha function with its first and second temperature derivatives
+    """
+
+    coeffs = [-3.80666e+3, 6.59754e+1, -3.92603e-1, 6.11597e-4, 2.74395e-6, -1.18587e-8, 1.26942e-11]
+    T, Tc, kappa = np.broadcast_arrays(*[np.asarray(x, dtype=float) for x in (T, Tc, kappa)])
+    liquid = T < Tc
+    if not derivatives:
+        n_liquid = horner(coeffs, T)
+        return (T / Tc)**(-np.where(liquid, kappa + n_liquid / kappa, kappa))
+
+    n_liquid, dn_liquid, d2n_liquid = horner(coeffs, T, derivatives=2)
+    exponent = np.where(liquid, kappa + n_liquid / kappa, kappa)
+    alpha = (T / Tc)**(-exponent)
+    de = np.where(liquid, dn_liquid / kappa, 0.0)
+    d2e = np.where(liquid, d2n_liquid / kappa, 0.0)
+    ln_Tr = np.log(T / Tc)
+    dln_alpha = -de * ln_Tr - exponent / T
+    d2ln_alpha = -d2e * ln_Tr - 2 * de / T + exponent / T**2
+    return alpha, alpha * dln_alpha, alpha * (dln_alpha**2 + d2ln_alpha)
+
+
+def aungier_shift(Tc: np.ndarray, Pc: np.ndarray, vc: np.ndarray, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+
+    """
+    Computes Aungier volume correction of the repulsive term
+
+    Args:
+        Tc (np.ndarray): Critical temperature in K
+        Pc (np.ndarray): Critical pressure in Pa
+        vc (np.ndarray): Critical specific molar volume in m^3/mol
+        a (np.ndarray): Attraction parameter
+        b (np.ndarray): Co-volume in m^3/mol
+
+    Returns:
+        np.ndarray: Volume correction in m^3/mol
+    """
+
+    return R * Tc / (Pc + a / (vc * (vc + b))) + b - vc
+
+
+@dataclass(frozen=True)
+class CubicModel:
+
+    """
+    Parameter set of the generalized cubic EoS
+
+    Attributes:
+        name (str): Name of the EoS
+        delta1 (float): First root parameter of the attraction term denominator
+        delta2 (float): Second root parameter of the attraction term denominator
+        omega_a (float): Attraction parameter constant
+        omega_b (float): Co-volume constant
+        kappa (Callable): Function of acentric factor returning the parameter of the alpha function
+        alpha (Callable): Alpha function of temperature, critical temperature and kappa. With derivatives=True it also returns the first and second temperature derivatives
+        shift (Callable): Volume correction of critical temperature, pressure, molar volume, attraction parameter and co-volume. Optional. Default None, no volume correction
+    """
+
+    name: str
+    delta1: float
+    delta2: float
+    omega_a: float
+    omega_b: float
+    kappa: Callable[[np.ndarray], np.ndarray]
+    alpha: Callable[..., np.ndarray | Tuple[np.ndarray]]
+    shift: Callable[[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray], np.ndarray] = None
+
+
+REDLICH_KWONG = CubicModel(
+    "Redlich-Kwong", 1.0, 0.0, 0.42747, 0.08664,
+    lambda w: np.full(np.shape(w), 0.5), power_alpha
+)
+SOAVE_REDLICH_KWONG = CubicModel(
+    "Soave-Redlich-Kwong", 1.0, 0.0, 0.42747, 0.08664,
+    lambda w: 0.480 + 1.574 * w - 0.176 * w**2, soave_alpha
+)
+REDLICH_KWONG_AUNGIER = CubicModel(
+    "Redlich-Kwong-Aungier", 1.0, 0.0, 0.42747, 0.08664,
+    lambda w: 0.4986 + 1.1735 * w + 0.4754 * w**2, power_alpha, aungier_shift
+)
+PENG_ROBINSON = CubicModel(
+    "Peng-Robinson", 1 + np.sqrt(2), 1 - np.sqrt(2), 0.45724, 0.07780,
+    lambda w: 0.37464 + 1.54226 * w - 0.26993 * w**2, soave_alpha
+)
+
+MODELS = {
+    "standard": REDLICH_KWONG,
+    "soave": SOAVE_REDLICH_KWONG,
+    "aungier": REDLICH_KWONG_AUNGIER,
+    "peng_robinson": PENG_ROBINSON
+}
+
+
+def get_model(eos: str | CubicModel) -> CubicModel:
+
+    """
+    Returns parameter set of the generalized cubic EoS
+
+    Args:
+        eos (str | CubicModel): Name of the EoS ("standard", "soave", "aungier", "peng_robinson") or a parameter set
+
+    Returns:
+        CubicModel: Parameter set of the EoS
+    """
+
+    if isinstance(eos, CubicModel):
+        return eos
+    if eos not in MODELS:
+        raise RuntimeError(f"EOS model has not been determined")
+    return MODELS[eos]
+
+
+def component_parameters(model: CubicModel, Tcs: np.ndarray, Pcs: np.ndarray, ws: np.ndarray=None, vcs: np.ndarray=None) -> Tuple[np.ndarray]:
+
+    """
+    Computes temperature independent parameters of the components
+
+    Args:
+        model (CubicModel): Parameter set of the EoS
+        Tcs (np.ndarray): Critical temperatures in K
+        Pcs (np.ndarray): Critical pressures in Pa
+        ws (np.ndarray): Acentric factors. Optional. Default None, not needed for the Standard Redlich-Kwong EoS
+        vcs (np.ndarray): Critical specific molar volumes in m^3/mol. Optional. Default None, needed only for models with volume correction
+
+    Returns:
+        tuple: Attraction parameters a, co-volumes b, volume corrections c and alpha function parameters kappa
+    """
+
+    Tcs, Pcs = np.asarray(Tcs, dtype=float), np.asarray(Pcs, dtype=float)
+    ws = np.zeros(Tcs.shape) if ws is None else np.asarray(ws, dtype=float)
+
+    a = model.omega_a * (R * Tcs)**2 / Pcs
+    b = model.omega_b * R * Tcs / Pcs
+    kappa = model.kappa(ws)
+    if model.shift is None:
+        c = np.zeros(np.shape(b))
+    elif vcs is None:
+        raise RuntimeError(f"Critical specific molar volume is needed for {model.name} EoS")
+    else:
+        c = model.shift(Tcs, Pcs, np.asarray(vcs, dtype=float), a, b)
+
+    return a, b, c, kappa
+
+
+def z_coefficients(model: CubicModel, A: np.ndarray, B: np.ndarray, C: np.ndarray=0.0) -> list:
+
+    """
+    Computes coefficients of the cubic equation for compressibility factor
+    Z**3 + c2 * Z**2 + c1 * Z + c0 = 0
+
+    Args:
+        model (CubicModel): Parameter set of the EoS
+        A (np.ndarray): Dimensionless attraction parameter a * alpha * P / (R * T)**2
+        B (np.ndarray): Dimensionless co-volume b * P / (R * T)
+        C (np.ndarray): Dimensionless volume correction c * P / (R * T). Optional. Default 0.0
+
+    Returns:
+        list: Coefficients [1, c2, c1, c0], highest power first
+    """
+
+    s = model.delta1 + model.delta2
+    p = model.delta1 * model.delta2
+    E = C - B - 1
+
+    return [1, s * B + E, p * B**2 + E * s * B + A, E * p * B**2 + A * (C - B)]
+
+
+def compressibility(model: CubicModel, A: np.ndarray, B: np.ndarray, C: np.ndarray=0.0) -> Tuple[np.ndarray]:
+
+    """
+    Computes compressibility factors of the vapour-like and liquid-like roots of the generalized cubic EoS
+
+    Args:
+        model (CubicModel): Parameter set of the EoS
+        A (np.ndarray): Dimensionless attraction parameter a * alpha * P / (R * T)**2
+        B (np.ndarray): Dimensionless co-volume b * P / (R * T)
+        C (np.ndarray): Dimensionless volume correction c * P / (R * T). Optional. Default 0.0
+
+    Returns:
+        tuple: Arrays of the largest (vapour) and the smallest (liquid) compressibility factors
+    """
+
+    return cubic_roots(z_coefficients(model, A, B, C))
+
+
+def ln_gibbs_residual(model: CubicModel, Z: np.ndarray, A: np.ndarray, B: np.ndarray, C: np.ndarray=0.0) -> np.ndarray:
+
+    """
+    Computes dimensionless residual Gibbs energy G_res / (R * T), i.e. logarithm of fugacity coefficient of the mixture
+
+    Args:
+        model (CubicModel): Parameter set of the EoS
+        Z (np.ndarray): Compressibility factor
+        A (np.ndarray): Dimensionless attraction parameter a * alpha * P / (R * T)**2
+        B (np.ndarray): Dimensionless co-volume b * P / (R * T)
+        C (np.ndarray): Dimensionless volume correction c * P / (R * T). Optional. Default 0.0
+
+    Returns:
+        np.ndarray: Dimensionless residual Gibbs energy
+    """
+
+    delta = model.delta1 - model.delta2
+    L = np.log((Z + model.delta1 * B) / (Z + model.delta2 * B))
+    return Z - 1 - np.log(Z - B + C) - A / (B * delta) * L
+
+
+def select_root(model: CubicModel, Z_vapour: np.ndarray, Z_liquid: np.ndarray, A: np.ndarray, B: np.ndarray, C: np.ndarray=0.0, phase: str="vapour") -> np.ndarray:
+
+    """
+    Selects a root of the cubic EoS. Liquid roots which are below the physical limit Z > B - C are replaced by vapour roots
+
+    Args:
+        model (CubicModel): Parameter set of the EoS
+        Z_vapour (np.ndarray): The largest roots
+        Z_liquid (np.ndarray): The smallest roots
+        A (np.ndarray): Dimensionless attraction parameter a * alpha * P / (R * T)**2
+        B (np.ndarray): Dimensionless co-volume b * P / (R * T)
+        C (np.ndarray): Dimensionless volume correction c * P / (R * T). Optional. Default 0.0
+        phase (str): Root to select. Optional. Default "vapour". Available phases "vapour", "liquid" and "stable" for the root with the lowest Gibbs energy
+
+    Returns:
+        np.ndarray: Selected compressibility factors
+    """
+
+    if phase == "vapour":
+        return Z_vapour
+    Z_liquid = np.where(Z_liquid > B - C, Z_liquid, Z_vapour)
+    if phase == "liquid":
+        return Z_liquid
+    elif phase == "stable":
+        g_vapour = ln_gibbs_residual(model, Z_vapour, A, B, C)
+        g_liquid = ln_gibbs_residual(model, Z_liquid, A, B, C)
+        return np.where(g_liquid < g_vapour, Z_liquid, Z_vapour)
+    raise RuntimeError(f"Phase {phase} has not been determined")
+
+
+def ln_fugacity_coefficients(model: CubicModel, Z: np.ndarray, A: np.ndarray, B: np.ndarray, C: np.ndarray, a_ratio: np.ndarray, b_ratio: np.ndarray, c_ratio: np.ndarray) -> np.ndarray:
+
+    """
+    Computes logarithms of component fugacity coefficients in a mixture using van der Waals one-fluid mixing rules
+
+    Args:
+        model (CubicModel): Parameter set of the EoS
+        Z (np.ndarray): Compressibility factor of shape (...)
+        A (np.ndarray): Dimensionless attraction parameter of the mixture of shape (...)
+        B (np.ndarray): Dimensionless co-volume of the mixture of shape (...)
+        C (np.ndarray): Dimensionless volume correction of the mixture of shape (...)
+        a_ratio (np.ndarray): 2 * sum_j(x_j * a_ij) / a_mix of shape (..., n)
+        b_ratio (np.ndarray): b_i / b_mix of shape (..., n)
+        c_ratio (np.ndarray): c_i / b_mix of shape (..., n)
+
+    Returns:
+        np.ndarray: Logarithms of fugacity coefficients of shape (..., n)
+    """
+
+    Z, A, B, C = [np.asarray(x, dtype=float)[..., np.newaxis] for x in (Z, A, B, C)]
+    delta = model.delta1 - model.delta2
+    Zd1, Zd2 = Z + model.delta1 * B, Z + model.delta2 * B
+    L = np.log(Zd1 / Zd2)
+
+    return (
+        -np.log(Z - B + C) + B * (b_ratio - c_ratio) / (Z - B + C)
+        - A * b_ratio * Z / (Zd1 * Zd2)
+        - A / (B * delta) * (a_ratio - b_ratio) * L
+    )
+
+
+def departures(model: CubicModel, T: np.ndarray, P: np.ndarray, Z: np.ndarray, a: np.ndarray, da: np.ndarray, d2a: np.ndarray, b: np.ndarray, c: np.ndarray=0.0) -> dict:
+
+    """
+    Computes molar departure (residual) functions H - H_ig, S - S_ig, Cp - Cp_ig and Cv - Cv_ig at temperature and pressure
+
+    Args:
+        model (CubicModel): Parameter set of the EoS
+        T (np.ndarray): Temperature in K
+        P (np.ndarray): Pressure in Pa
+        Z (np.ndarray): Compressibility factor
+        a (np.ndarray): Attraction parameter a * alpha of the mixture
+        da (np.ndarray): First temperature derivative of the attraction parameter
+        d2a (np.ndarray): Second temperature derivative of the attraction parameter
+        b (np.ndarray): Co-volume of the mixture in m^3/mol
+        c (np.ndarray): Volume correction of the mixture in m^3/mol. Optional. Default 0.0
+
+    Returns:
+        dict: Departure enthalpy H_dep [J/mol], entropy S_dep [J/(mol K)], heat capacities Cp_dep and Cv_dep [J/(mol K)]
+    """
+
+    delta = model.delta1 - model.delta2
+    v = Z * R * T / P
+    vd1, vd2 = v + model.delta1 * b, v + model.delta2 * b
+    L = np.log(vd1 / vd2) / (b * delta)
+
+    H_dep = R * T * (Z - 1) + (T * da - a) * L
+    S_dep = R * np.log((v - b + c) * P / (R * T)) + da * L
+    Cv_dep = T * d2a * L
+
+    dP_dT = R / (v - b + c) - da / (vd1 * vd2)
+    dP_dv = -R * T / (v - b + c)**2 + a * (2 * v + (model.delta1 + model.delta2) * b) / (vd1 * vd2)**2
+    Cp_dep = Cv_dep - T * dP_dT**2 / dP_dv - R
+
+    return {"H_dep": H_dep, "S_dep": S_dep, "Cp_dep": Cp_dep, "Cv_dep": Cv_dep}
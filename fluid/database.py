@@ -0,0 +1,190 @@
+import os
+import sys
+import json
+import numpy as np
+from collections.abc import Mapping
+from typing import List
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+DATABASE_VERSION = 1
+COLUMNS = ("workbody", "molecular_weight", "heat_of_formation", "offsets", "bounds", "a", "b", "text_offsets", "text")
+
+
+def compile_database(source: str, path: str) -> str:
+
+    """
+    Compiles NASA Glenn database in json format (lib/thermo.json) to columnar binary format. Scalars of the species are
+    stored as columns, coefficients of all ranges of all species as contiguous arrays bounds (ranges, 2), a (ranges, 7)
+    and b (ranges, 2) with an offsets index of shape (species + 1,): ranges of species i are offsets[i]:offsets[i + 1].
+    Descriptions are stored as one UTF-8 buffer with its own offsets index. Every column is a separate .npy file, the
+    directory holds a meta.json file with the version of the layout and the keys of the species
+
+    Args:
+        source (str): Path to the database in json format
+        path (str): Directory of the compiled database. Created if it does not exist
+
+    Returns:
+        str: Directory of the compiled database
+    """
+
+    with open(source, "r") as fp:
+        database = json.load(fp)
+
+    keys = list(database)
+    offsets, text_offsets = [0], [0]
+    bounds, a, b, text = [], [], [], []
+    for key in keys:
+        coefficients = database[key]["coefficients"] or []
+        for (t, ai, bi) in coefficients:
+            bounds.append(t)
+            a.append(ai)
+            b.append(bi)
+        offsets.append(offsets[-1] + len(coefficients))
+        encoded = (database[key].get("descriptioin") or "").encode("utf-8")
+        text.append(encoded)
+        text_offsets.append(text_offsets[-1] + len(encoded))
+
+    columns = {
+        "workbody": np.array([database[key]["workbody"] for key in keys], dtype=np.int8),
+        "molecular_weight": np.array([database[key]["molecular_weight"] for key in keys], dtype=float),
+        "heat_of_formation": np.array([database[key]["heat_of_formation"] for key in keys], dtype=float),
+        "offsets": np.array(offsets, dtype=np.int64),
+        "bounds": np.array(bounds, dtype=float).reshape(-1, 2),
+        "a": np.array(a, dtype=float).reshape(-1, 7),
+        "b": np.array(b, dtype=float).reshape(-1, 2),
+        "text_offsets": np.array(text_offsets, dtype=np.int64),
+        "text": np.frombuffer(b"".join(text), dtype=np.uint8)
+    }
+
+    os.makedirs(path, exist_ok=True)
+    for name, column in columns.items():
+        np.save(os.path.join(path, f"{name}.npy"), column)
+
+    meta = {
+        "version": DATABASE_VERSION,
+        "source": os.path.basename(source),
+        "columns": {name: f"{name}.npy" for name in columns},
+        "keys": keys
+    }
+    with open(os.path.join(path, "meta.json"), "w") as fp:
+        json.dump(meta, fp)
+
+    return path
+
+
+class Database(Mapping):
+
+    """
+    Read-only NASA Glenn database compiled by compile_database
+
+    The columns are memory-mapped, only the keys of the species are read on opening. A species is materialized on the first
+    access as a dict with the same items as in the json database (workbody, molecular_weight, heat_of_formation,
+    coefficients, descriptioin), so database[symbol]["coefficients"] works as with json.load. Processes that open the same
+    database share the pages of the files, pickling keeps only the path
+
+    Args:
+        path (str): Directory of the compiled database
+
+    Attributes:
+        meta (dict): Content of meta.json
+    """
+
+    def __init__(self, path: str):
+
+        self.__path = os.path.abspath(path)
+        with open(os.path.join(self.__path, "meta.json"), "r") as fp:
+            self.__meta = json.load(fp)
+
+        if self.__meta.get("version") != DATABASE_VERSION:
+            raise ValueError(f"Database version {self.__meta.get('version')} is not supported. Supported version {DATABASE_VERSION}")
+
+        self.__index = {key: i for i, key in enumerate(self.__meta["keys"])}
+        self.__columns = {
+            name: np.load(os.path.join(self.__path, file), mmap_mode="r")
+            for name, file in self.__meta["columns"].items()
+        }
+        self.__species = {}
+
+    def __reduce__(self):
+        return (self.__class__, (self.__path,))
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def meta(self):
+        return self.__meta
+
+    def __len__(self):
+        return len(self.__index)
+
+    def __iter__(self):
+        return iter(self.__index)
+
+    def __contains__(self, key):
+        return key in self.__index
+
+    def __getitem__(self, key: str) -> dict:
+
+        species = self.__species.get(key)
+        if species is None:
+            if key not in self.__index:
+                raise KeyError(key)
+            species = self.__materialize__(self.__index[key])
+            self.__species[key] = species
+        return species
+
+    def __materialize__(self, i: int) -> dict:
+
+        """
+        Builds the dict of a species from the columns
+
+        Args:
+            i (int): Index of the species
+
+        Returns:
+            dict: Species in json database format
+        """
+
+        c = self.__columns
+        start, stop = int(c["offsets"][i]), int(c["offsets"][i + 1])
+        coefficients = [
+            [c["bounds"][k].tolist(), c["a"][k].tolist(), c["b"][k].tolist()]
+            for k in range(start, stop)
+        ]
+        text = bytes(c["text"][int(c["text_offsets"][i]):int(c["text_offsets"][i + 1])]).decode("utf-8")
+        return {
+            "workbody": int(c["workbody"][i]),
+            "molecular_weight": float(c["molecular_weight"][i]),
+            "heat_of_formation": float(c["heat_of_formation"][i]),
+            "coefficients": coefficients or None,
+            "descriptioin": text
+        }
+
+    def coefficients(self, keys: List[str]) -> List:
+
+        """
+        Returns NASA coefficients of several species in database format without materializing the species
+
+        Args:
+            keys (list): Keys of the species
+
+        Returns:
+            list: NASA coefficients of every species [[[Tmin, Tmax], [a1, ..., a7], [b1, b2]], ...]
+        """
+
+        c = self.__columns
+        result = []
+        for key in keys:
+            i = self.__index[key]
+            start, stop = int(c["offsets"][i]), int(c["offsets"][i + 1])
+            bounds, a, b = (np.asarray(c[name][start:stop]).tolist() for name in ("bounds", "a", "b"))
+            result.append([list(r) for r in zip(bounds, a, b)] or None)
+        return result
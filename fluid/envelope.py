@@ -0,0 +1,246 @@
+import os
+import sys
+import numpy as np
+from typing import Tuple
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+from fluid.eos import MixtureEoS
+from fluid.stability import wilson_k_values
+
+
+def __residuals__(mixture: MixtureEoS, X: np.ndarray, feed: np.ndarray, beta: float, phases: Tuple[str]) -> np.ndarray:
+
+    """
+    Computes residuals of the phase envelope equations ln K_i + ln phi_i(y) - ln phi_i(x) = 0 and sum_i (y_i - x_i) = 0
+    for a batch of points X = (ln K, ln T, ln P)
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        X (np.ndarray): Variables of shape (k, nf + 2), nf is number of components present in the feed
+        feed (np.ndarray): Indices of the components present in the feed
+        beta (float): Vapour fraction of the traced line
+        phases (tuple): Roots of the EoS for the vapour and the liquid
+
+    Returns:
+        np.ndarray: Residuals of shape (k, nf + 1)
+    """
+
+    k, n = X.shape[0], mixture.ys.size
+    ln_K, T, P = X[:, :-2], np.exp(X[:, -2]), np.exp(X[:, -1])
+    zs = mixture.ys[feed]
+    Ks = np.exp(ln_K)
+    xs, ys = np.zeros((k, n)), np.zeros((k, n))
+    xs[:, feed] = zs / (1 - beta + beta * Ks)
+    ys[:, feed] = Ks * xs[:, feed]
+
+    ln_phi_vapour = mixture.residual_properties(T, P, ys, phase=phases[0])["ln_phi"][:, feed]
+    ln_phi_liquid = mixture.residual_properties(T, P, xs, phase=phases[1])["ln_phi"][:, feed]
+    return np.column_stack([ln_K + ln_phi_vapour - ln_phi_liquid, np.sum(ys - xs, axis=-1)])
+
+
+def __newton__(mixture: MixtureEoS, X: np.ndarray, spec: int, S: float, feed: np.ndarray, beta: float, phases: Tuple[str], tol: float, max_iter: int, h: float=1e-7) -> Tuple:
+
+    """
+    Solves the phase envelope equations with the specification X[spec] = S by Newton's iteration.
+    The Jacobian is computed by forward differences, the point and its perturbations are evaluated in one call of the EoS
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        X (np.ndarray): Initial guess of shape (nf + 2,)
+        spec (int): Index of the specified variable
+        S (float): Value of the specified variable
+        feed (np.ndarray): Indices of the components present in the feed
+        beta (float): Vapour fraction of the traced line
+        phases (tuple): Roots of the EoS for the vapour and the liquid
+        tol (float): Tolerance of the variables
+        max_iter (int): Maximum number of iterations
+        h (float): Step of the variables to compute the Jacobian. Optional. Default 1e-7
+
+    Returns:
+        tuple: Solution, Jacobian at the solution, number of iterations and convergence flag
+    """
+
+    m = X.size
+    X = X.copy()
+    X[spec] = S
+    for it in range(1, max_iter + 1):
+        points = np.repeat(X[np.newaxis, :], m + 1, axis=0)
+        points[1:] += h * np.eye(m)
+        F = __residuals__(mixture, points, feed, beta, phases)
+        F = np.column_stack([F, points[:, spec] - S])
+        J = (F[1:] - F[0]).T / h
+
+        try:
+            dX = np.linalg.solve(J, -F[0])
+        except np.linalg.LinAlgError:
+            return X, J, it, False
+        if not np.all(np.isfinite(dX)):
+            return X, J, it, False
+
+        # Limit the step of temperature and pressure
+        scale = min(1.0, 0.2 / max(abs(dX[-2]), abs(dX[-1]), 1e-300))
+        X += scale * dX
+        if np.max(np.abs(dX)) < tol:
+            return X, J, it, True
+
+    return X, J, max_iter, False
+
+
+def __initial_temperature__(zs: np.ndarray, P: float, Tcs: np.ndarray, Pcs: np.ndarray, ws: np.ndarray, beta: float) -> float:
+
+    """
+    Estimates temperature of the point of the line with vapour fraction beta at pressure P by Wilson's correlation
+
+    Args:
+        zs (np.ndarray): Feed mole fractions
+        P (float): Pressure in Pa
+        Tcs, Pcs, ws (np.ndarray): Critical temperatures, pressures and acentric factors of the components
+        beta (float): Vapour fraction of the traced line
+
+    Returns:
+        float: Temperature in K
+    """
+
+    # Rachford-Rice function increases with temperature, the root is bracketed by bisection on ln T
+    lo, hi = np.log(10.0), np.log(5000.0)
+    for _ in range(100):
+        ln_T = 0.5 * (lo + hi)
+        Ks = wilson_k_values(np.exp(ln_T), P, Tcs, Pcs, ws)
+        g = np.sum(zs * (Ks - 1) / (1 - beta + beta * Ks))
+        lo, hi = (ln_T, hi) if g < 0 else (lo, ln_T)
+    return float(np.exp(0.5 * (lo + hi)))
+
+
+def __extremum__(x: np.ndarray, y: np.ndarray) -> Tuple[float]:
+
+    """
+    Refines the maximum of y along the traced points by the vertex of the quadratic y(x) through the largest y and its neighbours.
+    The traced point is kept at the ends of the line or where the quadratic has no maximum between the neighbours
+
+    Args:
+        x (np.ndarray): Variable of the quadratic at the points
+        y (np.ndarray): Maximized variable at the points
+
+    Returns:
+        tuple: x and y at the maximum
+    """
+
+    k = int(np.argmax(y))
+    if 0 < k < y.size - 1:
+        c2, c1, c0 = np.polyfit(x[k - 1:k + 2] - x[k], y[k - 1:k + 2], 2)
+        if c2 < 0:
+            dx = -c1 / (2 * c2)
+            if min(x[k - 1], x[k + 1]) <= x[k] + dx <= max(x[k - 1], x[k + 1]):
+                return float(x[k] + dx), float((c2 * dx + c1) * dx + c0)
+    return float(x[k]), float(y[k])
+
+
+def phase_envelope(mixture: MixtureEoS, P0: float=1e5, beta: float=1.0, step: float=0.05, max_step: float=0.3, min_step: float=1e-4, tol: float=1e-9, max_iter: int=10, max_points: int=300) -> dict:
+
+    """
+    Traces the phase envelope (the line of constant vapour fraction beta) of the mixture by Michelsen's method.
+    The points are solutions of ln K_i + ln phi_i(y) - ln phi_i(x) = 0, sum_i (y_i - x_i) = 0 and X_s = S in variables
+    X = (ln K, ln T, ln P). Starting from the point at pressure P0, every new point is predicted along the tangent of the
+    line dX/dS = J^{-1} e_s, the specified variable s is the one changing most rapidly and the step is enlarged or reduced
+    by the number of Newton's iterations. The critical point is passed by stepping over ln K = 0 to the symmetric value of
+    the specified equilibrium ratio, after that the roots of the phases are swapped. Tracing stops when pressure returns
+    below P0 or the maximum number of points is reached
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        P0 (float): Pressure of the first and the last points in Pa. Optional. Default 1e5
+        beta (float): Vapour fraction of the line, 1 for dew point line and 0 for bubble point line. Optional. Default 1
+        step (float): Initial step along the tangent in logarithmic variables. Optional. Default 0.05
+        max_step (float): Maximum step. Optional. Default 0.3
+        min_step (float): Minimum step, tracing stops below it. Optional. Default 1e-4
+        tol (float): Tolerance of Newton's iteration. Optional. Default 1e-9
+        max_iter (int): Maximum number of Newton's iterations of a point. Optional. Default 10
+        max_points (int): Maximum number of points. Optional. Default 300
+
+    Returns:
+        dict: Temperatures T [K], pressures P [Pa] and equilibrium ratios K of shape (m, n) of the points, the estimated
+        critical point, cricondentherm and cricondenbar as (T, P) tuples (critical is None if not passed) and the number of
+        batched EoS evaluations (Newton's iterations). Cricondentherm and cricondenbar are the vertices of quadratics
+        through the extreme traced point and its neighbours
+    """
+
+    zs = mixture.ys
+    feed = np.flatnonzero(zs > 0)
+    nf = feed.size
+
+    # First point at P0
+    T0 = __initial_temperature__(zs, P0, mixture.Tcs, mixture.Pcs, mixture.ws, beta)
+    ln_K0 = np.log(wilson_k_values(T0, P0, mixture.Tcs, mixture.Pcs, mixture.ws))[feed]
+    X = np.concatenate([ln_K0, [np.log(T0), np.log(P0)]])
+    phases = ("vapour", "liquid")
+    X, J, it, converged = __newton__(mixture, X, nf + 1, np.log(P0), feed, beta, phases, tol, 5 * max_iter)
+    if not converged:
+        raise RuntimeError(f"Phase envelope initial point at P = {P0} Pa has not converged")
+    evaluations = it
+
+    points = [X]
+    tangent_prev = None
+    critical = None
+    while len(points) < max_points:
+        e = np.zeros(nf + 2)
+        e[-1] = 1.0
+        tangent = np.linalg.solve(J, e)
+        tangent /= np.linalg.norm(tangent)
+        if tangent_prev is None:
+            tangent *= np.sign(tangent[-1]) or 1.0
+        elif tangent @ tangent_prev < 0:
+            tangent = -tangent
+
+        spec = int(np.argmax(np.abs(tangent)))
+        X_next, J_next, crossed = None, None, False
+        while step >= min_step:
+            predicted = X + step * tangent
+            crossed = spec < nf and np.sign(predicted[spec]) != np.sign(X[spec])
+            S = -X[spec] if crossed else predicted[spec]
+            if crossed:
+                predicted = X + (S - X[spec]) / tangent[spec] * tangent
+            trial_phases = phases[::-1] if crossed else phases
+            X_next, J_next, it, converged = __newton__(
+                mixture, predicted, spec, S, feed, beta, trial_phases, tol, max_iter
+            )
+            evaluations += it
+            # The point must be nontrivial and close to the prediction, otherwise Newton's iteration may jump to another part of the line
+            if converged and np.max(np.abs(X_next[:nf])) > 1e-6 and np.linalg.norm(X_next - predicted) < max(step, 1e-2):
+                break
+            step /= 2
+        else:
+            break
+
+        if crossed:
+            # Critical point by interpolation to ln K = 0 of the specified equilibrium ratio
+            t = X[spec] / (X[spec] - X_next[spec])
+            critical = tuple(np.exp((1 - t) * X[-2:] + t * X_next[-2:]).tolist())
+            phases = phases[::-1]
+
+        points.append(X_next)
+        X, J, tangent_prev = X_next, J_next, tangent
+        step = min(step * 1.5, max_step) if it <= 3 else (step / 2 if it > 6 else step)
+        if X[-1] < np.log(P0) and tangent[-1] < 0:
+            break
+
+    points = np.array(points)
+    T, P = np.exp(points[:, -2]), np.exp(points[:, -1])
+    Ks = np.ones((len(points), zs.size))
+    Ks[:, feed] = np.exp(points[:, :-2])
+    ln_P_t, T_t = __extremum__(points[:, -1], T)
+    ln_T_b, ln_P_b = __extremum__(points[:, -2], points[:, -1])
+    return {
+        "T": T,
+        "P": P,
+        "K": Ks,
+        "critical": critical,
+        "cricondentherm": (T_t, float(np.exp(ln_P_t))),
+        "cricondenbar": (float(np.exp(ln_T_b)), float(np.exp(ln_P_b))),
+        "evaluations": evaluations
+    }
@@ -10,6 +10,8 @@ sys.path.append(PYTHON_PATH)
 
 
 from fluid.const import R
+from fluid.cubic import CubicModel, get_model, component_parameters, compressibility, z_coefficients, select_root, ln_fugacity_coefficients, departures
+from fluid.roots import cubic_continuation
 
 
 def __check_args__(args):
@@ -23,7 +25,6 @@ def __check_args__(args):
     return args
 
 
-
 def redlich_kwong(T: float, P: float, ys: List[float], Tcs: List[float], Pcs: List[float], MWs: List[float], ws: List[float], vcs: List[float]=None, /, k_ij:List[List[float]]=None, eos: str="standard") -> Tuple[float]:
 
     """
@@ -36,7 +37,7 @@ def redlich_kwong(T: float, P: float, ys: List[float], Tcs: List[float], Pcs: Li
         ys list(float): mole fractions of all gases in the mixture
         Tcs (list(float)): critical temperature of all gases in the mixture in K
         Pcs (list(float)): critical pressure of all gases in the mixture in Pa
-        vcs (list(float)): critical specific molar volume of all gases in the mixture in m^3 mol^-1. Optional. Default None. Needed only for Aungier and Soave EoS.
+        vcs (list(float)): critical specific molar volume of all gases in the mixture in m^3 mol^-1. Optional. Default None. Needed only for Aungier EoS.
         MWs (list(float): molecular weights of all gases in the mixture
         ws (list(float)): acentric factors of all gases in Mixture
         k_ij (list(float)): binary interaction parameters, optional. Defaul None, will be set to zero array
@@ -46,55 +47,34 @@ def redlich_kwong(T: float, P: float, ys: List[float], Tcs: List[float], Pcs: Li
         tuple: Mixture compressibility factor, density and acrentric factor
     """
 
-    # Initilize data
-    n = len(ys)
-    Tcs, Pcs, MWs, ws = np.array(Tcs), np.array(Pcs), np.array(MWs), np.array(ws)
-    if k_ij is None:
-        k_ij = np.zeros((n, n))
-    else:
-        k_ij = np.array(k_ij)
-
-    w_mix = sum(ys * ws)
-    MW_mix = sum(ys * MWs)
-
-    b_i = 0.08664 * R * Tcs / Pcs
-    a_i =( 0.42747 * R**2 * Tcs**2) / Pcs
-
-    if eos == "standard":
-        kappa_i = 0.5
-        c_i = np.zeros((n,))
-        alpha_i = a_i * (T / Tcs)**(-n)
-    elif eos == "aungier":
-        kappa_i = 0.4986 + 1.1735 * ws + 0.4754 * ws**2
-        c_i = R * Tcs / (Pcs + a_i / (vcs * (vcs + b_i))) + b_i - vcs
-        alpha_i = a_i * (T / Tcs)**(-kappa_i)
-    elif eos == "soave":
-        kappa_i = 0.480 + 1.574 * ws  - 0.176 * ws**2
-        c_i = R * Tcs / (Pcs + a_i / (vcs * (vcs + b_i))) + b_i - vcs
-        alpha_i = a_i * (1 + kappa_i * (1 - np.sqrt(T / Tcs)))**2
-
-    # Define paramters of the mixture
-    b_mix = sum(ys * b_i)
-    c_mix = sum(ys * c_i)
-    a_mix = 0.0
-
-    for i in range(n):
-        for j in range(n):
-            a_cross = (1 - k_ij[i,j]) * np.sqrt(a_i[i] * alpha_i[i] * a_i[j] * alpha_i[j])
-            a_mix += ys[i] * ys[j] * a_cross
-        
-    # Compute coefficients for solving a cubic equation for Z
-    A = (a_mix * P) / (R * T)**2
-    B = (b_mix * P) / (R * T)
-    C = (c_mix * P) / (R * T)
-    coeffs = [1, C - 1, B * (-B - 1 + C), A * (C - B)]
-
-    # Compute Compressibility Factor and Density
-    Z_roots = np.roots(coeffs)
-    Z = max([root.real for root in Z_roots if abs(root.imag) < 1e-10])
-    rho = (MW_mix * P) / (R * T * Z)
+    Z, rho, w_mix = redlich_kwong_batch(T, P, ys, Tcs, Pcs, MWs, ws, vcs, k_ij=k_ij, eos=eos)
     return float(Z), float(rho), float(w_mix)
-    
+
+
+def redlich_kwong_batch(T: np.ndarray, P: np.ndarray, ys: List[float], Tcs: List[float], Pcs: List[float], MWs: List[float], ws: List[float], vcs: List[float]=None, /, k_ij:List[List[float]]=None, eos: str="standard") -> Tuple[np.ndarray]:
+
+    """
+    Computes Density, Compressibility, Acentric Factor of the mixture
+    using family of Redlich-Kwong EoS for a batch of states of the same composition
+
+    Args:
+        T (np.ndarray): reference Temperatures of the mixture in K. Broadcast against P
+        P (np.ndarray): reference Pressures of the mixture in Pa. Broadcast against T
+        ys list(float): mole fractions of all gases in the mixture
+        Tcs (list(float)): critical temperature of all gases in the mixture in K
+        Pcs (list(float)): critical pressure of all gases in the mixture in Pa
+        vcs (list(float)): critical specific molar volume of all gases in the mixture in m^3 mol^-1. Optional. Default None. Needed only for Aungier EoS.
+        MWs (list(float): molecular weights of all gases in the mixture
+        ws (list(float)): acentric factors of all gases in Mixture
+        k_ij (list(float)): binary interaction parameters, optional. Defaul None, will be set to zero array
+        eos (str): EoS, optional. Default "standard". Available eos "aungier" for Redlich-Kwong-Aungier EoS, "soave" for Soave Redlich-Kwong EoS and "standard for Standard Redlich-Kwong EoS
+
+    Returns:
+        tuple: Arrays of the mixture compressibility factor and density of the broadcast shape of T and P, and acrentric factor of the mixture
+    """
+
+    mixture = MixtureEoS(ys, Tcs, Pcs, MWs, ws, vcs, k_ij=k_ij, eos=eos)
+    return mixture(T, P)
 
 
 def peng_robinson(T: float, P: float, ys:List[float], Tcs: List[float], Pcs: List[float], MWs: List[float], ws: List[float], /, k_ij:List[List[float]]=None) -> Tuple[float]:
@@ -117,41 +97,296 @@ def peng_robinson(T: float, P: float, ys:List[float], Tcs: List[float], Pcs: Lis
         tuple: Mixture compressibility factor, density and acrentric factor
     """
 
-    # Initialize data
-    n = len(ys)
-    Tcs, Pcs, MWs, ws = np.array(Tcs), np.array(Pcs), np.array(MWs), np.array(ws)
-    if k_ij is None:
-        k_ij = np.zeros((n, n))
-    else:
-        k_ij = np.array(k_ij)
-    
-    # Define parameters using a simple mole-fraction-weighted average
-    omega_mix = sum(ys * ws)
-    Mw_mix = sum(ys * MWs)
-    
-    # Define paramters of the mixture
-    b_i = 0.0778 * R * T / Pcs
-    a_i = 0.45724 * (R**2 * Tcs**2) / Pcs
-    kappa_i = 0.37464 + 1.54226 * ws - 0.26993 * ws ** 2
-    alpha_i = (1 + kappa_i * (1 - np.sqrt(T / Tcs)))**2
-
-    b_mix = sum(ys * b_i)
-    a_mix = 0.0
-
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                continue
-            a_cross = (1 - k_ij[i,j]) * np.sqrt(a_i[i] * alpha_i[i] * a_i[j] * alpha_i[j])
-            a_mix += ys[i] * ys[j] * a_cross
-    
-    # Compute cubic equation coefficints
-    A = (a_mix * P) / (R * T)**2
-    B = (b_mix * P) / (R * T)
-    coeffs = [1, -(1 - B), (A - 2 * B - 3 * B**2), -(A * B - B**2 - B**3)]
-
-    # Compute Compressibility Factor and Density
-    Z_roots = np.roots(coeffs)
-    Z = max([root.real for root in Z_roots if abs(root.imag) < 1e-10])
-    rho = (Mw_mix * P) / (R * T * Z)
+    Z, rho, omega_mix = peng_robinson_batch(T, P, ys, Tcs, Pcs, MWs, ws, k_ij=k_ij)
     return float(Z), float(rho), float(omega_mix)
+
+
+
+def peng_robinson_batch(T: np.ndarray, P: np.ndarray, ys:List[float], Tcs: List[float], Pcs: List[float], MWs: List[float], ws: List[float], /, k_ij:List[List[float]]=None) -> Tuple[np.ndarray]:
+
+    """
+    Computes Density, Compressibility, Acentric Factor of the mixture
+    using Peng-Robinson EoS for a batch of states of the same composition
+
+    Args:
+        T (np.ndarray): reference Temperatures of the mixture in K. Broadcast against P
+        P (np.ndarray): reference Pressures of the mixture in Pa. Broadcast against T
+        ys list(float): mole fractions of all gases in the mixture
+        Tcs (list(float)): critical temperature of all gases in the mixture in K
+        Pcs (list(float)): critical pressure of all gases in the mixture in Pa
+        MWs (list(float): molecular weights of all gases in the mixture
+        ws (list(float)): acentric factors of all gases in Mixture
+        k_ij (list(float)): binary interaction parameters, optional. Defaul None, will be set to zero array
+
+    Returns:
+        tuple: Arrays of the mixture compressibility factor and density of the broadcast shape of T and P, and acrentric factor of the mixture
+    """
+
+    mixture = MixtureEoS(ys, Tcs, Pcs, MWs, ws, k_ij=k_ij, eos="peng_robinson")
+    return mixture(T, P)
+
+
+class MixtureEoS:
+
+    """
+    Cubic EoS of a mixture of fixed composition. All parameters depending only on the composition
+    (component attraction and co-volume parameters, the cross attraction matrix (1 - k_ij) * sqrt(a_i * a_j),
+    mixture co-volume, volume correction, molecular weight and acentric factor) are computed once.
+    Each evaluation recomputes only the temperature dependent alpha terms which are cached for the last isotherm
+
+    Attributes:
+        ys (np.ndarray): mole fractions of all gases in the mixture
+        model (CubicModel): Parameter set of the generalized cubic EoS of the mixture
+        Tcs, Pcs, ws, MWs (np.ndarray): critical temperatures, critical pressures, acentric factors and molecular weights of all gases in the mixture
+        bs, cs (np.ndarray): co-volumes and volume corrections of all gases in the mixture in m^3/mol
+        b_mix (float): Co-volume of the mixture in m^3/mol
+        c_mix (float): Volume correction of the mixture in m^3/mol
+        MW_mix (float): Molecular weight of the mixture in kg/mol
+        w_mix (float): acentric factor of the mixture
+    """
+
+    def __init__(self, ys: List[float], Tcs: List[float], Pcs: List[float], MWs: List[float], ws: List[float], vcs: List[float]=None, /, k_ij: List[List[float]]=None, eos: str | CubicModel="peng_robinson"):
+
+        """
+        Args:
+            ys list(float): mole fractions of all gases in the mixture
+            Tcs (list(float)): critical temperature of all gases in the mixture in K
+            Pcs (list(float)): critical pressure of all gases in the mixture in Pa
+            MWs (list(float): molecular weights of all gases in the mixture
+            ws (list(float)): acentric factors of all gases in Mixture
+            vcs (list(float)): critical specific molar volume of all gases in the mixture in m^3 mol^-1. Optional. Default None. Needed only for Aungier EoS.
+            k_ij (list(float)): binary interaction parameters, optional. Defaul None, will be set to zero array
+            eos (str | CubicModel): EoS, optional. Default "peng_robinson". Available eos "peng_robinson" for Peng-Robinson EoS, "aungier" for Redlich-Kwong-Aungier EoS, "soave" for Soave Redlich-Kwong EoS and "standard" for Standard Redlich-Kwong EoS, or any parameter set of the generalized cubic EoS
+        """
+
+        # Initilize data
+        n = len(ys)
+        ys, Tcs, Pcs, MWs, ws = np.array(ys, dtype=float), np.array(Tcs, dtype=float), np.array(Pcs, dtype=float), np.array(MWs, dtype=float), np.array(ws, dtype=float)
+        if k_ij is None:
+            k_cross = np.ones((n, n))
+        else:
+            k_cross = 1 - np.array(k_ij, dtype=float)
+
+        model = get_model(eos)
+        a_i, b_i, c_i, kappa_i = component_parameters(model, Tcs, Pcs, ws, vcs)
+
+        self.__model = model
+        self.__ys = ys
+        self.__Tcs = Tcs
+        self.__Pcs = Pcs
+        self.__ws = ws
+        self.__MWs = MWs
+        self.__b_i = b_i
+        self.__c_i = c_i
+        self.__kappa_i = kappa_i
+        self.__a_cross = k_cross * np.sqrt(np.outer(a_i, a_i))
+        self.__b_mix = float(ys @ b_i)
+        self.__c_mix = float(ys @ c_i)
+        self.__w_mix = float(ys @ ws)
+        self.__MW_mix = float(ys @ MWs)
+        self.__isotherm = (None, None)
+
+    @property
+    def ys(self):
+        return self.__ys
+
+    @property
+    def model(self):
+        return self.__model
+
+    @property
+    def Tcs(self):
+        return self.__Tcs
+
+    @property
+    def Pcs(self):
+        return self.__Pcs
+
+    @property
+    def ws(self):
+        return self.__ws
+
+    @property
+    def MWs(self):
+        return self.__MWs
+
+    @property
+    def bs(self):
+        return self.__b_i
+
+    @property
+    def cs(self):
+        return self.__c_i
+
+    @property
+    def b_mix(self):
+        return self.__b_mix
+
+    @property
+    def c_mix(self):
+        return self.__c_mix
+
+    @property
+    def MW_mix(self):
+        return self.__MW_mix
+
+    @property
+    def w_mix(self):
+        return self.__w_mix
+
+    def a_mix(self, T: np.ndarray) -> np.ndarray:
+
+        """
+        Computes attraction parameter of the mixture a_mix = sum_ij y_i * y_j * (1 - k_ij) * sqrt(a_i * alpha_i * a_j * alpha_j).
+        The value for a scalar temperature is cached so that repeated evaluations on the same isotherm do not recompute alpha terms
+
+        Args:
+            T (np.ndarray): Temperatures in K
+
+        Returns:
+            np.ndarray: attraction parameter of the mixture of shape of T
+        """
+
+        T = np.asarray(T, dtype=float)
+        T_iso, a_iso = self.__isotherm
+        if T.ndim == 0 and T_iso == float(T):
+            return a_iso
+
+        alpha_i = self.__model.alpha(T[..., np.newaxis], self.__Tcs, self.__kappa_i)
+        ys_a = self.__ys * np.sqrt(alpha_i)
+        a_mix = np.einsum("...i,ij,...j->...", ys_a, self.__a_cross, ys_a)
+        if T.ndim == 0:
+            self.__isotherm = (float(T), a_mix)
+        return a_mix
+
+    def __call__(self, T: np.ndarray, P: np.ndarray) -> Tuple[np.ndarray]:
+
+        """
+        Computes Density, Compressibility, Acentric Factor of the mixture
+
+        Args:
+            T (np.ndarray): reference Temperatures of the mixture in K. Broadcast against P
+            P (np.ndarray): reference Pressures of the mixture in Pa. Broadcast against T
+
+        Returns:
+            tuple: Arrays of the mixture compressibility factor and density of the broadcast shape of T and P, and acrentric factor of the mixture
+        """
+
+        T, P = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P, dtype=float))
+        if T.size > 1 and np.all(T == T.flat[0]):
+            # A batch on one isotherm shares the alpha terms
+            a_mix = self.a_mix(T.flat[0])
+        else:
+            a_mix = self.a_mix(T)
+
+        # Compute Compressibility Factor and Density
+        A = (a_mix * P) / (R * T)**2
+        B = (self.__b_mix * P) / (R * T)
+        C = (self.__c_mix * P) / (R * T)
+        Z, _ = compressibility(self.__model, A, B, C)
+        rho = (self.__MW_mix * P) / (R * T * Z)
+        return Z, rho, self.__w_mix
+
+    def sweep(self, T: np.ndarray, P: np.ndarray, Z0: float=None) -> Tuple[np.ndarray]:
+
+        """
+        Computes Density, Compressibility, Acentric Factor of the mixture along an ordered sequence of states
+        (e.g. a compressor path or an isotherm). All states are solved at once by the closed-form roots, the root of every
+        state is selected by the root of the previous state, so the solution stays on one branch of the EoS as long as the branch exists
+
+        Args:
+            T (np.ndarray): Temperatures of the ordered states in K. Broadcast against P
+            P (np.ndarray): Pressures of the ordered states in Pa. Broadcast against T
+            Z0 (float): Compressibility factor to start from. Optional. Default None, the vapour root of the first state
+
+        Returns:
+            tuple: Arrays of the mixture compressibility factor and density of the ordered states, and acrentric factor of the mixture
+        """
+
+        T, P = np.broadcast_arrays(np.ravel(np.asarray(T, dtype=float)), np.ravel(np.asarray(P, dtype=float)))
+        if T.size > 1 and np.all(T == T[0]):
+            a_mix = self.a_mix(T[0])
+        else:
+            a_mix = self.a_mix(T)
+
+        A = (a_mix * P) / (R * T)**2
+        B = (self.__b_mix * P) / (R * T)
+        C = (self.__c_mix * P) / (R * T)
+        Z = cubic_continuation(z_coefficients(self.__model, A, B, C), B - C, Z0)
+        rho = (self.__MW_mix * P) / (R * T * Z)
+        return Z, rho, self.__w_mix
+
+    def attraction(self, T: np.ndarray, xs: np.ndarray=None) -> Tuple[np.ndarray]:
+
+        """
+        Computes attraction parameter of mixtures with its temperature derivatives and the partial sums needed for fugacity coefficients
+
+        Args:
+            T (np.ndarray): Temperatures in K of shape (...)
+            xs (np.ndarray): Mole fractions of shape (..., n). Optional. Default None, composition of the mixture
+
+        Returns:
+            tuple: a_mix, da_mix/dT, d2a_mix/dT2 of shape (...) and sum_j(x_j * a_ij) of shape (..., n)
+        """
+
+        T = np.asarray(T, dtype=float)
+        xs = self.__ys if xs is None else np.asarray(xs, dtype=float)
+        alpha, dalpha, d2alpha = self.__model.alpha(T[..., np.newaxis], self.__Tcs, self.__kappa_i, derivatives=True)
+
+        # a_ij = a_cross_ij * s_i * s_j with s_i = sqrt(alpha_i)
+        s = np.sqrt(alpha)
+        ds = dalpha / (2 * s)
+        d2s = d2alpha / (2 * s) - dalpha**2 / (4 * s**3)
+        K_xs = (xs * s) @ self.__a_cross
+        K_xds = (xs * ds) @ self.__a_cross
+
+        psi = s * K_xs
+        a_mix = np.sum(xs * psi, axis=-1)
+        da_mix = 2 * np.sum(xs * ds * K_xs, axis=-1)
+        d2a_mix = 2 * np.sum(xs * (ds * K_xds + d2s * K_xs), axis=-1)
+        return a_mix, da_mix, d2a_mix, psi
+
+    def residual_properties(self, T: np.ndarray, P: np.ndarray, xs: np.ndarray=None, phase: str="vapour") -> dict:
+
+        """
+        Computes compressibility factor, density, logarithms of component fugacity coefficients and molar departure
+        functions in one pass reusing attraction parameter, co-volume and alpha terms of the mixture
+
+        Args:
+            T (np.ndarray): Temperatures in K. Broadcast against P and the leading dimensions of xs
+            P (np.ndarray): Pressures in Pa. Broadcast against T and the leading dimensions of xs
+            xs (np.ndarray): Mole fractions of shape (..., n). Optional. Default None, composition of the mixture
+            phase (str): Root of the EoS. Optional. Default "vapour". Available phases "vapour", "liquid" and "stable" for the root with the lowest Gibbs energy
+
+        Returns:
+            dict: Compressibility factor Z, density rho [kg/m^3], logarithms of fugacity coefficients ln_phi of shape (..., n),
+            departure enthalpy H_dep [J/mol], entropy S_dep [J/(mol K)], heat capacities Cp_dep and Cv_dep [J/(mol K)]
+        """
+
+        xs = self.__ys if xs is None else np.asarray(xs, dtype=float)
+        T, P = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P, dtype=float))
+        shape = np.broadcast_shapes(T.shape, xs.shape[:-1])
+        T, P = np.broadcast_to(T, shape), np.broadcast_to(P, shape)
+
+        a_mix, da_mix, d2a_mix, psi = self.attraction(T, xs)
+        b_mix = xs @ self.__b_i
+        c_mix = xs @ self.__c_i
+        MW_mix = xs @ self.__MWs
+
+        # Compute Compressibility Factor and Density
+        A = (a_mix * P) / (R * T)**2
+        B = (b_mix * P) / (R * T)
+        C = (c_mix * P) / (R * T)
+        Z_vapour, Z_liquid = compressibility(self.__model, A, B, C)
+        Z = select_root(self.__model, Z_vapour, Z_liquid, A, B, C, phase)
+        rho = (MW_mix * P) / (R * T * Z)
+
+        b_mix_ = b_mix[..., np.newaxis]
+        ln_phi = ln_fugacity_coefficients(
+            self.__model, Z, A, B, C,
+            2 * psi / a_mix[..., np.newaxis], self.__b_i / b_mix_, self.__c_i / b_mix_
+        )
+
+        properties = {"Z": Z, "rho": rho, "ln_phi": ln_phi}
+        properties.update(departures(self.__model, T, P, Z, a_mix, da_mix, d2a_mix, b_mix, c_mix))
+        return properties
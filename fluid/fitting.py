@@ -0,0 +1,163 @@
+"""
+Provides linear least squares fitting of NASA polynomials
+
+Molar heat capacity Cp0(T) / Ru = a1 * T ** -2 + a2 * T ** -1 + a3 + a4 * T + a5 * T ** 2 + a6 * T ** 3 + a7 * T ** 4 is
+linear in the coefficients, so the coefficients of all ranges of many species are found at once by one least squares
+solution of a stacked Vandermonde matrix with the data of all species as right-hand sides. Continuity of heat capacity
+(and optionally of its derivative) at the range boundaries is imposed by seeking the coefficients in the null space of
+the continuity constraints. The integration constants b1, b2 are set by the reference enthalpy and entropy and by
+continuity of enthalpy and entropy at the range boundaries
+"""
+
+import os
+import sys
+import numpy as np
+from typing import List
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+import fluid.nasa as nasa
+
+
+POWERS = np.arange(-2, 5)
+SCALE = 1000.0 # K. Temperature scale of the fitted basis
+
+
+def __basis__(tau: np.ndarray, powers: np.ndarray, derivative: int=0) -> np.ndarray:
+
+    """
+    Computes powers of scaled temperature or their derivatives
+
+    Args:
+        tau (np.ndarray): Scaled temperatures T / SCALE
+        powers (np.ndarray): Powers of the basis
+        derivative (int): Order of the derivative with respect to tau. Optional. Default 0
+
+    Returns:
+        np.ndarray: Basis of shape (..., powers)
+    """
+
+    tau = np.asarray(tau, dtype=float)[..., np.newaxis]
+    if derivative == 0:
+        return tau**powers
+    return powers * tau**(powers - 1)
+
+
+def fit_nasa(T: np.ndarray, cp0: np.ndarray, breakpoints: List[float], h_ref: np.ndarray=0.0, s_ref: np.ndarray=0.0, T_ref: float=298.15, terms: int=9, smooth: bool=True, weights: np.ndarray=None) -> List:
+
+    """
+    Fits NASA polynomials of many species at once to heat capacity data on a common temperature grid
+
+    Args:
+        T (np.ndarray): Temperatures of the data in K of shape (m,)
+        cp0 (np.ndarray): Dimensionless heat capacities Cp0 / Ru of shape (species, m) or (m,)
+        breakpoints (list): Range boundaries [Tmin, T1, ..., Tmax] in K
+        h_ref (np.ndarray): Dimensionless enthalpies H0(T_ref) / Ru in K of the species. Optional. Default 0
+        s_ref (np.ndarray): Dimensionless entropies S0(T_ref) / Ru of the species. Optional. Default 0
+        T_ref (float): Reference temperature in K. Optional. Default 298.15
+        terms (int): 9 for NASA-9 (7 + 2) polynomials, 7 for NASA-7 (5 + 2) polynomials with a1 = a2 = 0. Optional. Default 9
+        smooth (bool): Impose continuity of the derivative of heat capacity at the boundaries too. Optional. Default True
+        weights (np.ndarray): Weights of the data points of shape (m,). Optional. Default None, equal weights
+
+    Returns:
+        list: NASA coefficients of every species in database format [[[Tmin, Tmax], [a1, ..., a7], [b1, b2]], ...]
+    """
+
+    if terms not in (7, 9):
+        raise ValueError(f"Number of terms must be 7 or 9. Given {terms}")
+
+    T = np.asarray(T, dtype=float)
+    cp0 = np.atleast_2d(np.asarray(cp0, dtype=float))
+    if cp0.shape[-1] != T.size:
+        raise ValueError(f"Heat capacity of shape {cp0.shape} does not match {T.size} temperatures")
+    breakpoints = np.asarray(breakpoints, dtype=float)
+    nr, n = breakpoints.size - 1, cp0.shape[0]
+    powers = POWERS if terms == 9 else POWERS[2:]
+    p = powers.size
+
+    ranges = np.clip(np.searchsorted(breakpoints, T, side="left") - 1, 0, nr - 1)
+    counts = np.bincount(ranges, minlength=nr)
+    if np.any(counts < p):
+        raise ValueError(f"Every range needs at least {p} data points. Given {counts.tolist()}")
+
+    # Block diagonal Vandermonde matrix of all ranges, shared by all species
+    V = np.zeros((T.size, nr * p))
+    rows = np.arange(T.size)[:, np.newaxis]
+    V[rows, ranges[:, np.newaxis] * p + np.arange(p)] = __basis__(T / SCALE, powers)
+    w = np.ones(T.size) if weights is None else np.asarray(weights, dtype=float)
+
+    # Continuity constraints of the value (and the derivative) at the internal boundaries
+    constraints = []
+    for k in range(1, nr):
+        for derivative in ((0, 1) if smooth else (0,)):
+            row = np.zeros(nr * p)
+            basis = __basis__(breakpoints[k] / SCALE, powers, derivative)
+            row[(k - 1) * p:k * p], row[k * p:(k + 1) * p] = basis, -basis
+            constraints.append(row)
+    C = np.array(constraints).reshape(-1, nr * p)
+
+    # The constraints are homogeneous, the coefficients are sought in the null space of C. One least squares solution
+    # of the reduced Vandermonde matrix serves all species
+    N = np.eye(nr * p)
+    if C.shape[0]:
+        _, sv, Vt = np.linalg.svd(C)
+        N = Vt[np.sum(sv > 1e-12 * sv[0]):].T
+    sw = np.sqrt(w)[:, np.newaxis]
+    x = N @ np.linalg.lstsq(sw * (V @ N), sw * cp0.T, rcond=None)[0]
+
+    a = np.zeros((n, nr, 7))
+    a[..., 7 - p:] = x.T.reshape(n, nr, p) * SCALE**-powers.astype(float)
+
+    # Integration constants from the reference state and continuity of enthalpy and entropy
+    h_ref = np.broadcast_to(np.asarray(h_ref, dtype=float), (n,))
+    s_ref = np.broadcast_to(np.asarray(s_ref, dtype=float), (n,))
+    tensor = np.concatenate([a, np.zeros((n, nr, 2))], axis=-1)
+    k_ref = int(np.clip(np.searchsorted(breakpoints, T_ref, side="left") - 1, 0, nr - 1))
+    at_ref = nasa.evaluate(T_ref, tensor[:, k_ref])
+    tensor[:, k_ref, 7] = h_ref - at_ref["h0"] * T_ref
+    tensor[:, k_ref, 8] = s_ref - at_ref["s0"]
+    for k in list(range(k_ref + 1, nr)) + list(range(k_ref - 1, -1, -1)):
+        j = k - 1 if k > k_ref else k + 1
+        Tb = breakpoints[max(k, j)]
+        known, unknown = nasa.evaluate(Tb, tensor[:, j]), nasa.evaluate(Tb, tensor[:, k])
+        tensor[:, k, 7] = (known["h0"] - unknown["h0"]) * Tb
+        tensor[:, k, 8] = known["s0"] - unknown["s0"]
+
+    return [
+        [[[float(breakpoints[k]), float(breakpoints[k + 1])], tensor[i, k, :7].tolist(), tensor[i, k, 7:].tolist()] for k in range(nr)]
+        for i in range(n)
+    ]
+
+
+def refit(coefficients: List, breakpoints: List[float], terms: int=9, smooth: bool=True, points: int=100, T_ref: float=298.15) -> List:
+
+    """
+    Refits NASA polynomials of many species to new range boundaries or number of terms, e.g. to regenerate a library
+    with common boundaries or NASA-7 polynomials. Heat capacity is sampled from the given polynomials on a grid of
+    points in every new range, enthalpy and entropy at the reference temperature are kept
+
+    Args:
+        coefficients (list): NASA coefficients of every species in database format
+        breakpoints (list): New range boundaries [Tmin, T1, ..., Tmax] in K
+        terms (int): 9 for NASA-9, 7 for NASA-7 polynomials. Optional. Default 9
+        smooth (bool): Impose continuity of the derivative of heat capacity at the boundaries. Optional. Default True
+        points (int): Number of sampled points per range. Optional. Default 100
+        T_ref (float): Reference temperature in K. Optional. Default 298.15
+
+    Returns:
+        list: NASA coefficients of every species in database format
+    """
+
+    breakpoints = np.asarray(breakpoints, dtype=float)
+    T = np.unique(np.concatenate([np.linspace(lo, hi, points) for lo, hi in zip(breakpoints[:-1], breakpoints[1:])]))
+    species = nasa.SpeciesNASA(coefficients)
+    sampled, reference = species(T), species(T_ref)
+    return fit_nasa(
+        T, sampled["cp0"].T, breakpoints, h_ref=reference["h0"] * T_ref, s_ref=reference["s0"],
+        T_ref=T_ref, terms=terms, smooth=smooth
+    )
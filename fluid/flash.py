@@ -0,0 +1,467 @@
+import os
+import sys
+import numpy as np
+from typing import List, Tuple
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+from fluid.const import R, P0
+from fluid.eos import MixtureEoS
+import fluid.nasa as nasa
+from fluid.stability import wilson_k_values, stability_test
+
+
+def rachford_rice(zs: np.ndarray, Ks: np.ndarray, tol: float=1e-12, max_iter: int=100) -> np.ndarray:
+
+    """
+    Solves Rachford-Rice equation sum_i z_i * (K_i - 1) / (1 + beta * (K_i - 1)) = 0 for vapour fractions of many states at once.
+    Newton's iteration is safeguarded by bisection within the window (1 / (1 - K_max), 1 / (1 - K_min)) where compositions
+    are positive, so vapour fractions outside [0, 1] (negative flash) are allowed. States with all K_i <= 1 get beta = 0,
+    states with all K_i >= 1 get beta = 1
+
+    Args:
+        zs (np.ndarray): Feed mole fractions of shape (..., n)
+        Ks (np.ndarray): Equilibrium ratios of shape (..., n)
+        tol (float): Tolerance of vapour fraction. Optional. Default 1e-12
+        max_iter (int): Maximum number of iterations. Optional. Default 100
+
+    Returns:
+        np.ndarray: Vapour fractions of shape (...)
+    """
+
+    zs, Ks = np.broadcast_arrays(np.asarray(zs, dtype=float), np.asarray(Ks, dtype=float))
+    Km1 = Ks - 1
+    K_max, K_min = Ks.max(axis=-1), Ks.min(axis=-1)
+    two_phase = (K_max > 1) & (K_min < 1)
+
+    with np.errstate(divide="ignore"):
+        lo = np.where(two_phase, 1 / (1 - np.where(two_phase, K_max, 0.0)), 0.0)
+        hi = np.where(two_phase, 1 / (1 - np.where(two_phase, K_min, 0.0)), 1.0)
+    beta = np.full(K_max.shape, 0.5)
+
+    for _ in range(max_iter):
+        denom = 1 + beta[..., np.newaxis] * Km1
+        f = np.sum(zs * Km1 / denom, axis=-1)
+        df = -np.sum(zs * (Km1 / denom)**2, axis=-1)
+
+        # The function decreases monotonically, so its sign moves the bracket
+        lo = np.where(f > 0, beta, lo)
+        hi = np.where(f < 0, beta, hi)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            beta_new = beta - f / df
+        outside = ~((beta_new > lo) & (beta_new < hi))
+        beta_new = np.where(outside, 0.5 * (lo + hi), beta_new)
+
+        done = np.abs(beta_new - beta) <= tol * np.maximum(np.abs(beta), 1.0)
+        beta = beta_new
+        if np.all(done | ~two_phase):
+            break
+
+    return np.where(two_phase, beta, np.where(K_max <= 1, 0.0, 1.0))
+
+
+def phase_compositions(zs: np.ndarray, Ks: np.ndarray, beta: np.ndarray) -> Tuple[np.ndarray]:
+
+    """
+    Computes liquid and vapour compositions from feed, equilibrium ratios and vapour fraction
+
+    Args:
+        zs (np.ndarray): Feed mole fractions of shape (..., n)
+        Ks (np.ndarray): Equilibrium ratios of shape (..., n)
+        beta (np.ndarray): Vapour fractions of shape (...)
+
+    Returns:
+        tuple: Normalized liquid and vapour mole fractions of shape (..., n)
+    """
+
+    xs = zs / (1 + np.asarray(beta)[..., np.newaxis] * (Ks - 1))
+    ys = Ks * xs
+    return xs / xs.sum(axis=-1, keepdims=True), ys / ys.sum(axis=-1, keepdims=True)
+
+
+def __update__(mixture: MixtureEoS, T: np.ndarray, P: np.ndarray, ln_K: np.ndarray) -> Tuple[np.ndarray]:
+
+    """
+    Performs successive substitution update of the logarithms of equilibrium ratios
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        T (np.ndarray): Temperatures in K of shape (m,)
+        P (np.ndarray): Pressures in Pa of shape (m,)
+        ln_K (np.ndarray): Logarithms of equilibrium ratios of shape (m, n)
+
+    Returns:
+        tuple: Updated logarithms of equilibrium ratios and vapour fractions
+    """
+
+    beta = rachford_rice(mixture.ys, np.exp(ln_K))
+    xs, ys = phase_compositions(mixture.ys, np.exp(ln_K), beta)
+    ln_phi_liquid = mixture.residual_properties(T, P, xs, phase="liquid")["ln_phi"]
+    ln_phi_vapour = mixture.residual_properties(T, P, ys, phase="vapour")["ln_phi"]
+    return ln_phi_liquid - ln_phi_vapour, beta
+
+
+def pt_flash(mixture: MixtureEoS, T: np.ndarray, P: np.ndarray, K: np.ndarray=None, tol: float=1e-10, max_iter: int=200, accelerate: int=5, newton: bool=False, stability: bool=True, W: np.ndarray=None) -> dict:
+
+    """
+    Computes isothermal vapour-liquid equilibrium of the mixture for many states at once.
+    States proven stable by the tangent plane distance test are single phase and skip the flash. Equilibrium ratios of the
+    other states are initialized by given (cached) values or by the trial phases of the stability test, vapour fractions
+    are found from Rachford-Rice equation and the ratios are updated by successive substitution accelerated by the dominant eigenvalue
+    method (GDEM) every few iterations. Optionally the solution is finished by Newton's iteration on the logarithms of
+    equilibrium ratios
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        T (np.ndarray): Temperatures in K. Broadcast against P
+        P (np.ndarray): Pressures in Pa. Broadcast against T
+        K (np.ndarray): Initial equilibrium ratios of shape (n,) or (..., n), e.g. ratios of the previous state. Optional. Default None, Wilson's correlation
+        tol (float): Tolerance of the logarithms of equilibrium ratios. Optional. Default 1e-10
+        max_iter (int): Maximum number of successive substitutions. Optional. Default 200
+        accelerate (int): Number of successive substitutions between accelerations. Optional. Default 5. Set 0 to switch acceleration off
+        newton (bool): Finish the solution by Newton's iteration. Optional. Default False
+        stability (bool): Test stability of the states before the flash. Optional. Default True
+        W (np.ndarray): Initial trial phases of the stability test of shape (2, n) or (..., 2, n). Optional. Default None
+
+    Returns:
+        dict: Vapour fraction beta, liquid and vapour mole fractions xs, ys, equilibrium ratios K, compressibility factors
+        Z_liquid, Z_vapour, densities rho_liquid, rho_vapour [kg/m^3], convergence flags converged and stability flags stable
+        of the broadcast shape of T and P
+    """
+
+    T, P = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P, dtype=float))
+    shape = T.shape
+    T, P = T.ravel(), P.ravel()
+    m, n = T.size, mixture.ys.size
+
+    if K is None:
+        ln_K = np.log(wilson_k_values(T, P, mixture.Tcs, mixture.Pcs, mixture.ws))
+    else:
+        ln_K = np.log(np.broadcast_to(np.asarray(K, dtype=float), shape + (n,)).reshape(m, n)).copy()
+
+    stable = np.zeros(m, dtype=bool)
+    if stability:
+        test = stability_test(mixture, T, P, W=W, accelerate=accelerate)
+        stable = test["stable"]
+        if K is None:
+            ln_K[~stable] = np.log(test["K"][~stable])
+
+    # Successive substitution is tightened further by Newton's iteration
+    tol_ss = np.sqrt(tol) if newton else tol
+    delta_prev = np.zeros((m, n))
+    converged = stable.copy()
+    for it in range(max_iter):
+        active = np.flatnonzero(~converged)
+        if active.size == 0:
+            break
+
+        ln_K_new, beta = __update__(mixture, T[active], P[active], ln_K[active])
+        delta = ln_K_new - ln_K[active]
+
+        if accelerate and it % accelerate == accelerate - 1:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                lam = np.sum(delta * delta, axis=-1) / np.sum(delta_prev[active] * delta, axis=-1)
+            ok = (lam > 0) & (lam < 1)
+            ln_K_new = np.where(ok[:, np.newaxis], ln_K_new + delta * (lam / np.where(ok, 1 - lam, 1.0))[:, np.newaxis], ln_K_new)
+
+        error = np.max(np.abs(delta), axis=-1)
+        trivial = np.max(np.abs(ln_K_new), axis=-1) < 1e-4
+        converged[active] = (error < tol_ss) | trivial
+        ln_K[active] = ln_K_new
+        delta_prev[active] = delta
+
+    if newton:
+        ln_K[~stable], finished = __newton__(mixture, T[~stable], P[~stable], ln_K[~stable], tol)
+        converged[~stable] &= finished
+
+    return __result__(mixture, T, P, ln_K, converged, stable, shape)
+
+
+def __newton__(mixture: MixtureEoS, T: np.ndarray, P: np.ndarray, ln_K: np.ndarray, tol: float, max_iter: int=10, h: float=1e-7) -> Tuple[np.ndarray]:
+
+    """
+    Finishes two-phase solutions by Newton's iteration on the residuals ln K_i - ln phi_i^L + ln phi_i^V.
+    The Jacobian is computed by forward differences, all perturbed equilibrium ratios of all states are evaluated in one call
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        T (np.ndarray): Temperatures in K of shape (m,)
+        P (np.ndarray): Pressures in Pa of shape (m,)
+        ln_K (np.ndarray): Logarithms of equilibrium ratios of shape (m, n)
+        tol (float): Tolerance of the logarithms of equilibrium ratios
+        max_iter (int): Maximum number of Newton's iterations. Optional. Default 10
+        h (float): Step of the logarithms of equilibrium ratios to compute the Jacobian. Optional. Default 1e-7
+
+    Returns:
+        tuple: Logarithms of equilibrium ratios and convergence flags of shape (m,)
+    """
+
+    m, n = ln_K.shape
+    ln_K = ln_K.copy()
+    converged = np.zeros(m, dtype=bool)
+    beta = rachford_rice(mixture.ys, np.exp(ln_K))
+    converged |= (beta <= 0) | (beta >= 1) | (np.max(np.abs(ln_K), axis=-1) < 1e-4)
+
+    for _ in range(max_iter):
+        active = np.flatnonzero(~converged)
+        if active.size == 0:
+            break
+
+        k = active.size
+        perturbed = np.repeat(ln_K[active][:, np.newaxis, :], n + 1, axis=1)
+        perturbed[:, 1:, :] += h * np.eye(n)
+        ln_K_update, _ = __update__(
+            mixture, np.repeat(T[active], n + 1), np.repeat(P[active], n + 1), perturbed.reshape(k * (n + 1), n)
+        )
+        residual = (perturbed - ln_K_update.reshape(k, n + 1, n))
+        jacobian = np.swapaxes(residual[:, 1:, :] - residual[:, :1, :], 1, 2) / h
+        step = np.linalg.solve(jacobian, -residual[:, 0, :, np.newaxis])[..., 0]
+        ln_K[active] += step
+        converged[active] = np.max(np.abs(step), axis=-1) < tol
+
+    return ln_K, converged
+
+
+def __result__(mixture: MixtureEoS, T: np.ndarray, P: np.ndarray, ln_K: np.ndarray, converged: np.ndarray, stable: np.ndarray, shape: tuple) -> dict:
+
+    """
+    Computes phase fractions, compositions and properties of the flashed states
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        T (np.ndarray): Temperatures in K of shape (m,)
+        P (np.ndarray): Pressures in Pa of shape (m,)
+        ln_K (np.ndarray): Logarithms of equilibrium ratios of shape (m, n)
+        converged (np.ndarray): Convergence flags of shape (m,)
+        stable (np.ndarray): Flags of the states proven stable of shape (m,)
+        shape (tuple): Shape of the states
+
+    Returns:
+        dict: Flash results of the states
+    """
+
+    n = mixture.ys.size
+    Ks = np.exp(ln_K)
+    beta = rachford_rice(mixture.ys, Ks)
+
+    # Single phase states. Stable states and trivial solutions are labelled by the root of the feed with the lowest Gibbs energy
+    trivial = (np.max(np.abs(ln_K), axis=-1) < 1e-4) | stable
+    if np.any(trivial):
+        Z_stable = mixture.residual_properties(T[trivial], P[trivial], phase="stable")["Z"]
+        Z_vapour = mixture.residual_properties(T[trivial], P[trivial], phase="vapour")["Z"]
+        beta[trivial] = np.where(Z_stable == Z_vapour, 1.0, 0.0)
+    beta = np.clip(beta, 0.0, 1.0)
+    single = (beta == 0.0) | (beta == 1.0)
+
+    xs, ys = phase_compositions(mixture.ys, Ks, beta)
+    xs[single], ys[single] = mixture.ys, mixture.ys
+    liquid = mixture.residual_properties(T, P, xs, phase="liquid")
+    vapour = mixture.residual_properties(T, P, ys, phase="vapour")
+
+    return {
+        "beta": beta.reshape(shape),
+        "xs": xs.reshape(shape + (n,)),
+        "ys": ys.reshape(shape + (n,)),
+        "K": Ks.reshape(shape + (n,)),
+        "Z_liquid": liquid["Z"].reshape(shape),
+        "Z_vapour": vapour["Z"].reshape(shape),
+        "rho_liquid": liquid["rho"].reshape(shape),
+        "rho_vapour": vapour["rho"].reshape(shape),
+        "converged": converged.reshape(shape),
+        "stable": stable.reshape(shape)
+    }
+
+
+def __energy__(mixture: MixtureEoS, coefficients: List, T: np.ndarray, P: np.ndarray, xs: np.ndarray, phase: str, kind: str) -> Tuple[np.ndarray]:
+
+    """
+    Computes molar enthalpy or entropy of a phase and its derivative with respect to temperature.
+    The ideal gas part is given by NASA polynomials, the residual part by the EoS
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        coefficients (list): NASA coefficients of the components in database format
+        T (np.ndarray): Temperatures in K of shape (m,)
+        P (np.ndarray): Pressures in Pa of shape (m,)
+        xs (np.ndarray): Mole fractions of the phase of shape (n,) or (m, n)
+        phase (str): Root of the EoS
+        kind (str): "h" for enthalpy [J/mol] or "s" for entropy [J/(mol K)]
+
+    Returns:
+        tuple: Property, its derivative with respect to temperature and the compressibility factor of the phase
+    """
+
+    ideal = nasa.compute_species(T, coefficients)
+    residual = mixture.residual_properties(T, P, xs, phase=phase)
+    xs = np.broadcast_to(xs, ideal["h0"].shape)
+    cp = R * np.sum(xs * ideal["cp0"], axis=-1) + residual["Cp_dep"]
+
+    if kind == "h":
+        return R * T * np.sum(xs * ideal["h0"], axis=-1) + residual["H_dep"], cp, residual["Z"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s_mixing = -np.sum(np.where(xs > 0, xs * np.log(xs), 0.0), axis=-1)
+    s = R * (np.sum(xs * ideal["s0"], axis=-1) + s_mixing - np.log(P / P0)) + residual["S_dep"]
+    return s, cp / T, residual["Z"]
+
+
+def __energy_flash__(mixture: MixtureEoS, coefficients: List, P: np.ndarray, target: np.ndarray, kind: str, T0: np.ndarray, tol: float, max_iter: int, stability: bool) -> dict:
+
+    """
+    Finds temperatures matching given enthalpies or entropies at given pressures.
+    All states are first solved on the stable root of the EoS by Newton's iteration with analytic heat capacity.
+    States found unstable by the tangent plane distance test are then solved with the property of the PT flash with the
+    stability test at every iterate, so the solution is the one the PT flash returns at the found temperature. Its temperature
+    derivative (including latent heat) is computed by a forward difference with warm started equilibrium ratios.
+    A state is converged when the residual of the property is below tol * T * dproperty/dT
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        coefficients (list): NASA coefficients of the components in database format
+        P (np.ndarray): Pressures in Pa
+        target (np.ndarray): Enthalpies in J/mol or entropies in J/(mol K). Broadcast against P
+        kind (str): "h" or "s"
+        T0 (np.ndarray): Initial temperatures in K
+        tol (float): Relative tolerance of temperature
+        max_iter (int): Maximum number of Newton's iterations
+        stability (bool): Test stability of the solutions and solve the two phase states
+
+    Returns:
+        dict: Results of the flash
+    """
+
+    if len(coefficients) != mixture.ys.size:
+        raise ValueError(f"Number of NASA coefficients {len(coefficients)} does not match number of components {mixture.ys.size}")
+
+    P, target, T0 = np.broadcast_arrays(np.asarray(P, dtype=float), np.asarray(target, dtype=float), np.asarray(T0, dtype=float))
+    shape = P.shape
+    P, target, T = P.ravel(), target.ravel(), T0.ravel().copy()
+    m = P.size
+
+    # Single phase Newton's iteration on the stable root
+    converged = np.zeros(m, dtype=bool)
+    for _ in range(max_iter):
+        active = np.flatnonzero(~converged)
+        if active.size == 0:
+            break
+        f, df, _ = __energy__(mixture, coefficients, T[active], P[active], mixture.ys, "stable", kind)
+        converged[active] = np.abs(f - target[active]) <= tol * T[active] * np.abs(df)
+        # The last step of the converged states is taken too, Z is evaluated again below
+        dT = -(f - target[active]) / df
+        T[active] += np.clip(dT, -0.2 * T[active], 0.2 * T[active])
+
+    two_phase = np.zeros(m, dtype=bool)
+    if stability:
+        two_phase = ~stability_test(mixture, T, P)["stable"]
+
+    beta, Z = np.ones(m), np.zeros(m)
+    single = np.flatnonzero(~two_phase)
+    _, _, Z[single] = __energy__(mixture, coefficients, T[single], P[single], mixture.ys, "stable", kind)
+    Z_vapour = mixture.residual_properties(T[single], P[single], phase="vapour")["Z"]
+    beta[single] = np.where(Z[single] == Z_vapour, 1.0, 0.0)
+
+    # Two phase Newton's iteration on the property of the PT flash
+    index = np.flatnonzero(two_phase)
+    if index.size:
+        converged[index] = False
+        for _ in range(max_iter):
+            active = index[~converged[index]]
+            if active.size == 0:
+                break
+            f, df, flash = __two_phase__(mixture, coefficients, T[active], P[active], kind)
+            converged[active] = np.abs(f - target[active]) <= tol * T[active] * np.abs(df)
+            beta[active] = flash["beta"]
+            Z[active] = flash["beta"] * flash["Z_vapour"] + (1 - flash["beta"]) * flash["Z_liquid"]
+            dT = np.where(converged[active], 0.0, -(f - target[active]) / df)
+            T[active] += np.clip(dT, -0.05 * T[active], 0.05 * T[active])
+
+    T, Z = T.reshape(shape), Z.reshape(shape)
+    return {
+        "T": T,
+        "Z": Z,
+        "rho": (mixture.MW_mix * P.reshape(shape)) / (R * T * Z),
+        "beta": beta.reshape(shape),
+        "converged": converged.reshape(shape)
+    }
+
+
+def __two_phase__(mixture: MixtureEoS, coefficients: List, T: np.ndarray, P: np.ndarray, kind: str, dT: float=1e-3) -> Tuple:
+
+    """
+    Computes molar enthalpy or entropy of the PT flash solution and its derivative with respect to temperature by forward difference.
+    The flash at T runs the stability test, the flash at T + dT is warm started from its equilibrium ratios to stay on the same solution
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        coefficients (list): NASA coefficients of the components in database format
+        T (np.ndarray): Temperatures in K of shape (m,)
+        P (np.ndarray): Pressures in Pa of shape (m,)
+        kind (str): "h" or "s"
+        dT (float): Temperature step in K. Optional. Default 1e-3
+
+    Returns:
+        tuple: Property, its derivative with respect to temperature and the PT flash at T
+    """
+
+    flash = pt_flash(mixture, T, P)
+    values = []
+    for Ti, result in ((T, flash), (T + dT, pt_flash(mixture, T + dT, P, K=flash["K"]))):
+        f_vapour, _, _ = __energy__(mixture, coefficients, Ti, P, result["ys"], "vapour", kind)
+        f_liquid, _, _ = __energy__(mixture, coefficients, Ti, P, result["xs"], "liquid", kind)
+        values.append(result["beta"] * f_vapour + (1 - result["beta"]) * f_liquid)
+    return values[0], (values[1] - values[0]) / dT, flash
+
+
+def ph_flash(mixture: MixtureEoS, coefficients: List, P: np.ndarray, h: np.ndarray, T0: np.ndarray=300.0, tol: float=1e-10, max_iter: int=50, stability: bool=True) -> dict:
+
+    """
+    Computes temperatures of the mixture at given pressures and molar enthalpies for many states at once.
+    Newton's iteration uses analytic heat capacity, the ideal gas part from NASA polynomials and the residual part from the EoS.
+    Two phase states are detected by the tangent plane distance test and solved with the PT flash
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        coefficients (list): NASA coefficients of the components in database format [[[Tmin, Tmax], [a1, ..., a7], [b1, b2]], ...]
+        P (np.ndarray): Pressures in Pa. Broadcast against h
+        h (np.ndarray): Molar enthalpies in J/mol, NASA reference state (enthalpy of formation included)
+        T0 (np.ndarray): Initial temperatures in K. Optional. Default 300
+        tol (float): Relative tolerance of temperature, the residual of the property must be below tol * T times its temperature derivative. Optional. Default 1e-10
+        max_iter (int): Maximum number of Newton's iterations. Optional. Default 50
+        stability (bool): Test stability and solve two phase states. Optional. Default True
+
+    Returns:
+        dict: Temperatures T [K], compressibility factors Z and densities rho [kg/m^3] of the mixture (molar average of the phases),
+        vapour fractions beta and convergence flags converged
+    """
+
+    return __energy_flash__(mixture, coefficients, P, h, "h", T0, tol, max_iter, stability)
+
+
+def ps_flash(mixture: MixtureEoS, coefficients: List, P: np.ndarray, s: np.ndarray, T0: np.ndarray=300.0, tol: float=1e-10, max_iter: int=50, stability: bool=True) -> dict:
+
+    """
+    Computes temperatures of the mixture at given pressures and molar entropies for many states at once.
+    Newton's iteration uses analytic heat capacity, the ideal gas part from NASA polynomials and the residual part from the EoS.
+    Two phase states are detected by the tangent plane distance test and solved with the PT flash
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        coefficients (list): NASA coefficients of the components in database format [[[Tmin, Tmax], [a1, ..., a7], [b1, b2]], ...]
+        P (np.ndarray): Pressures in Pa. Broadcast against s
+        s (np.ndarray): Molar entropies in J/(mol K), NASA reference state at 1e5 Pa including entropy of mixing
+        T0 (np.ndarray): Initial temperatures in K. Optional. Default 300
+        tol (float): Relative tolerance of temperature, the residual of the property must be below tol * T times its temperature derivative. Optional. Default 1e-10
+        max_iter (int): Maximum number of Newton's iterations. Optional. Default 50
+        stability (bool): Test stability and solve two phase states. Optional. Default True
+
+    Returns:
+        dict: Temperatures T [K], compressibility factors Z and densities rho [kg/m^3] of the mixture (molar average of the phases),
+        vapour fractions beta and convergence flags converged
+    """
+
+    return __energy_flash__(mixture, coefficients, P, s, "s", T0, tol, max_iter, stability)
@@ -25,23 +25,79 @@ def wilke(ys, xs, MWs) -> float:
         float: X paramter of the mixture
     """
 
-    n = len(ys)
-    x_mix = 0.0
+    return float(WilkeMixer(MWs)(ys, xs))
 
-    ys = np.array(ys)
-    xs = np.array(xs)
-    MWs = np.array(MWs)
 
-    for i in range(n):
-        denom = 0.0
-        for j in range(n):
-            if i == j:
-                continue
-            phi_ij = (1 + (xs[i] / xs[j])**0.5 * (MWs[j] / MWs[i])**0.25)**2 / np.sqrt(8 * (1 + MWs[i] / MWs[j]))
-            denom += ys[j] * phi_ij
-        x_mix += ys[i] * xs[i] / denom
+class WilkeMixer:
+
+    """
+    Wilke's mixing rule for a fixed set of components
+
+    x_mix = sum_i y_i * x_i / sum_j y_j * phi_ij, phi_ij = (1 + (x_i / x_j)**0.5 * (M_j / M_i)**0.25)**2 / sqrt(8 * (1 + M_i / M_j))
+
+    The molecular weight factors of phi_ij depend only on the components and are computed once. The rule is evaluated
+    as matrix operations for arrays of states and compositions
+
+    Args:
+        MWs (list(float)): Molecular weights of the components
+
+    Attributes:
+        MWs (np.ndarray): Molecular weights of the components
+        mw_ratio (np.ndarray): Factors (M_j / M_i)**0.25 of shape (n, n)
+        mw_scale (np.ndarray): Factors 1 / sqrt(8 * (1 + M_i / M_j)) of shape (n, n)
+    """
+
+    def __init__(self, MWs):
+
+        MWs = np.array(MWs, dtype=float)
+        self.__MWs = MWs
+        self.__mw_ratio = (MWs[np.newaxis, :] / MWs[:, np.newaxis])**0.25
+        self.__mw_scale = 1 / np.sqrt(8 * (1 + MWs[:, np.newaxis] / MWs[np.newaxis, :]))
+
+    @property
+    def MWs(self):
+        return self.__MWs
+
+    @property
+    def mw_ratio(self):
+        return self.__mw_ratio
+
+    @property
+    def mw_scale(self):
+        return self.__mw_scale
 
-    return x_mix
+    def phi(self, xs: np.ndarray) -> np.ndarray:
+
+        """
+        Computes interaction parameters phi_ij
+
+        Args:
+            xs (np.ndarray): Property of the components of shape (..., n)
+
+        Returns:
+            np.ndarray: Interaction parameters of shape (..., n, n)
+        """
+
+        r = np.sqrt(np.asarray(xs, dtype=float))
+        return (1 + r[..., :, np.newaxis] / r[..., np.newaxis, :] * self.__mw_ratio)**2 * self.__mw_scale
+
+    def __call__(self, ys: np.ndarray, xs: np.ndarray) -> np.ndarray:
+
+        """
+        Computes property of the mixtures
+
+        Args:
+            ys (np.ndarray): Mole fractions of shape (..., n), e.g. (n_states, n) or (n,)
+            xs (np.ndarray): Property of the components (viscosity, thermal conductivity) of shape (..., n), e.g. at every temperature of the states. Broadcast against ys
+
+        Returns:
+            np.ndarray: Property of the mixtures of the broadcast shape of ys and xs without the last axis
+        """
+
+        ys, xs = np.asarray(ys, dtype=float), np.asarray(xs, dtype=float)
+        denominator = (self.phi(xs) @ ys[..., np.newaxis])[..., 0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.sum(np.where(ys > 0, ys * xs / denominator, 0.0), axis=-1)
 
 
 def kay(ys, xs):
@@ -118,3 +174,104 @@ def prausnitz_gunn(ys, Tcs, Vcs, ws, MWs, Tc_method="kay", Vc_method="kay") -> d
         "Zc_mix": float(Zc_mix),
         "ws_mix": float(omega_mix)
     }
+
+
+class PrausnitzGunn:
+
+    """
+    Prausnitz-Gunn pseudo critical properties for a fixed set of components and many compositions
+
+    The pair matrices sqrt(Tc_i * Tc_j) and ((Vc_i**(1/3) + Vc_j**(1/3)) / 2)**3 of the "binary" methods depend only on the
+    components and are computed once. Compositions are mixed as matrix operations
+
+    Args:
+        Tcs list(float): Critical temperatures in K of the components
+        Vcs list(float): Critical molar specific volumes in m^3/mol of the components
+        ws list(float): Acentric factors of the components
+        MWs list(float): Molecular weights in kg/mol of the components
+        Tc_method (str): Method to mix critical temperature. Optional. Default "kay". Available methods "kay" and "binary"
+        Vc_method (str): Method to mix critical molar specific volume. Optional. Default "kay". Available methods "kay" and "binary"
+
+    Attributes:
+        Tc_pairs (np.ndarray): Pair critical temperatures of shape (n, n)
+        Vc_pairs (np.ndarray): Pair critical volumes of shape (n, n)
+    """
+
+    def __init__(self, Tcs, Vcs, ws, MWs, Tc_method="kay", Vc_method="kay"):
+
+        for method in (Tc_method, Vc_method):
+            if method not in ("kay", "binary"):
+                raise ValueError(f"Mixing method {method} is not available. Available methods 'kay' and 'binary'")
+
+        self.__Tcs = np.array(Tcs, dtype=float)
+        self.__Vcs = np.array(Vcs, dtype=float)
+        self.__ws = np.array(ws, dtype=float)
+        self.__MWs = np.array(MWs, dtype=float)
+        self.__Tc_method = Tc_method
+        self.__Vc_method = Vc_method
+
+        self.__Tc_pairs = np.sqrt(np.outer(self.__Tcs, self.__Tcs))
+        u = self.__Vcs**(1 / 3)
+        self.__Vc_pairs = ((u[:, np.newaxis] + u[np.newaxis, :]) / 2)**3
+
+    @property
+    def Tc_pairs(self):
+        return self.__Tc_pairs
+
+    @property
+    def Vc_pairs(self):
+        return self.__Vc_pairs
+
+    def __call__(self, ys: np.ndarray) -> dict:
+
+        """
+        Computes pseudo critical properties of the mixtures
+
+        Args:
+            ys (np.ndarray): Mole fractions of shape (..., n), e.g. (n_compositions, n)
+
+        Returns:
+            dict: Arrays of shape (...) of the pseudocritical parameters (Tc_mix [K], Pc_mix [Pa], Vc_mix [m^3/mol], rhoc_mix [kg/m^3], Zc_mix) and acentric factor ws_mix of the mixtures
+        """
+
+        ys = np.asarray(ys, dtype=float)
+        omega_mix = ys @ self.__ws
+        if self.__Tc_method == "kay":
+            Tc_mix = ys @ self.__Tcs
+        else:
+            Tc_mix = np.sum((ys @ self.__Tc_pairs) * ys, axis=-1)
+        if self.__Vc_method == "kay":
+            Vc_mix = ys @ self.__Vcs
+        else:
+            Vc_mix = np.sum((ys @ self.__Vc_pairs) * ys, axis=-1)
+
+        Zc_mix = 0.2905 - 0.085 * omega_mix
+        return {
+            "Tc_mix": Tc_mix,
+            "Pc_mix": Zc_mix * R * Tc_mix / Vc_mix,
+            "Vc_mix": Vc_mix,
+            "rhoc_mix": (ys @ self.__MWs) / Vc_mix,
+            "Zc_mix": Zc_mix,
+            "ws_mix": omega_mix
+        }
+
+
+def prausnitz_gunn_batch(ys, Tcs, Vcs, ws, MWs, Tc_method="kay", Vc_method="kay") -> dict:
+
+    """
+    Computes Pseudo critical properties for many compositions of the same components using Prausnitz-Gunn approach
+
+    Args:
+        ys (np.ndarray): Mole fractions of shape (..., n), e.g. (n_compositions, n)
+        Tcs list(float): Critical temperatures in K for each component in mixture
+        Vcs list(float): Molar specific volumes in m^3/mol for each component in the mixture
+        ws list(float): Acentric factors for each componet in the mixture
+        MWs list(float): Molecular weight in kg/mol for each component in the mixture
+        Tc_method (str): Method to mix critical temperature. Optional. Default "kay". Available methods "kay" and "binary"
+        Vc_method (str): Method to mix critical molar specific volume. Optional. Default "kay". Available methods "kay" and "binary"
+
+    Returns:
+        dict: Arrays of shape (...) of the pseudocritical parameters (Tc_mix [K], Pc_mix [Pa], Vc_mix [m^3/mol], rhoc_mix [kg/m^3], Zc_mix) and acentric factor ws_mix of the mixtures
+    """
+
+    return PrausnitzGunn(Tcs, Vcs, ws, MWs, Tc_method, Vc_method)(ys)
@@ -20,6 +20,8 @@ Bonnie J. McBride, Michael J. Zehe, and Sanford Gordon.\n
 Glenn Research Center, Cleveland, Ohio, 2002
 """
 
+import warnings
+import numpy as np
 from typing import List
 from math import log
 
@@ -108,3 +110,428 @@ def compute(temperature: float, a: List[float], b: List[float]) -> dict:
         'h0': molar_enthalpy(temperature, a, b[0]),
         's0': entropy(temperature, a, b[1])
     }
+
+
+def compute_batch(temperature: np.ndarray, coefficients: List) -> dict:
+
+    """
+    Computes demensionless parameters using NASA approximation for an array of temperatures.
+    The temperature range of the coefficients is selected for every temperature, temperatures below the first
+    or above the last range are extrapolated by the nearest range
+
+    :param temperature: np.ndarray, Temperatures in Kelvin at which parameters to be calculated
+    :param coefficients: List, NASA coefficients of the species in database format [[[Tmin, Tmax], [a1, ..., a7], [b1, b2]], ...]
+
+    :return parameters: dict, Demensionless Molar Heat Capacity at Constant Pressure cp0,
+    Enthalpy h0, Entropy s0 arrays of the shape of temperature
+    """
+
+    T = np.asarray(temperature, dtype=float)
+    bounds = np.array([c[0][1] for c in coefficients[:-1]])
+    a = np.array([c[1] for c in coefficients], dtype=float)
+    b = np.array([c[2] for c in coefficients], dtype=float)
+    if a.shape[-1] < 7:
+        raise ValueError(f'Number of approximation coefficients must be 7. Given {a.shape[-1]}')
+
+    ranges = np.searchsorted(bounds, T, side="left")
+    return evaluate(T, np.concatenate([a, b], axis=-1)[ranges])
+
+
+def pack(coefficients: List) -> tuple:
+
+    """
+    Packs NASA coefficients of several species into contiguous arrays. Species with fewer ranges are padded by
+    their last range
+
+    :param coefficients: List, NASA coefficients of every species in database format [[[Tmin, Tmax], [a1, ..., a7], [b1, b2]], ...]
+
+    :return packed: tuple, Temperature bounds of the ranges of shape (species, ranges, 2) and coefficients
+    a1, ..., a7, b1, b2 of shape (species, ranges, 9)
+    """
+
+    size = max(len(c) for c in coefficients)
+    bounds = np.empty((len(coefficients), size, 2))
+    tensor = np.empty((len(coefficients), size, 9))
+    for i, species in enumerate(coefficients):
+        for j in range(size):
+            (t, a, b) = species[min(j, len(species) - 1)]
+            if len(a) < 7:
+                raise ValueError(f'Number of approximation coefficients must be 7. Given {len(a)}')
+            bounds[i, j] = t
+            tensor[i, j, :7], tensor[i, j, 7:] = a[:7], b[:2]
+
+    return bounds, tensor
+
+
+def evaluate(temperature: np.ndarray, tensor: np.ndarray) -> dict:
+
+    """
+    Evaluates NASA polynomials of gathered coefficients by Horner's scheme. Logarithm and inverse powers of temperature
+    are computed once and shared by all polynomials
+
+    :param temperature: np.ndarray, Temperatures in Kelvin broadcast against the leading axes of tensor
+    :param tensor: np.ndarray, Coefficients a1, ..., a7, b1, b2 of shape (..., 9)
+
+    :return parameters: dict, Demensionless Molar Heat Capacity at Constant Pressure cp0,
+    Enthalpy h0, Entropy s0 arrays of the broadcast shape
+    """
+
+    T = np.asarray(temperature, dtype=float)
+    a = np.moveaxis(tensor, -1, 0)
+    ln_T, T_1 = np.log(T), 1 / T
+    T_2 = T_1 * T_1
+
+    return {
+        'cp0': a[0] * T_2 + a[1] * T_1 + a[2] + T * (a[3] + T * (a[4] + T * (a[5] + T * a[6]))),
+        'h0': -a[0] * T_2 + a[1] * ln_T * T_1 + a[2] + T * (a[3] / 2 + T * (a[4] / 3 + T * (a[5] / 4 + T * a[6] / 5))) + a[7] * T_1,
+        's0': -a[0] * T_2 / 2 - a[1] * T_1 + a[2] * ln_T + T * (a[3] + T * (a[4] / 2 + T * (a[5] / 3 + T * a[6] / 4))) + a[8]
+    }
+
+
+class SpeciesNASA:
+
+    """
+    NASA polynomials of several species packed into one coefficient tensor of shape (species, ranges, 9)
+
+    The internal range boundaries of all species are merged into one sorted array of breakpoints. For every interval
+    between the breakpoints the range of every species is tabulated, so the ranges of all species at a temperature
+    are found by one np.searchsorted call and one gather. Temperatures outside of the ranges of a species are
+    extrapolated by its nearest range
+
+    The polynomials of neighbouring ranges are checked to match at the boundaries: a jump of cp0, h0 or s0 larger than
+    tol * cp0 marks the species as discontinuous. Heat capacity is sampled in every range, a non-positive cp0 marks the
+    species as not monotonic, its enthalpy and entropy do not increase with temperature. The inverse functions of such
+    species may have no root or several roots. The flags are always kept, RuntimeWarning is issued only on request: the
+    shipped lib/thermo.json has the wrong sign of b1 in the lower range of about half of its species (e.g. CH4, H2O, CO2),
+    so their enthalpy jumps at 1000 K and the continuity check fails for them
+
+    :param coefficients: List, NASA coefficients of every species in database format [[[Tmin, Tmax], [a1, ..., a7], [b1, b2]], ...]
+    :param tol: float, Relative tolerance of the jumps at the range boundaries. Optional. Default 1e-6
+    :param points: int, Number of sampled points of heat capacity in every range. Optional. Default 50
+    :param warn: bool, Issue RuntimeWarning for discontinuous or not monotonic species. Optional. Default False
+
+    Attributes:
+        breakpoints (np.ndarray): Sorted internal range boundaries of all species
+        ranges (np.ndarray): Range of every species in every interval between the breakpoints of shape (intervals, species)
+        tensor (np.ndarray): Coefficients a1, ..., a7, b1, b2 of shape (species, ranges, 9)
+        Tmin, Tmax (np.ndarray): Valid temperature range of every species
+        continuous (np.ndarray): Flags of the species with polynomials matching at the range boundaries
+        monotonic (np.ndarray): Flags of the species with positive heat capacity in all ranges
+    """
+
+    def __init__(self, coefficients: List, tol: float=1e-6, points: int=50, warn: bool=False):
+
+        bounds, self.__tensor = pack(coefficients)
+        counts = [len(c) for c in coefficients]
+        self.__Tmin = bounds[:, 0, 0]
+        self.__Tmax = np.array([bounds[i, k - 1, 1] for i, k in enumerate(counts)])
+
+        internal = [bounds[i, :k - 1, 1] for i, k in enumerate(counts)]
+        self.__breakpoints = np.unique(np.concatenate(internal))
+
+        # Interval k covers (breakpoints[k - 1], breakpoints[k]], a species is in the range with the same side convention
+        left = np.concatenate([[-np.inf], self.__breakpoints])
+        self.__ranges = np.stack([np.searchsorted(b, left, side="right") for b in internal], axis=-1)
+
+        # Padded ranges repeat the last one, so their boundaries compare a polynomial with itself
+        T = bounds[:, :-1, 1]
+        below, above = evaluate(T, self.__tensor[:, :-1]), evaluate(T, self.__tensor[:, 1:])
+        jump = np.max([np.abs(below[key] - above[key]) for key in ('cp0', 'h0', 's0')], axis=0)
+        self.__continuous = np.all(jump <= tol * np.abs(below['cp0']), axis=-1)
+
+        t = np.linspace(0.0, 1.0, points)
+        sampled = bounds[..., 0:1] + t * (bounds[..., 1:2] - bounds[..., 0:1])
+        self.__monotonic = np.all(evaluate(sampled, self.__tensor[:, :, np.newaxis, :])['cp0'] > 0, axis=(-2, -1))
+
+        if warn and not np.all(self.__continuous):
+            warnings.warn(f'NASA polynomials do not match at the range boundaries for species {np.flatnonzero(~self.__continuous).tolist()}', RuntimeWarning)
+        if warn and not np.all(self.__monotonic):
+            warnings.warn(f'NASA heat capacity is not positive in the ranges of species {np.flatnonzero(~self.__monotonic).tolist()}', RuntimeWarning)
+
+    @property
+    def breakpoints(self):
+        return self.__breakpoints
+
+    @property
+    def ranges(self):
+        return self.__ranges
+
+    @property
+    def tensor(self):
+        return self.__tensor
+
+    @property
+    def Tmin(self):
+        return self.__Tmin
+
+    @property
+    def Tmax(self):
+        return self.__Tmax
+
+    @property
+    def continuous(self):
+        return self.__continuous
+
+    @property
+    def monotonic(self):
+        return self.__monotonic
+
+    def gather(self, temperature: np.ndarray) -> np.ndarray:
+
+        """
+        Gathers coefficients of the ranges of all species at the temperatures
+
+        :param temperature: np.ndarray, Temperatures in Kelvin
+
+        :return tensor: np.ndarray, Coefficients of shape (..., species, 9)
+        """
+
+        interval = np.searchsorted(self.__breakpoints, np.asarray(temperature, dtype=float), side="left")
+        return self.__tensor[np.arange(self.__tensor.shape[0]), self.__ranges[interval]]
+
+    def __call__(self, temperature: np.ndarray) -> dict:
+
+        """
+        Computes demensionless parameters of all species
+
+        :param temperature: np.ndarray, Temperatures in Kelvin
+
+        :return parameters: dict, Demensionless Molar Heat Capacity at Constant Pressure cp0,
+        Enthalpy h0, Entropy s0 arrays of shape (..., number of species)
+        """
+
+        T = np.asarray(temperature, dtype=float)
+        return evaluate(T[..., np.newaxis], self.gather(T))
+
+
+def compute_species(temperature: np.ndarray, coefficients: List) -> dict:
+
+    """
+    Computes demensionless parameters using NASA approximation of several species for an array of temperatures
+
+    :param temperature: np.ndarray, Temperatures in Kelvin at which parameters to be calculated
+    :param coefficients: List, NASA coefficients of every species in database format
+
+    :return parameters: dict, Demensionless Molar Heat Capacity at Constant Pressure cp0,
+    Enthalpy h0, Entropy s0 arrays of shape (..., number of species)
+    """
+
+    return SpeciesNASA(coefficients)(temperature)
+
+
+class MixtureNASA:
+
+    """
+    NASA polynomials of an ideal gas mixture of fixed composition
+
+    Properties cp0, h0 and s0 are linear in the coefficients, so the mole weighted properties of the mixture are given by
+    one polynomial with mole weighted coefficients in every interval between the merged range boundaries of the species.
+    The polynomials are precomputed once, an evaluation costs the same for any number of species.
+    The entropy is the mole weighted sum of the entropies of the species, the entropy of mixing is not included
+
+    :param species: SpeciesNASA | List, Packed polynomials of the species or NASA coefficients of every species in database format
+    :param ys: np.ndarray, Mole fractions of the species
+
+    Attributes:
+        breakpoints (np.ndarray): Sorted internal range boundaries of the species present in the mixture
+        tensor (np.ndarray): Coefficients a1, ..., a7, b1, b2 of the intervals between the breakpoints of shape (intervals, 9)
+        ys (np.ndarray): Mole fractions of the species
+        Tmin, Tmax (float): Valid temperature range of the mixture, the common range of the species present in it
+    """
+
+    def __init__(self, species: SpeciesNASA | List, ys: np.ndarray):
+
+        if not isinstance(species, SpeciesNASA):
+            species = SpeciesNASA(species)
+        ys = np.asarray(ys, dtype=float)
+        if ys.shape != species.Tmin.shape:
+            raise ValueError(f'Number of mole fractions {ys.size} does not match number of species {species.Tmin.size}')
+
+        present = ys > 0
+        self.__ys = ys
+        self.__Tmin = float(np.max(species.Tmin[present]))
+        self.__Tmax = float(np.min(species.Tmax[present]))
+
+        # Breakpoints of the absent species do not change the polynomial of the mixture and are dropped
+        intervals = np.concatenate([[True], np.any(np.diff(species.ranges[:, present], axis=0) != 0, axis=-1)])
+        tensor = np.einsum("i,kij->kj", ys, species.tensor[np.arange(ys.size), species.ranges])
+        self.__breakpoints = species.breakpoints[intervals[1:]]
+        self.__tensor = tensor[intervals]
+
+    @property
+    def breakpoints(self):
+        return self.__breakpoints
+
+    @property
+    def tensor(self):
+        return self.__tensor
+
+    @property
+    def ys(self):
+        return self.__ys
+
+    @property
+    def Tmin(self):
+        return self.__Tmin
+
+    @property
+    def Tmax(self):
+        return self.__Tmax
+
+    def gather(self, temperature: np.ndarray) -> np.ndarray:
+
+        """
+        Gathers coefficients of the mixture at the temperatures
+
+        :param temperature: np.ndarray, Temperatures in Kelvin
+
+        :return tensor: np.ndarray, Coefficients of shape (..., 9)
+        """
+
+        return self.__tensor[np.searchsorted(self.__breakpoints, np.asarray(temperature, dtype=float), side="left")]
+
+    def __call__(self, temperature: np.ndarray) -> dict:
+
+        """
+        Computes demensionless parameters of the mixture
+
+        :param temperature: np.ndarray, Temperatures in Kelvin
+
+        :return parameters: dict, Demensionless Molar Heat Capacity at Constant Pressure cp0,
+        Enthalpy h0, Entropy s0 arrays of the shape of temperature
+        """
+
+        return evaluate(temperature, self.gather(temperature))
+
+
+def __intervals__(polynomials: SpeciesNASA | MixtureNASA) -> tuple:
+
+    """
+    Tabulates the intervals between the breakpoints clipped to the valid range with their polynomials
+
+    :param polynomials: SpeciesNASA | MixtureNASA, Packed polynomials
+
+    :return intervals: tuple, Left and right ends of the intervals in Kelvin of shape (intervals,) for a mixture or
+    (intervals, species) for species, intervals outside of the valid range have equal ends, and coefficients of the
+    intervals of shape (intervals, 9) or (intervals, species, 9)
+    """
+
+    edges = np.concatenate([[-np.inf], polynomials.breakpoints, [np.inf]])
+    if isinstance(polynomials, MixtureNASA):
+        left, right, tensor = edges[:-1], edges[1:], polynomials.tensor
+    else:
+        n = polynomials.tensor.shape[0]
+        left, right = edges[:-1, np.newaxis], edges[1:, np.newaxis]
+        tensor = polynomials.tensor[np.arange(n), polynomials.ranges]
+
+    return np.clip(left, polynomials.Tmin, polynomials.Tmax), np.clip(right, polynomials.Tmin, polynomials.Tmax), tensor
+
+
+def __invert__(polynomials: SpeciesNASA | MixtureNASA, target: np.ndarray, kind: str, T0: np.ndarray, tol: float, max_iter: int, jump: float=1e-6) -> np.ndarray:
+
+    """
+    Solves h0 * T = target or s0 = target for temperature by Newton's iteration safeguarded by bisection.
+    The root is bracketed in every interval between the range boundaries by the polynomial of the interval, the
+    iteration runs on the polynomial of the only bracketing interval and the bracket is narrowed at every iteration
+
+    :param polynomials: SpeciesNASA | MixtureNASA, Packed polynomials
+    :param target: np.ndarray, Enthalpies H0 / Ru in K or entropies S0 / Ru
+    :param kind: str, "h" or "s"
+    :param T0: np.ndarray, Initial temperatures in Kelvin or None
+    :param tol: float, Relative tolerance of temperature
+    :param max_iter: int, Maximum number of iterations
+    :param jump: float, Relative distance in temperature of a root from the ends of an interval to be taken as a root
+    at the end. Optional. Default 1e-6, the tolerance of the continuity check of SpeciesNASA
+
+    :return temperature: np.ndarray, Temperatures in Kelvin, NaN for targets without a unique root
+
+    :note: Polynomials jumping at a range boundary (see SpeciesNASA.continuous) may bracket a target in two intervals
+    or in none, e.g. a target in the gap of the jump. Such targets have no unique temperature and give NaN. A root at
+    the common end of two intervals is counted once
+    """
+
+    species = isinstance(polynomials, SpeciesNASA)
+    target = np.asarray(target, dtype=float)
+    if species:
+        target = np.broadcast_to(target, np.broadcast_shapes(target.shape, polynomials.Tmin.shape))
+    left, right, tensor = __intervals__(polynomials)
+
+    def residual(T, coefficients, target):
+        p = evaluate(T, coefficients)
+        if kind == "h":
+            return p['h0'] * T - target, p['cp0']
+        return p['s0'] - target, p['cp0'] / T
+
+    # The interval axis is next to the species axis for species and the last axis for a mixture
+    axis = -2 if species else -1
+    expanded = np.expand_dims(target, axis)
+    g_left, dg_left = residual(left, tensor, expanded)
+    g_right, dg_right = residual(right, tensor, expanded)
+    slack_left, slack_right = jump * left * np.abs(dg_left), jump * right * np.abs(dg_right)
+    bracket = (left < right) & (g_left <= slack_left) & (g_right >= -slack_right)
+    at_right, at_left = np.abs(g_right) <= slack_right, np.abs(g_left) <= slack_left
+    b, at_right, at_left = [np.moveaxis(x, axis, 0) for x in (bracket, at_right, at_left)]
+    shared = b[:-1] & b[1:] & at_right[:-1] & at_left[1:]
+    unique = np.sum(b, axis=0) - np.sum(shared, axis=0) == 1
+
+    k = np.argmax(bracket, axis=axis)
+    index = (k, np.arange(tensor.shape[1])) if species else (k,)
+    lo, hi, coefficients = left[index], right[index], tensor[index]
+
+    g_lo, _ = residual(lo, coefficients, target)
+    g_hi, _ = residual(hi, coefficients, target)
+    if T0 is None:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            T = lo - g_lo * (hi - lo) / (g_hi - g_lo)
+    else:
+        T = np.broadcast_to(np.asarray(T0, dtype=float), target.shape).copy()
+    T = np.where(unique & (T > lo) & (T < hi), T, 0.5 * (lo + hi))
+
+    converged = ~unique
+    for _ in range(max_iter):
+        g, dg = residual(T, coefficients, target)
+        lo, hi = np.where(g < 0, T, lo), np.where(g < 0, hi, T)
+        T_new = T - g / dg
+        T_new = np.where((T_new > lo) & (T_new < hi), T_new, 0.5 * (lo + hi))
+        converged |= np.abs(T_new - T) <= tol * T
+        T = np.where(converged, T, T_new)
+        if np.all(converged):
+            break
+
+    return np.where(unique, T, np.nan)
+
+
+def temperature_from_enthalpy(enthalpy: np.ndarray, polynomials: SpeciesNASA | MixtureNASA, T0: np.ndarray=None, tol: float=1e-12, max_iter: int=50) -> np.ndarray:
+
+    """
+    Computes temperatures of species or a mixture from their ideal gas enthalpies H0(T) / Ru = h0 * T using cp0
+    as the derivative
+
+    :param enthalpy: np.ndarray, Enthalpies H0 / Ru in K. For species the last axis is the species axis
+    :param polynomials: SpeciesNASA | MixtureNASA, Packed polynomials of the species or of the mixture
+    :param T0: np.ndarray, Initial temperatures in Kelvin. Optional. Default None, regula falsi on the valid range
+    :param tol: float, Relative tolerance of temperature. Optional. Default 1e-12
+    :param max_iter: int, Maximum number of iterations. Optional. Default 50
+
+    :return temperature: np.ndarray, Temperatures in Kelvin, NaN for enthalpies without a unique temperature in the valid range
+    """
+
+    return __invert__(polynomials, enthalpy, "h", T0, tol, max_iter)
+
+
+def temperature_from_entropy(entropy: np.ndarray, polynomials: SpeciesNASA | MixtureNASA, T0: np.ndarray=None, tol: float=1e-12, max_iter: int=50) -> np.ndarray:
+
+    """
+    Computes temperatures of species or a mixture from their ideal gas entropies at standard pressure S0(T) / Ru = s0
+    using cp0 / T as the derivative. Entropy of mixing and pressure terms must be subtracted from the entropy beforehand
+
+    :param entropy: np.ndarray, Entropies S0 / Ru. For species the last axis is the species axis
+    :param polynomials: SpeciesNASA | MixtureNASA, Packed polynomials of the species or of the mixture
+    :param T0: np.ndarray, Initial temperatures in Kelvin. Optional. Default None, regula falsi on the valid range
+    :param tol: float, Relative tolerance of temperature. Optional. Default 1e-12
+    :param max_iter: int, Maximum number of iterations. Optional. Default 50
+
+    :return temperature: np.ndarray, Temperatures in Kelvin, NaN for entropies without a unique temperature in the valid range
+    """
+
+    return __invert__(polynomials, entropy, "s", T0, tol, max_iter)
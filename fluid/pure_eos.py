@@ -3,6 +3,7 @@ import sys
 import numpy as np
 import numbers
 
+from dataclasses import replace
 from typing import Tuple
 
 
@@ -13,65 +14,148 @@ sys.path.append(PYTHON_PATH)
 
 
 from fluid.const import R
+from fluid.cubic import MODELS, CubicModel, aungier_liquid_alpha, component_parameters, compressibility
 
 
-def redlich_kwong(T: float, P: float, Mw:float, Tc: float, Pc: float, rhoc: float = None, omega: float = None, model: str="standard") -> float:
+REDLICH_KWONG_AUNGIER_LIQUID = replace(MODELS["aungier"], alpha=aungier_liquid_alpha)
+
+
+def __solve__(model: CubicModel, T: np.ndarray, P: np.ndarray, Mw: np.ndarray, Tc: np.ndarray, Pc: np.ndarray, omega: np.ndarray=None, vc: np.ndarray=None) -> Tuple[np.ndarray]:
+
+    """
+    Computes Compressibility Factor and Density of pure fluids using generalized cubic EoS.
+    All arguments are broadcast against each other
+
+    Args:
+        model (CubicModel): Parameter set of the EoS
+        T (np.ndarray): Temperature in K
+        P (np.ndarray): Pressure in Pa
+        Mw (np.ndarray): Molecular weight in kg/mol
+        Tc (np.ndarray): Critical temperature in K
+        Pc (np.ndarray): Critical pressure in Pa
+        omega (np.ndarray): Acentric factor. Optional. Default None
+        vc (np.ndarray): Critical specific molar volume in m^3/mol. Optional. Default None
+
+    Returns:
+        tuple: Compressibility factor and density in kg/m^3
+    """
+
+    a, b, c, kappa = component_parameters(model, Tc, Pc, omega, vc)
+    a = a * model.alpha(T, Tc, kappa)
+
+    A = a * P / (R * T)**2
+    B = b * P / (R * T)
+    C = c * P / (R * T)
+    Z, _ = compressibility(model, A, B, C)
+    rho = P * Mw / (R * T * Z)
 
-    a0 = 0.42747 * R**2 * Tc**2 / Pc
-    b = 0.08664 * R * Tc / Pc
+    return Z, rho
+
+
+def __model__(model: str, Mw: np.ndarray, rhoc: np.ndarray=None, omega: np.ndarray=None) -> Tuple:
+
+    """
+    Selects parameter set of Redlich-Kwong EoS and checks its arguments
+
+    Args:
+        model (str): Redlich-Kwong EoS model "standard", "aungier" or "soave"
+        Mw (np.ndarray): Molecular weight in kg/mol
+        rhoc (np.ndarray): Critical density in kg/m^3. Optional. Default None
+        omega (np.ndarray): Acentric factor. Optional. Default None
+
+    Returns:
+        tuple: Parameter set of the EoS, acentric factor and critical specific molar volume
+    """
 
     if model == "standard":
-        n = 0.5
-        c = 0.0
-        a = a0 * (T / Tc)**(-n)
+        return MODELS["standard"], None, None
     elif model == "aungier":
-        
-        if  not (rhoc is None and omega is None):
-            RuntimeError("rho and/or omega is not provided")
-
-        vc = 1 / rhoc
-        n = 0.4986 + 1.1735 * omega + 0.4754 * omega**2
-        c = R * Tc / (Pc + a0 / (vc * (vc + b))) + b - vc
-        a = a0 * (T / Tc)**(-n)
-        if T < Tc:
-            coeffs = [-3.80666e+3, 6.59754e+1, -3.92603e-1, 6.11597e-4, 2.74395e-6, -1.18587e-8, 1.26942e-11]
-            n_liquid = sum([ai * T ** i for i, ai in enumerate(coeffs)])
-            a *= (Tc / T)**(n_liquid / n)
-        vm_roots = np.roots([P, P * c - R * T, P * b - R * T * b + a, -a * b + a * c])
-        rho = float(Mw / max(vm_roots.real))
-        Z = P * Mw / (R * T * rho)
-        return Z, rho
+
+        if rhoc is None or omega is None:
+            raise RuntimeError("rho and/or omega is not provided")
+
+        return REDLICH_KWONG_AUNGIER_LIQUID, omega, np.asarray(Mw, dtype=float) / np.asarray(rhoc, dtype=float)
     elif model == "soave":
-        
-        if  not (rhoc is None and omega is None):
-            RuntimeError("rho and/or omega is not provided")
 
-        n = 0.48 + 1.574 * omega - 0.176 * omega ** 2
-        a = a0 * (1 + n * (1 - (T / Tc)**0.5))**2
+        if omega is None:
+            raise RuntimeError("omega is not provided")
+
+        return MODELS["soave"], omega, None
     else:
         raise RuntimeError(f"EOS model has not been determined")
 
-    A = a * P / (R * T)**2
-    B = b * P / (R * T)
-    Z_roots = np.roots([1, -1, (A - B - B**2), -A * B])
-    Z = float(max(Z_roots.real))
-    rho = P * Mw / (R * T * Z)
 
-    return Z, rho
+def redlich_kwong(T: float, P: float, Mw:float, Tc: float, Pc: float, rhoc: float = None, omega: float = None, model: str="standard") -> float:
+
+    eos, omega, vc = __model__(model, Mw, rhoc, omega)
+    Z, rho = __solve__(eos, T, P, Mw, Tc, Pc, omega, vc)
+    return float(Z), float(rho)
 
 
 def peng_robinson(T, P, Mw, Tc, Pc, omega) -> Tuple[float]:
-    
-    b = 0.0778 * R * Tc / Pc
-    a0 = 0.45724 * (R * Tc)**2 / Pc
-    n = 0.37464 + 1.54226 * omega - 0.26993 * omega**2
-    a = a0 * (1 + n * (1 - np.sqrt(T / Tc))) ** 2
-
-    A = float(a * P / (R * T)**2)
-    B = float(b * P / (R * T))
-    coeffs = [1, -(1 - B), (A - 2 * B - 3 * B ** 3), -(A * B - B ** 2 - B ** 3)]
-    Z_roots = np.roots(coeffs)
-    Z = float(max(Z_roots.real))
-    rho = P * Mw /(Z * R * T)
+    Z, rho = __solve__(MODELS["peng_robinson"], T, P, Mw, Tc, Pc, omega)
+    return float(Z), float(rho)
 
-    return Z, rho
+
+def __components__(T: np.ndarray, *args) -> list:
+
+    """
+    Reshapes component properties of shape (n,) to (n, 1, ..., 1) to broadcast them against states of the shape of T
+
+    Args:
+        T (np.ndarray): States
+        args (np.ndarray): Component properties or None
+
+    Returns:
+        list: Reshaped component properties
+    """
+
+    ndim = np.ndim(T)
+    return [None if x is None else np.reshape(np.asarray(x, dtype=float), (-1,) + (1,) * ndim) for x in args]
+
+
+def redlich_kwong_batch(T: np.ndarray, P: np.ndarray, Mws: np.ndarray, Tcs: np.ndarray, Pcs: np.ndarray, rhocs: np.ndarray=None, omegas: np.ndarray=None, model: str="standard") -> Tuple[np.ndarray]:
+
+    """
+    Computes Compressibility Factors and Densities of several pure fluids at many states in one call
+
+    Args:
+        T (np.ndarray): Temperatures in K. Broadcast against P
+        P (np.ndarray): Pressures in Pa. Broadcast against T
+        Mws (np.ndarray): Molecular weights of the fluids in kg/mol of shape (n,)
+        Tcs (np.ndarray): Critical temperatures of the fluids in K of shape (n,)
+        Pcs (np.ndarray): Critical pressures of the fluids in Pa of shape (n,)
+        rhocs (np.ndarray): Critical densities of the fluids in kg/m^3 of shape (n,). Optional. Default None, needed for "aungier" model
+        omegas (np.ndarray): Acentric factors of the fluids of shape (n,). Optional. Default None, needed for "aungier" and "soave" models
+        model (str): Redlich-Kwong EoS model "standard", "aungier" or "soave". Optional. Default "standard"
+
+    Returns:
+        tuple: Compressibility factors and densities in kg/m^3 of shape (n, ...) where ... is the broadcast shape of T and P
+    """
+
+    T, P = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P, dtype=float))
+    Mws, Tcs, Pcs, rhocs, omegas = __components__(T, Mws, Tcs, Pcs, rhocs, omegas)
+    eos, omegas, vcs = __model__(model, Mws, rhocs, omegas)
+    return __solve__(eos, T, P, Mws, Tcs, Pcs, omegas, vcs)
+
+
+def peng_robinson_batch(T: np.ndarray, P: np.ndarray, Mws: np.ndarray, Tcs: np.ndarray, Pcs: np.ndarray, omegas: np.ndarray) -> Tuple[np.ndarray]:
+
+    """
+    Computes Compressibility Factors and Densities of several pure fluids at many states in one call
+
+    Args:
+        T (np.ndarray): Temperatures in K. Broadcast against P
+        P (np.ndarray): Pressures in Pa. Broadcast against T
+        Mws (np.ndarray): Molecular weights of the fluids in kg/mol of shape (n,)
+        Tcs (np.ndarray): Critical temperatures of the fluids in K of shape (n,)
+        Pcs (np.ndarray): Critical pressures of the fluids in Pa of shape (n,)
+        omegas (np.ndarray): Acentric factors of the fluids of shape (n,)
+
+    Returns:
+        tuple: Compressibility factors and densities in kg/m^3 of shape (n, ...) where ... is the broadcast shape of T and P
+    """
+
+    T, P = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P, dtype=float))
+    Mws, Tcs, Pcs, omegas = __components__(T, Mws, Tcs, Pcs, omegas)
+    return __solve__(MODELS["peng_robinson"], T, P, Mws, Tcs, Pcs, omegas)
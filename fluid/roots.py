@@ -0,0 +1,160 @@
+import numpy as np
+from typing import List, Tuple
+
+
+def cubic_roots(coeffs: List[np.ndarray], polish: int = 2) -> Tuple[np.ndarray]:
+
+    """
+    Computes the largest (vapour-like) and the smallest (liquid-like) real roots of a batch
+    of cubic equations c3 * x**3 + c2 * x**2 + c1 * x + c0 = 0 using Cardano's formula for
+    a single real root and the trigonometric solution for three real roots, followed by
+    Newton's polishing of both roots on the original equation
+
+    Args:
+        coeffs (list(np.ndarray)): coefficients [c3, c2, c1, c0] of the cubic equations, highest power first. Every coefficient is broadcast against the others
+        polish (int): number of Newton iterations to refine the roots. Optional. Default 2
+
+    Returns:
+        tuple: Arrays of the largest and the smallest real roots. Both are equal if the equation has a single real root
+    """
+
+    c3, c2, c1, c0 = np.broadcast_arrays(*[np.asarray(c, dtype=float) for c in coeffs])
+    a, b, c = c2 / c3, c1 / c3, c0 / c3
+
+    # Depressed cubic t**3 + p * t + q = 0 with x = t - a / 3
+    shift = a / 3
+    p = b - a * shift
+    q = (2 * shift**2 - b) * shift + c
+    D = (q / 2)**2 + (p / 3)**3
+
+    # Single real root. The sign choice keeps u away from cancellation
+    with np.errstate(invalid="ignore", divide="ignore"):
+        u = np.cbrt(-q / 2 - np.copysign(np.sqrt(np.maximum(D, 0.0)), q))
+        t_single = np.where(u != 0.0, u - p / (3 * u), 0.0)
+
+        # Three real roots
+        m = 2 * np.sqrt(np.maximum(-p / 3, 0.0))
+        cos_phi = np.where(m > 0.0, 3 * q / (p * m), 0.0)
+        phi = np.arccos(np.clip(cos_phi, -1.0, 1.0)) / 3
+        t_max = m * np.cos(phi)
+        t_min = m * np.cos(phi - 4 * np.pi / 3)
+
+    # Double roots are hardly ever met exactly in floating point, so a slightly positive D is treated as three roots
+    three = D <= 1e-12 * ((q / 2)**2 + np.abs(p / 3)**3)
+    x_max = np.where(three, t_max, t_single) - shift
+    x_min = np.where(three, t_min, t_single) - shift
+
+    # Roots much smaller than the largest one lose their digits in the shift. The two other roots of three are found again
+    # from the root r of the largest magnitude by Vieta's formulas: their sum (b + c / r) / r and product -c / r
+    with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+        r = np.where(np.abs(x_max) >= np.abs(x_min), x_max, x_min)
+        s_, p_ = (b + c / r) / r, -c / r
+        u = -0.5 * (-s_ - np.copysign(np.sqrt(np.maximum(s_ * s_ - 4 * p_, 0.0)), s_))
+        v = np.where(u != 0.0, p_ / u, 0.0)
+        deflated = three & (r != 0.0) & np.isfinite(u)
+    x_max = np.where(deflated, np.maximum(r, np.maximum(u, v)), x_max)
+    x_min = np.where(deflated, np.minimum(r, np.minimum(u, v)), x_min)
+
+    for _ in range(polish):
+        x_max = __newton_step__(x_max, a, b, c)
+        x_min = __newton_step__(x_min, a, b, c)
+
+    return x_max, x_min
+
+
+def __newton_step__(x: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+
+    """
+    Performs a Newton's iteration for the root of x**3 + a * x**2 + b * x + c = 0
+
+    Args:
+        x (np.ndarray): current approximation of the root
+        a, b, c (np.ndarray): coefficients of the monic cubic equation
+
+    Returns:
+        np.ndarray: refined root. The root is kept where the step does not reduce the residual, e.g. close to a double root
+    """
+
+    f = ((x + a) * x + b) * x + c
+    df = (3 * x + 2 * a) * x + b
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_new = np.where(df != 0.0, x - f / df, x)
+    f_new = ((x_new + a) * x_new + b) * x_new + c
+    return np.where(np.abs(f_new) <= np.abs(f), x_new, x)
+
+
+def cubic_continuation(coeffs: List[np.ndarray], lower: np.ndarray=None, x0: float=None) -> np.ndarray:
+
+    """
+    Follows a root along an ordered sequence of cubic equations c3 * x**3 + c2 * x**2 + c1 * x + c0 = 0.
+    All equations are solved at once by the closed-form solution. Where an equation has two physical roots (the smallest one
+    is above the lower bound) the branch is chosen by comparing the roots with the root kept for the previous equation, as they
+    are, without extrapolation: a run of such equations enters the root closest to the root before the run (the single root
+    of the previous equation or x0) and stays on the same branch (largest or smallest) while the branch exists. Only where the
+    kept branch is farther from the root kept for the previous equation than the other one the branch is switched
+
+    Args:
+        coeffs (list(np.ndarray)): coefficients [c3, c2, c1, c0] of the ordered cubic equations, highest power first
+        lower (np.ndarray): lower bound of the physical roots (e.g. B - C for compressibility factor). Optional. Default None, no bound
+        x0 (float): root to start from before the first equation. Optional. Default None, the largest root of the first equation
+
+    Returns:
+        np.ndarray: roots of the ordered equations
+    """
+
+    x_max, x_min = cubic_roots([np.ravel(np.asarray(c, dtype=float)) for c in coeffs])
+    x_max, x_min = np.ravel(x_max), np.ravel(x_min)
+    n = x_max.size
+    lower = np.full(n, -np.inf) if lower is None else np.broadcast_to(np.ravel(lower), (n,))
+    two = (x_min != x_max) & (x_min > lower)
+
+    # Root before every run of equations with two roots
+    previous = np.concatenate([[x_max[0] if x0 is None else x0], x_max[:-1]])
+    starts = two & ~np.concatenate([[False], two[:-1]])
+    run = np.cumsum(starts) - 1
+    entry = (np.abs(previous - x_min) < np.abs(previous - x_max))[starts]
+    smallest = two & entry[np.maximum(run, 0)] if entry.size else np.zeros(n, dtype=bool)
+
+    inside = two & np.concatenate([[False], two[:-1]])
+    while True:
+        x = np.where(smallest, x_min, x_max)
+        other = np.where(smallest, x_max, x_min)
+        failed = np.flatnonzero(inside[1:] & (np.abs(other[1:] - x[:-1]) < np.abs(x[1:] - x[:-1]))) + 1
+        if failed.size == 0:
+            return x
+        # Switch the branch from the first failure to the end of its run
+        k = failed[0]
+        switch = (np.arange(n) >= k) & (run == run[k]) & two
+        smallest = np.where(switch, ~smallest, smallest)
+
+
+def horner(coeffs: List[float], x: np.ndarray, derivatives: int=0) -> np.ndarray | Tuple[np.ndarray]:
+
+    """
+    Evaluates polynomial c0 + c1 * x + ... + cn * x**n and optionally its first and second derivatives by Horner's scheme
+    in a single pass over the coefficients
+
+    Args:
+        coeffs (list(float)): coefficients of the polynomial, lowest power first
+        x (np.ndarray): points of evaluation
+        derivatives (int): number of derivatives, 0, 1 or 2. Optional. Default 0
+
+    Returns:
+        np.ndarray | tuple: value of the polynomial or the value with its derivatives
+    """
+
+    x = np.asarray(x, dtype=float)
+    p = np.full(x.shape, float(coeffs[-1]))
+    dp, d2p = np.zeros(x.shape), np.zeros(x.shape)
+    for c in coeffs[-2::-1]:
+        if derivatives > 1:
+            d2p = d2p * x + dp
+        if derivatives > 0:
+            dp = dp * x + p
+        p = p * x + c
+
+    if derivatives == 0:
+        return p
+    if derivatives == 1:
+        return p, dp
+    return p, dp, 2 * d2p
@@ -0,0 +1,306 @@
+import os
+import sys
+import numpy as np
+from typing import List, Tuple
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+from fluid.const import R
+from fluid.cubic import CubicModel, get_model, component_parameters, z_coefficients, compressibility, ln_gibbs_residual
+
+
+MMHG = 133.322387415 # Pa. Millimeter of mercury
+
+
+def antoine_pressure(T: np.ndarray, A: np.ndarray, B: np.ndarray, C: np.ndarray, Tmin: np.ndarray=-np.inf, Tmax: np.ndarray=np.inf) -> np.ndarray:
+
+    """
+    Computes vapour pressure by Antoine equation log10(P [mmHg]) = A - B / (C + t [C]).
+    The equation is not extrapolated, temperatures outside of the validity range [Tmin, Tmax] give NaN
+
+    Args:
+        T (np.ndarray): Temperature in K
+        A, B, C (np.ndarray): Antoine coefficients for pressure in mmHg and temperature in Celsius
+        Tmin, Tmax (np.ndarray): Validity range of the coefficients in K. Optional. Default unbounded
+
+    Returns:
+        np.ndarray: Vapour pressure in Pa
+    """
+
+    T = np.asarray(T, dtype=float)
+    P = MMHG * 10**(A - B / (C + T - 273.15))
+    return np.where((T >= Tmin) & (T <= Tmax), P, np.nan)
+
+
+def __antoine_coefficients__(antoine: List, n: int) -> Tuple[np.ndarray]:
+
+    """
+    Converts Antoine coefficients of the components [A, B, C] or [A, B, C, (Tmin, Tmax)] to arrays.
+    Components without coefficients get NaN, coefficients without the validity range are unbounded
+
+    Args:
+        antoine (list): Antoine coefficients of the components or None
+        n (int): Number of components
+
+    Returns:
+        tuple: Arrays A, B, C, Tmin, Tmax of shape (n,)
+    """
+
+    coeffs = np.full((n, 3), np.nan)
+    limits = np.tile([-np.inf, np.inf], (n, 1))
+    if antoine is None:
+        return coeffs[:, 0], coeffs[:, 1], coeffs[:, 2], limits[:, 0], limits[:, 1]
+
+    if len(antoine) != n:
+        raise ValueError(f"Antoine coefficients are given for {len(antoine)} components instead of {n}")
+    for i, c in enumerate(antoine):
+        if c is None:
+            continue
+        try:
+            valid = len(c) in (3, 4) and (len(c) == 3 or c[3] is None or len(c[3]) == 2)
+            if valid:
+                coeffs[i] = [float(x) for x in c[:3]]
+                if len(c) == 4 and c[3] is not None:
+                    limits[i] = [float(x) for x in c[3]]
+        except (TypeError, ValueError):
+            valid = False
+        if not valid:
+            raise ValueError(f"Antoine coefficients of component {i} must be [A, B, C] or [A, B, C, (Tmin, Tmax)]. Give {c}")
+    return coeffs[:, 0], coeffs[:, 1], coeffs[:, 2], limits[:, 0], limits[:, 1]
+
+
+def saturation_pressure(T: np.ndarray, Tcs: np.ndarray, Pcs: np.ndarray, omegas: np.ndarray=None, antoine: List=None, Mws: np.ndarray=None, rhocs: np.ndarray=None, model: str | CubicModel="peng_robinson", tol: float=1e-10, max_iter: int=50) -> np.ndarray:
+
+    """
+    Computes saturation pressures of several pure fluids at many temperatures by equal fugacity of the liquid and the vapour
+    roots of the cubic EoS. Newton's iteration ln P -= (ln phi_L - ln phi_V) / (Z_L - Z_V) starts from Antoine equation
+    within the validity range of its coefficients, otherwise from Wilson's correlation. Temperatures at or above the
+    critical one and states without convergence give NaN
+
+    Args:
+        T (np.ndarray): Temperatures in K
+        Tcs (np.ndarray): Critical temperatures of the fluids in K of shape (n,)
+        Pcs (np.ndarray): Critical pressures of the fluids in Pa of shape (n,)
+        omegas (np.ndarray): Acentric factors of the fluids of shape (n,). Optional. Default None, needed for all models except "standard"
+        antoine (list): Antoine coefficients of the fluids [A, B, C, (Tmin, Tmax)] for mmHg and Celsius, None for unknown. Optional. Default None
+        Mws (np.ndarray): Molecular weights of the fluids in kg/mol of shape (n,). Optional. Default None, needed for "aungier" model
+        rhocs (np.ndarray): Critical densities of the fluids in kg/m^3 of shape (n,). Optional. Default None, needed for "aungier" model
+        model (str | CubicModel): EoS model "standard", "soave", "aungier", "peng_robinson" or a parameter set. Optional. Default "peng_robinson"
+        tol (float): Tolerance of ln P. Optional. Default 1e-10
+        max_iter (int): Maximum number of iterations. Optional. Default 50
+
+    Returns:
+        np.ndarray: Saturation pressures in Pa of shape (n, ...) where ... is the shape of T
+    """
+
+    T = np.asarray(T, dtype=float)
+    n = np.size(Tcs)
+    return __solve__(np.broadcast_to(T, (n,) + T.shape), Tcs, Pcs, omegas, antoine, Mws, rhocs, model, tol, max_iter)
+
+
+def __solve__(T: np.ndarray, Tcs: np.ndarray, Pcs: np.ndarray, omegas: np.ndarray, antoine: List, Mws: np.ndarray, rhocs: np.ndarray, model: str | CubicModel, tol: float, max_iter: int) -> np.ndarray:
+
+    """
+    Solves the equal fugacity condition of the fluids at their own temperatures, see saturation_pressure
+
+    Args:
+        T (np.ndarray): Temperatures of the fluids in K of shape (n, ...)
+        Tcs, Pcs, omegas, antoine, Mws, rhocs, model, tol, max_iter: See saturation_pressure
+
+    Returns:
+        np.ndarray: Saturation pressures in Pa of shape (n, ...)
+    """
+
+    eos = get_model(model)
+    shape = (-1,) + (1,) * (T.ndim - 1)
+    Tcs, Pcs = np.asarray(Tcs, dtype=float), np.asarray(Pcs, dtype=float)
+    n = Tcs.size
+    ws = np.zeros(n) if omegas is None else np.asarray(omegas, dtype=float)
+    vcs = None
+    if eos.shift is not None:
+        if Mws is None or rhocs is None:
+            raise RuntimeError("Mws and/or rhocs is not provided")
+        vcs = np.asarray(Mws, dtype=float) / np.asarray(rhocs, dtype=float)
+
+    a, b, c, kappa = component_parameters(eos, Tcs, Pcs, ws, vcs)
+    a, b, c, kappa, Tcs_, Pcs_, ws_ = [np.reshape(x, shape) for x in (a, b, c, kappa, Tcs, Pcs, ws)]
+    a = a * eos.alpha(T, Tcs_, kappa)
+    b, c = np.broadcast_to(b, T.shape), np.broadcast_to(c, T.shape)
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        P_antoine = antoine_pressure(T, *[np.reshape(x, shape) for x in __antoine_coefficients__(antoine, n)])
+    P_wilson = Pcs_ * np.exp(5.373 * (1 + ws_) * (1 - Tcs_ / T))
+    ln_P = np.log(np.where(np.isfinite(P_antoine) & (P_antoine > 0), np.minimum(P_antoine, Pcs_), P_wilson))
+
+    RT = R * T
+    subcritical = T < Tcs_
+    converged = ~subcritical
+    lower, upper = np.full(T.shape, -np.inf), np.log(Pcs_) + np.zeros(T.shape)
+    for _ in range(max_iter):
+        active = ~converged
+        if not np.any(active):
+            break
+
+        Ta, Pa = RT[active], np.exp(ln_P[active])
+        A, B, C = a[active] * Pa / Ta**2, b[active] * Pa / Ta, c[active] * Pa / Ta
+        Z_vapour, Z_liquid = compressibility(eos, A, B, C)
+        Z_liquid = np.where(Z_liquid > B - C, Z_liquid, Z_vapour)
+        g = ln_gibbs_residual(eos, Z_liquid, A, B, C) - ln_gibbs_residual(eos, Z_vapour, A, B, C)
+
+        # A single root means the pressure is beyond a spinodal: a root above the inflection point of the cubic is
+        # vapour-like and asks for higher pressure, a liquid-like root for lower one. Otherwise the sign of g brackets the root
+        single = Z_vapour - Z_liquid < 1e-9
+        too_low = np.where(single, Z_vapour > -z_coefficients(eos, A, B, C)[1] / 3, g > 0)
+        lower[active] = np.where(too_low, ln_P[active], lower[active])
+        upper[active] = np.where(too_low, upper[active], ln_P[active])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = np.where(single, np.where(too_low, 0.5, -0.5), -g / (Z_liquid - Z_vapour))
+        ln_P_new = ln_P[active] + np.clip(step, -1.0, 1.0)
+
+        # Bisection when the step leaves the bracket
+        lo, hi = lower[active], upper[active]
+        outside = ~((ln_P_new > lo) & (ln_P_new < hi))
+        ln_P_new = np.where(outside & np.isfinite(lo), 0.5 * (lo + hi), ln_P_new)
+        converged[active] = ~single & (np.abs(ln_P_new - ln_P[active]) < tol)
+        ln_P[active] = ln_P_new
+
+    return np.where(subcritical & converged, np.exp(ln_P), np.nan)
+
+
+class SaturationPressure:
+
+    """
+    Saturation pressures of pure fluids with a cache. The first call for a fluid solves the equal fugacity condition on a grid
+    of temperatures within the bounds of the fluid and stores ln P as a function of 1 / T, later calls interpolate it by
+    cubic Hermite polynomials. Temperatures outside of the bounds are solved directly and are not cached
+
+    Args:
+        Tcs (np.ndarray): Critical temperatures of the fluids in K of shape (n,)
+        Pcs (np.ndarray): Critical pressures of the fluids in Pa of shape (n,)
+        omegas (np.ndarray): Acentric factors of the fluids of shape (n,). Optional. Default None
+        antoine (list): Antoine coefficients of the fluids [A, B, C, (Tmin, Tmax)], None for unknown. Optional. Default None
+        Mws (np.ndarray): Molecular weights of the fluids in kg/mol. Optional. Default None, needed for "aungier" model
+        rhocs (np.ndarray): Critical densities of the fluids in kg/m^3. Optional. Default None, needed for "aungier" model
+        model (str | CubicModel): EoS model "standard", "soave", "aungier", "peng_robinson" or a parameter set. Optional. Default "peng_robinson"
+        bounds (list): Temperature bounds (Tmin, Tmax) of the tables of the fluids in K. Optional. Default None, from 0.3 * Tc to 0.999 * Tc
+        points (int): Number of grid points of a table. Optional. Default 200
+
+    Attributes:
+        bounds (np.ndarray): Temperature bounds of the tables of shape (n, 2)
+        cached (tuple): Indices of the fluids with built tables
+    """
+
+    def __init__(self, Tcs: np.ndarray, Pcs: np.ndarray, omegas: np.ndarray=None, antoine: List=None, Mws: np.ndarray=None, rhocs: np.ndarray=None, model: str | CubicModel="peng_robinson", bounds: List=None, points: int=200):
+
+        self.__Tcs = np.asarray(Tcs, dtype=float)
+        n = self.__Tcs.size
+        self.__Pcs = np.asarray(Pcs, dtype=float)
+        self.__omegas = None if omegas is None else np.asarray(omegas, dtype=float)
+        self.__antoine = [None] * n if antoine is None else list(antoine)
+        __antoine_coefficients__(self.__antoine, n)
+        self.__Mws = None if Mws is None else np.asarray(Mws, dtype=float)
+        self.__rhocs = None if rhocs is None else np.asarray(rhocs, dtype=float)
+        self.__model = model
+        self.__points = points
+
+        if bounds is None:
+            bounds = np.column_stack([0.3 * self.__Tcs, 0.999 * self.__Tcs])
+        self.__bounds = np.asarray(bounds, dtype=float).reshape(n, 2)
+        if np.any(self.__bounds[:, 0] >= self.__bounds[:, 1]) or np.any(self.__bounds[:, 1] >= self.__Tcs):
+            raise ValueError(f"Bounds must be increasing and below the critical temperatures")
+
+        self.__tables = {}
+
+    @property
+    def bounds(self):
+        return self.__bounds
+
+    @property
+    def cached(self):
+        return tuple(sorted(self.__tables))
+
+    def __properties__(self, index: np.ndarray) -> dict:
+
+        """
+        Selects properties of the fluids
+
+        Args:
+            index (np.ndarray): Indices of the fluids
+
+        Returns:
+            dict: Keyword arguments of saturation_pressure
+        """
+
+        select = lambda x: None if x is None else x[index]
+        return {
+            "Tcs": self.__Tcs[index], "Pcs": self.__Pcs[index], "omegas": select(self.__omegas),
+            "antoine": [self.__antoine[i] for i in index], "Mws": select(self.__Mws), "rhocs": select(self.__rhocs),
+            "model": self.__model
+        }
+
+    def __build__(self, index: List[int]):
+
+        """
+        Builds the tables of the fluids in one call of the solver, every fluid is solved on its own grid
+
+        Args:
+            index (list): Indices of the fluids without tables
+        """
+
+        index = np.asarray(index)
+        t = np.linspace(0.0, 1.0, self.__points)
+        lo, hi = self.__bounds[index, 0:1], self.__bounds[index, 1:2]
+        x = 1 / lo + t * (1 / hi - 1 / lo)
+        properties = self.__properties__(index)
+        ln_P = np.log(__solve__(1 / x, tol=1e-10, max_iter=50, **properties))
+        for k, i in enumerate(index):
+            self.__tables[int(i)] = (x[k], ln_P[k], np.gradient(ln_P[k], x[k], edge_order=2))
+
+    def __call__(self, T: np.ndarray, components: List[int]=None) -> np.ndarray:
+
+        """
+        Computes saturation pressures of the fluids
+
+        Args:
+            T (np.ndarray): Temperatures in K
+            components (list): Indices of the fluids. Optional. Default None, all fluids
+
+        Returns:
+            np.ndarray: Saturation pressures in Pa of shape (number of fluids, ...) where ... is the shape of T
+        """
+
+        index = np.arange(self.__Tcs.size) if components is None else np.asarray(components, dtype=int)
+        missing = [int(i) for i in index if int(i) not in self.__tables]
+        if missing:
+            self.__build__(missing)
+
+        T = np.asarray(T, dtype=float)
+        result = np.empty((index.size,) + T.shape)
+        for k, i in enumerate(index):
+            x_nodes, y_nodes, dy_nodes = self.__tables[int(i)]
+            inside = (T >= self.__bounds[i, 0]) & (T <= self.__bounds[i, 1])
+
+            # Cubic Hermite interpolation of ln P on the decreasing grid of 1 / T
+            x = 1 / T[inside]
+            j = np.clip(np.searchsorted(-x_nodes, -x, side="right") - 1, 0, x_nodes.size - 2)
+            h = x_nodes[j + 1] - x_nodes[j]
+            u = (x - x_nodes[j]) / h
+            u2, u3 = u * u, u * u * u
+            value = (
+                (2 * u3 - 3 * u2 + 1) * y_nodes[j] + (u3 - 2 * u2 + u) * h * dy_nodes[j]
+                + (-2 * u3 + 3 * u2) * y_nodes[j + 1] + (u3 - u2) * h * dy_nodes[j + 1]
+            )
+
+            row = np.empty(T.shape)
+            row[inside] = np.exp(value)
+            if not np.all(inside):
+                row[~inside] = saturation_pressure(T[~inside], **self.__properties__(np.array([i])))[0]
+            result[k] = row
+
+        return result
@@ -0,0 +1,228 @@
+import os
+import re
+import sys
+import json
+import numpy as np
+from typing import Dict, List
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+from fluid.const import R
+from fluid.eos import MixtureEoS
+
+
+ELEMENT = re.compile(r"([A-Z][a-z]?)(\d*)")
+FIELDS = ("thermo", "symbol", "name")
+
+
+def formula(text: str) -> str:
+
+    """
+    Converts a chemical formula to canonical form in Hill order (C, H, then other elements alphabetically).
+    Isomer prefixes separated by "-" (i-C4H8, t-2-C4H8) and NASA name suffixes separated by "," (C4H8,isobutene) are dropped
+
+    Args:
+        text (str): Formula, symbol or NASA key
+
+    Returns:
+        str: Canonical formula or None if the text is not a formula
+    """
+
+    text = text.split(",")[0].split("-")[-1].strip()
+    if not text or ELEMENT.sub("", text):
+        return None
+
+    counts = {}
+    for element, count in ELEMENT.findall(text):
+        counts[element] = counts.get(element, 0) + (int(count) if count else 1)
+    first = [e for e in ("C", "H") if e in counts] if "C" in counts else []
+    order = first + sorted(e for e in counts if e not in first)
+    return "".join(e + (str(counts[e]) if counts[e] > 1 else "") for e in order)
+
+
+def __normalize__(text: str) -> str:
+    return str(text).strip().casefold()
+
+
+class SpeciesRegistry:
+
+    """
+    Registry of species with hash indexes over NASA key (thermo), symbol, name, canonical formula and user aliases
+
+    The indexes are built once, a lookup is one dict access. Text keys are case insensitive. Aliases, NASA keys, symbols and
+    names are searched in this order, the formula index is used last. A key matching several species
+    (e.g. formula C4H8 of the butene isomers) raises ValueError with the candidates. Numeric fields of the records are stored as
+    columns, so the properties of a whole component list are gathered by one fancy index
+
+    Args:
+        records (list): Species as dicts with fields thermo, symbol, name and numeric properties, e.g. the fluid_list of the scripts
+        aliases (dict): User aliases mapping an alias to any resolvable key of a species. Optional. Default None
+
+    Attributes:
+        records (list): Species records
+        columns (dict): Numeric fields as arrays of shape (species,), NaN for missing values
+    """
+
+    def __init__(self, records: List[dict], aliases: Dict[str, str]=None):
+
+        self.__records = list(records)
+        self.__indexes = {field: {} for field in FIELDS + ("formula", "alias")}
+        for i, record in enumerate(self.__records):
+            for field in FIELDS:
+                if record.get(field) is not None:
+                    self.__indexes[field].setdefault(__normalize__(record[field]), []).append(i)
+            formulas = {formula(record[field]) for field in ("thermo", "symbol") if record.get(field)}
+            for f in formulas - {None}:
+                self.__indexes["formula"].setdefault(__normalize__(f), []).append(i)
+
+        for alias, key in (aliases or {}).items():
+            self.add_alias(alias, key)
+
+        names = sorted({
+            key for record in self.__records for key, value in record.items()
+            if isinstance(value, (int, float)) and not isinstance(value, bool)
+        })
+        self.__columns = {
+            name: np.array([
+                float(r[name]) if isinstance(r.get(name), (int, float)) and not isinstance(r.get(name), bool) else np.nan
+                for r in self.__records
+            ])
+            for name in names
+        }
+
+    @classmethod
+    def from_json(cls, path: str, aliases: Dict[str, str]=None):
+
+        """
+        Builds the registry from a json list of species such as lib/fluid_lib.json. Molecular weight mw in kg/mol is
+        added from the specific gas constant Rg when missing
+
+        Args:
+            path (str): Path to the json file
+            aliases (dict): User aliases. Optional. Default None
+
+        Returns:
+            SpeciesRegistry: Registry of the species
+        """
+
+        with open(path, "r") as fp:
+            records = json.load(fp)
+        for record in records:
+            if "mw" not in record and record.get("Rg"):
+                record["mw"] = R / record["Rg"]
+        return cls(records, aliases)
+
+    @property
+    def records(self):
+        return self.__records
+
+    @property
+    def columns(self):
+        return self.__columns
+
+    def __len__(self):
+        return len(self.__records)
+
+    def __contains__(self, key):
+        try:
+            self.index(key)
+        except (KeyError, ValueError):
+            return False
+        return True
+
+    def add_alias(self, alias: str, key: str):
+
+        """
+        Adds a user alias of a species
+
+        Args:
+            alias (str): Alias
+            key (str): Any resolvable key of the species
+        """
+
+        self.__indexes["alias"][__normalize__(alias)] = [self.index(key)]
+
+    def index(self, key: str) -> int:
+
+        """
+        Resolves a key to the index of the species
+
+        Args:
+            key (str): Alias, NASA key, symbol, name or formula of the species
+
+        Returns:
+            int: Index of the species
+        """
+
+        normalized = __normalize__(key)
+        for field in ("alias",) + FIELDS:
+            found = self.__indexes[field].get(normalized)
+            if found is not None:
+                break
+        else:
+            f = formula(str(key))
+            found = None if f is None else self.__indexes["formula"].get(__normalize__(f))
+
+        if found is None:
+            raise KeyError(f"Species {key} is not found")
+        if len(found) > 1:
+            candidates = [self.__records[i].get("name") or self.__records[i].get("symbol") for i in found]
+            raise ValueError(f"Species {key} is ambiguous. Candidates {candidates}")
+        return found[0]
+
+    def resolve(self, keys: List[str]) -> np.ndarray:
+
+        """
+        Resolves a component list to indices of the species
+
+        Args:
+            keys (list): Keys of the components
+
+        Returns:
+            np.ndarray: Indices of the species of shape (components,)
+        """
+
+        return np.array([self.index(key) for key in keys], dtype=np.int64)
+
+    def gather(self, keys: List[str], fields: List[str]) -> Dict[str, np.ndarray]:
+
+        """
+        Gathers numeric fields of a component list
+
+        Args:
+            keys (list): Keys of the components
+            fields (list): Names of the numeric fields
+
+        Returns:
+            dict: Arrays of the fields of shape (components,)
+        """
+
+        index = self.resolve(keys)
+        for field in fields:
+            if field not in self.__columns:
+                raise ValueError(f"Field {field} is not numeric or missing. Available fields {tuple(self.__columns)}")
+        return {field: self.__columns[field][index] for field in fields}
+
+    def mixture(self, keys: List[str], ys: List[float], k_ij: List[List[float]]=None, eos: str="peng_robinson") -> MixtureEoS:
+
+        """
+        Builds EoS of a mixture from the keys of the components. Uses fields mw [kg/mol], Tc [K], pc [Pa], omega and
+        rhoc [kg/m^3] of the records
+
+        Args:
+            keys (list): Keys of the components
+            ys (list): Mole fractions of the components
+            k_ij (list): Binary interaction parameters. Optional. Default None
+            eos (str): EoS of the mixture. Optional. Default "peng_robinson"
+
+        Returns:
+            MixtureEoS: EoS of the mixture
+        """
+
+        c = self.gather(keys, ("mw", "Tc", "pc", "omega", "rhoc"))
+        return MixtureEoS(ys, c["Tc"], c["pc"], c["mw"], c["omega"], c["mw"] / c["rhoc"], k_ij=k_ij, eos=eos)
@@ -0,0 +1,129 @@
+import os
+import sys
+import numpy as np
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+from fluid.eos import MixtureEoS
+
+
+def wilson_k_values(T: np.ndarray, P: np.ndarray, Tcs: np.ndarray, Pcs: np.ndarray, ws: np.ndarray) -> np.ndarray:
+
+    """
+    Computes initial equilibrium ratios K_i = y_i / x_i using Wilson's correlation
+
+    Args:
+        T (np.ndarray): Temperatures in K of shape (...)
+        P (np.ndarray): Pressures in Pa of shape (...)
+        Tcs (np.ndarray): Critical temperatures of the components in K
+        Pcs (np.ndarray): Critical pressures of the components in Pa
+        ws (np.ndarray): Acentric factors of the components
+
+    Returns:
+        np.ndarray: Equilibrium ratios of shape (..., n)
+    """
+
+    T, P = np.asarray(T, dtype=float)[..., np.newaxis], np.asarray(P, dtype=float)[..., np.newaxis]
+    return (Pcs / P) * np.exp(5.373 * (1 + ws) * (1 - Tcs / T))
+
+
+def stability_test(mixture: MixtureEoS, T: np.ndarray, P: np.ndarray, W: np.ndarray=None, tol: float=1e-10, max_iter: int=100, accelerate: int=5) -> dict:
+
+    """
+    Tests stability of the mixture for many states at once by Michelsen's tangent plane distance criterion.
+    Two trial phases, vapour-like W = z * K and liquid-like W = z / K, are iterated by successive substitution
+    ln W_i = ln z_i + ln phi_i(z) - ln phi_i(w) accelerated by the dominant eigenvalue method. A state is proven unstable as
+    soon as any trial reaches a negative modified tangent plane distance tm and is dropped from the iteration together with
+    its other trial. A trial is dropped when it converges or approaches the trivial solution W = z
+
+    Args:
+        mixture (MixtureEoS): EoS of the feed
+        T (np.ndarray): Temperatures in K. Broadcast against P
+        P (np.ndarray): Pressures in Pa. Broadcast against T
+        W (np.ndarray): Initial trial phases of shape (2, n) or (..., 2, n), e.g. trial phases of a nearby state. Optional. Default None, Wilson's correlation
+        tol (float): Tolerance of the logarithms of the trial phases. Optional. Default 1e-10
+        max_iter (int): Maximum number of successive substitutions, at least 1. Optional. Default 100
+        accelerate (int): Number of successive substitutions between accelerations. Optional. Default 5. Set 0 to switch acceleration off
+
+    Returns:
+        dict: Stability flags stable, modified tangent plane distances tm of shape (..., 2), trial phases W of shape (..., 2, n)
+        and equilibrium ratios K of shape (..., n) estimated from the trial phases for the following flash
+    """
+
+    if max_iter < 1:
+        raise ValueError(f"At least one successive substitution is needed. Give max_iter={max_iter}")
+
+    T, P = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P, dtype=float))
+    shape = T.shape
+    T, P = T.ravel(), P.ravel()
+    m, zs = T.size, mixture.ys
+    n = zs.size
+    feed = zs > 0
+
+    # Components absent in the feed stay absent in the trial phases
+    with np.errstate(divide="ignore"):
+        ln_zs = np.where(feed, np.log(zs), 0.0)
+    d = np.where(feed, ln_zs + mixture.residual_properties(T, P, phase="stable")["ln_phi"], 0.0)
+    d = np.repeat(d, 2, axis=0)
+    T, P = np.repeat(T, 2), np.repeat(P, 2)
+
+    if W is None:
+        Ks = wilson_k_values(T[::2], P[::2], mixture.Tcs, mixture.Pcs, mixture.ws)
+        W = np.stack([zs * Ks, zs / Ks], axis=1)
+    W = np.broadcast_to(np.asarray(W, dtype=float), shape + (2, n)).reshape(2 * m, n)
+    with np.errstate(divide="ignore"):
+        ln_W = np.where(feed, np.log(W), 0.0)
+
+    tm = np.zeros(2 * m)
+    delta_prev = np.zeros((2 * m, n))
+    done = np.zeros(2 * m, dtype=bool)
+    unstable = np.zeros(m, dtype=bool)
+    for it in range(max_iter):
+        active = np.flatnonzero(~done)
+        if active.size == 0:
+            break
+
+        Ws = np.where(feed, np.exp(ln_W[active]), 0.0)
+        ws = Ws / Ws.sum(axis=-1, keepdims=True)
+        ln_phi = mixture.residual_properties(T[active], P[active], ws, phase="stable")["ln_phi"]
+        ln_W_new = np.where(feed, d[active] - ln_phi, 0.0)
+        tm[active] = 1 + np.sum(np.where(feed, Ws * (ln_W[active] + ln_phi - d[active] - 1), 0.0), axis=-1)
+
+        delta = np.where(feed, ln_W_new - ln_W[active], 0.0)
+        if accelerate and it % accelerate == accelerate - 1:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                lam = np.sum(delta * delta, axis=-1) / np.sum(delta_prev[active] * delta, axis=-1)
+            ok = (lam > 0) & (lam < 1)
+            ln_W_new = np.where(ok[:, np.newaxis], ln_W_new + delta * (lam / np.where(ok, 1 - lam, 1.0))[:, np.newaxis], ln_W_new)
+
+        trivial = np.sum(np.where(feed, ln_W_new - ln_zs, 0.0)**2, axis=-1) < 1e-4
+        ln_W[active] = ln_W_new
+        delta_prev[active] = delta
+
+        # Early exit: any trial with negative tangent plane distance proves instability of the state
+        unstable = np.min(tm.reshape(m, 2), axis=-1) < -1e-8
+        done[active] = (np.max(np.abs(delta), axis=-1) < tol) | trivial
+        done |= np.repeat(unstable, 2)
+
+    tm = tm.reshape(m, 2)
+    W = np.where(feed, np.exp(ln_W), 0.0).reshape(m, 2, n)
+    ws = W / W.sum(axis=-1, keepdims=True)
+
+    # Equilibrium ratios from the vapour-like trial if it is unstable, otherwise from the liquid-like one. The liquid-like
+    # trial of a wet gas often finds an aqueous phase, which leads the two phase flash to a solution with higher Gibbs energy.
+    # Wilson's values are kept for the components absent in the feed
+    with np.errstate(divide="ignore", invalid="ignore"):
+        Ks = np.where((tm[:, 0] < -1e-8)[:, np.newaxis], ws[:, 0] / zs, zs / ws[:, 1])
+    Ks = np.where(feed, Ks, wilson_k_values(T[::2], P[::2], mixture.Tcs, mixture.Pcs, mixture.ws))
+
+    return {
+        "stable": ~unstable.reshape(shape),
+        "tm": tm.reshape(shape + (2,)),
+        "W": W.reshape(shape + (2, n)),
+        "K": Ks.reshape(shape + (n,))
+    }
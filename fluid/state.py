@@ -0,0 +1,238 @@
+import os
+import sys
+import numpy as np
+from typing import Dict, List, Tuple
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+from fluid.const import R
+from fluid.cubic import compressibility
+from fluid.eos import MixtureEoS
+
+
+# Component columns of the linear sums sum_i y_i * f_i
+LINEAR = ("y", "b", "c", "MW", "w", "Tc", "sqrt_Tc", "Vc", "u", "u2", "u3")
+
+
+class MixtureState:
+
+    """
+    Composition state of a mixture with O(n) updates of single mole fractions
+
+    The state keeps unnormalized amounts y of the components, the linear sums sum_i y_i * f_i of the component columns
+    (total amount S, co-volume, volume correction, molecular weight, acentric factor, critical temperature and its square
+    root, critical volume and the moments of u = Vc**(1/3)) and, on the current isotherm, the vector g = A y of the
+    attraction matrix A_ij = (1 - k_ij) * sqrt(a_i * alpha_i * a_j * alpha_j) with the quadratic form y A y.
+    A change of amount k by delta is a rank-1 update: the sums change by delta * f_k, g by delta * A[:, k] and y A y by
+    delta * (2 * g_k + delta * A_kk). Mixture properties are normalized by S (by S**2 for quadratic forms) on output,
+    so renormalization is free.
+
+    The binary Prausnitz-Gunn sums are kept as moments:
+    sum_ij y_i y_j sqrt(Tc_i Tc_j) = (sum_i y_i sqrt(Tc_i))**2 and
+    sum_ij y_i y_j ((u_i + u_j) / 2)**3 = (S * m3 + 3 * m1 * m2) / 4 with m_k = sum_i y_i u_i**k.
+
+    A change of temperature recomputes A once in O(n**2). Accumulated round-off of long update sequences is removed by refresh
+
+    Args:
+        mixture (MixtureEoS): EoS of the components. Its mole fractions are the initial amounts
+        T (float): Temperature in K
+        Vcs (list(float)): Critical molar specific volumes in m^3/mol of the components for Prausnitz-Gunn properties. Optional. Default None
+
+    Attributes:
+        ys (np.ndarray): Mole fractions of the components
+        amounts (np.ndarray): Unnormalized amounts of the components
+        T (float): Temperature in K
+        a_mix (float): Attraction parameter of the mixture at T
+        b_mix, c_mix (float): Co-volume and volume correction of the mixture in m^3/mol
+        MW_mix (float): Molecular weight of the mixture in kg/mol
+        w_mix (float): Acentric factor of the mixture
+    """
+
+    def __init__(self, mixture: MixtureEoS, T: float, Vcs: List[float]=None):
+
+        n = mixture.ys.size
+        u = np.full(n, np.nan) if Vcs is None else np.array(Vcs, dtype=float)**(1 / 3)
+        columns = {
+            "y": np.ones(n), "b": mixture.bs, "c": mixture.cs, "MW": mixture.MWs, "w": mixture.ws, "Tc": mixture.Tcs,
+            "sqrt_Tc": np.sqrt(mixture.Tcs), "Vc": u**3, "u": u, "u2": u**2, "u3": u**3
+        }
+
+        self.__mixture = mixture
+        self.__columns = np.column_stack([columns[name] for name in LINEAR])
+        self.__index = {name: i for i, name in enumerate(LINEAR)}
+        self.__amounts = np.array(mixture.ys, dtype=float)
+        self.__T = None
+        self.__A = None
+        self.set_temperature(T)
+
+    def refresh(self):
+
+        """
+        Recomputes all sums from the amounts in O(n**2)
+        """
+
+        self.__sums = self.__amounts @ self.__columns
+        self.__g = self.__A @ self.__amounts
+        self.__yAy = float(self.__amounts @ self.__g)
+
+    def set_temperature(self, T: float):
+
+        """
+        Moves the state to another isotherm. The attraction matrix and the sums are recomputed in O(n**2),
+        the same temperature leaves the state unchanged
+
+        Args:
+            T (float): Temperature in K
+        """
+
+        if self.__T == float(T):
+            return
+        # Partial sums of the unit compositions are the columns of the attraction matrix
+        self.__A = self.__mixture.attraction(float(T), np.eye(self.__amounts.size))[3]
+        self.__T = float(T)
+        self.refresh()
+
+    def set(self, k: int, amount: float):
+
+        """
+        Sets unnormalized amount of a component by a rank-1 update in O(n)
+
+        Args:
+            k (int): Index of the component
+            amount (float): New amount of the component
+        """
+
+        delta = float(amount) - self.__amounts[k]
+        if delta == 0.0:
+            return
+        self.__yAy += delta * (2 * self.__g[k] + delta * self.__A[k, k])
+        self.__g += delta * self.__A[:, k]
+        self.__sums += delta * self.__columns[k]
+        self.__amounts[k] = amount
+
+    def update(self, changes: Dict[int, float]):
+
+        """
+        Sets unnormalized amounts of several components, each change costs O(n)
+
+        Args:
+            changes (dict): New amounts of the components by index
+        """
+
+        for k, amount in changes.items():
+            self.set(k, amount)
+
+    def normalize(self):
+
+        """
+        Scales the amounts to unit total in O(n). Mixture properties do not change
+        """
+
+        S = self.__sums[0]
+        self.__amounts /= S
+        self.__g /= S
+        self.__yAy /= S * S
+        self.__sums /= S
+
+    def __sum__(self, name: str) -> float:
+        return float(self.__sums[self.__index[name]] / self.__sums[0])
+
+    @property
+    def ys(self):
+        return self.__amounts / self.__sums[0]
+
+    @property
+    def amounts(self):
+        return self.__amounts.copy()
+
+    @property
+    def T(self):
+        return self.__T
+
+    @property
+    def a_mix(self):
+        return self.__yAy / self.__sums[0]**2
+
+    @property
+    def b_mix(self):
+        return self.__sum__("b")
+
+    @property
+    def c_mix(self):
+        return self.__sum__("c")
+
+    @property
+    def MW_mix(self):
+        return self.__sum__("MW")
+
+    @property
+    def w_mix(self):
+        return self.__sum__("w")
+
+    def psi(self) -> np.ndarray:
+
+        """
+        Computes partial sums sum_j x_j * a_ij needed for fugacity coefficients in O(n)
+
+        Returns:
+            np.ndarray: Partial sums of shape (n,)
+        """
+
+        return self.__g / self.__sums[0]
+
+    def __call__(self, P: np.ndarray) -> Tuple[np.ndarray]:
+
+        """
+        Computes Density, Compressibility, Acentric Factor of the mixture at the temperature of the state
+
+        Args:
+            P (np.ndarray): Pressures in Pa
+
+        Returns:
+            tuple: Arrays of the mixture compressibility factor and density of the shape of P, and acentric factor of the mixture
+        """
+
+        P = np.asarray(P, dtype=float)
+        RT = R * self.__T
+        Z, _ = compressibility(self.__mixture.model, self.a_mix * P / RT**2, self.b_mix * P / RT, self.c_mix * P / RT)
+        return Z, self.MW_mix * P / (RT * Z), self.w_mix
+
+    def prausnitz_gunn(self, Tc_method: str="kay", Vc_method: str="kay") -> dict:
+
+        """
+        Computes Prausnitz-Gunn pseudo critical properties of the mixture in O(1) from the kept sums
+
+        Args:
+            Tc_method (str): Method to mix critical temperature. Optional. Default "kay". Available methods "kay" and "binary"
+            Vc_method (str): Method to mix critical molar specific volume. Optional. Default "kay". Available methods "kay" and "binary"
+
+        Returns:
+            dict: Dictionary of the pseudocritical parameters (Tc_mix [K], Pc_mix [Pa], Vc_mix [m^3/mol], rhoc_mix [kg/m^3], Zc_mix) of the mixture and acentric factor ws_mix of the mixture
+        """
+
+        for method in (Tc_method, Vc_method):
+            if method not in ("kay", "binary"):
+                raise ValueError(f"Mixing method {method} is not available. Available methods 'kay' and 'binary'")
+
+        omega_mix = self.w_mix
+        Tc_mix = self.__sum__("Tc") if Tc_method == "kay" else self.__sum__("sqrt_Tc")**2
+        if Vc_method == "kay":
+            Vc_mix = self.__sum__("Vc")
+        else:
+            m1, m2, m3 = self.__sum__("u"), self.__sum__("u2"), self.__sum__("u3")
+            Vc_mix = (m3 + 3 * m1 * m2) / 4
+
+        Zc_mix = 0.2905 - 0.085 * omega_mix
+        return {
+            "Tc_mix": Tc_mix,
+            "Pc_mix": Zc_mix * R * Tc_mix / Vc_mix,
+            "Vc_mix": Vc_mix,
+            "rhoc_mix": self.MW_mix / Vc_mix,
+            "Zc_mix": Zc_mix,
+            "ws_mix": omega_mix
+        }
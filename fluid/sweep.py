@@ -0,0 +1,116 @@
+import os
+import sys
+import numpy as np
+from typing import List
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+from fluid.const import R
+from fluid.cubic import CubicModel
+from fluid.eos import MixtureEoS
+from fluid.mixing import PrausnitzGunn
+import fluid.nasa as nasa
+
+
+class CompositionSweep:
+
+    """
+    Properties of many mixtures of a fixed set of components
+
+    Everything that depends only on the components is prepared once: the EoS parameters and the cross attraction matrix,
+    the Prausnitz-Gunn pair matrices and the packed NASA polynomials. A sweep over a (n_compositions, n) matrix of mole
+    fractions is then evaluated by matrix operations in one call of the EoS
+
+    Args:
+        Tcs (list(float)): Critical temperatures of the components in K
+        Pcs (list(float)): Critical pressures of the components in Pa
+        MWs (list(float)): Molecular weights of the components in kg/mol
+        ws (list(float)): Acentric factors of the components
+        vcs (list(float)): Critical molar specific volumes of the components in m^3/mol. Optional. Default None, needed for Aungier EoS and pseudo critical properties
+        k_ij (list(list(float))): Binary interaction parameters. Optional. Default None
+        eos (str | CubicModel): EoS. Optional. Default "peng_robinson"
+        coefficients (list): NASA coefficients of the components in database format. Optional. Default None, needed for ideal gas heat capacity
+        Tc_method (str): Prausnitz-Gunn method to mix critical temperature. Optional. Default "kay"
+        Vc_method (str): Prausnitz-Gunn method to mix critical volume. Optional. Default "kay"
+
+    Attributes:
+        mixture (MixtureEoS): EoS of the components
+    """
+
+    def __init__(self, Tcs: List[float], Pcs: List[float], MWs: List[float], ws: List[float], vcs: List[float]=None, k_ij: List[List[float]]=None, eos: str | CubicModel="peng_robinson", coefficients: List=None, Tc_method: str="kay", Vc_method: str="kay"):
+
+        n = len(Tcs)
+        self.__mixture = MixtureEoS(np.full(n, 1 / n), Tcs, Pcs, MWs, ws, vcs, k_ij=k_ij, eos=eos)
+        self.__critical = None if vcs is None else PrausnitzGunn(Tcs, vcs, ws, MWs, Tc_method, Vc_method)
+        self.__nasa = None if coefficients is None else nasa.SpeciesNASA(coefficients)
+
+    @property
+    def mixture(self):
+        return self.__mixture
+
+    def __call__(self, ys: np.ndarray, T: np.ndarray, P: np.ndarray, phase: str="vapour") -> dict:
+
+        """
+        Computes properties of the mixtures
+
+        Args:
+            ys (np.ndarray): Mole fractions of shape (n_compositions, n) or (..., n)
+            T (np.ndarray): Temperatures in K. Broadcast against P and the leading dimensions of ys
+            P (np.ndarray): Pressures in Pa. Broadcast against T and the leading dimensions of ys
+            phase (str): Root of the EoS. Optional. Default "vapour". Available phases "vapour", "liquid" and "stable"
+
+        Returns:
+            dict: Compressibility factor Z, density rho [kg/m^3], molecular weight MW [kg/mol], logarithms of fugacity
+            coefficients ln_phi, pseudo critical properties Tc_mix, Pc_mix, Vc_mix, rhoc_mix, Zc_mix, ws_mix when critical volumes
+            are given, ideal gas heat capacity cp0 [J/(mol K)] and real gas heat capacity cp [J/(mol K)] when NASA coefficients are given
+        """
+
+        ys = np.asarray(ys, dtype=float)
+        residual = self.__mixture.residual_properties(T, P, ys, phase=phase)
+        result = {
+            "Z": residual["Z"],
+            "rho": residual["rho"],
+            "MW": ys @ self.__mixture.MWs,
+            "ln_phi": residual["ln_phi"]
+        }
+
+        if self.__critical is not None:
+            result.update(self.__critical(ys))
+
+        if self.__nasa is not None:
+            # Heat capacities of the components are evaluated at the given temperatures only and broadcast against the compositions
+            cp0 = R * np.sum(self.__nasa(T)["cp0"] * ys, axis=-1)
+            result["cp0"] = cp0
+            result["cp"] = cp0 + residual["Cp_dep"]
+
+        return result
+
+
+def composition_sweep(ys: np.ndarray, T: np.ndarray, P: np.ndarray, Tcs: List[float], Pcs: List[float], MWs: List[float], ws: List[float], vcs: List[float]=None, k_ij: List[List[float]]=None, eos: str | CubicModel="peng_robinson", coefficients: List=None, phase: str="vapour", Tc_method: str="kay", Vc_method: str="kay") -> dict:
+
+    """
+    Computes properties of many mixtures of the same components in one call, see CompositionSweep
+
+    Args:
+        ys (np.ndarray): Mole fractions of shape (n_compositions, n)
+        T (np.ndarray): Temperatures in K. Broadcast against P and the leading dimensions of ys
+        P (np.ndarray): Pressures in Pa. Broadcast against T and the leading dimensions of ys
+        Tcs, Pcs, MWs, ws (list(float)): Critical temperatures [K], critical pressures [Pa], molecular weights [kg/mol] and acentric factors of the components
+        vcs (list(float)): Critical molar specific volumes of the components in m^3/mol. Optional. Default None
+        k_ij (list(list(float))): Binary interaction parameters. Optional. Default None
+        eos (str | CubicModel): EoS. Optional. Default "peng_robinson"
+        coefficients (list): NASA coefficients of the components in database format. Optional. Default None
+        phase (str): Root of the EoS. Optional. Default "vapour"
+        Tc_method (str): Prausnitz-Gunn method to mix critical temperature. Optional. Default "kay"
+        Vc_method (str): Prausnitz-Gunn method to mix critical volume. Optional. Default "kay"
+
+    Returns:
+        dict: Properties of the mixtures of the broadcast shape
+    """
+
+    return CompositionSweep(Tcs, Pcs, MWs, ws, vcs, k_ij, eos, coefficients, Tc_method, Vc_method)(ys, T, P, phase)
@@ -0,0 +1,240 @@
+import os
+import sys
+import json
+import numpy as np
+from typing import List
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+
+from fluid.const import R, P0
+from fluid.eos import MixtureEoS
+import fluid.nasa as nasa
+
+
+TABLE_VERSION = 1
+
+
+def __slopes__(f: np.ndarray, x: np.ndarray, axis: int, monotone: bool) -> np.ndarray:
+
+    """
+    Computes node derivatives of the tabulated values along an axis
+
+    Args:
+        f (np.ndarray): Tabulated values
+        x (np.ndarray): Grid along the axis
+        axis (int): Axis of the derivative
+        monotone (bool): Limit the derivatives by Fritsch-Carlson conditions to keep the interpolant monotone between nodes
+
+    Returns:
+        np.ndarray: Derivatives of the shape of f
+    """
+
+    df = np.gradient(f, x, axis=axis, edge_order=2 if x.size > 2 else 1)
+    if not monotone:
+        return df
+
+    # Zero slopes at extrema of the secants and limit them to three times the neighbouring secants
+    f = np.moveaxis(f, axis, 0)
+    df = np.moveaxis(df, axis, 0).copy()
+    shape = (-1,) + (1,) * (f.ndim - 1)
+    secants = np.diff(f, axis=0) / np.diff(x).reshape(shape)
+    left = np.concatenate([secants[:1], secants], axis=0)
+    right = np.concatenate([secants, secants[-1:]], axis=0)
+    df = np.where(left * right <= 0, 0.0, df)
+    bound = 3 * np.minimum(np.abs(left), np.abs(right))
+    df = np.sign(df) * np.minimum(np.abs(df), bound)
+    return np.moveaxis(df, 0, axis)
+
+
+def build_table(path: str, mixture: MixtureEoS, coefficients: List, T: np.ndarray, P: np.ndarray, phase: str="stable", monotone: bool=False) -> str:
+
+    """
+    Evaluates the EoS and the NASA polynomials of the mixture on a T-P grid and saves the table to a directory.
+    Every property is stored with its node derivatives f, df/dT, df/dP and d2f/dTdP as an array of shape (4, nT, nP)
+    in a separate .npy file, so the table can be memory-mapped and shared between processes. The directory holds
+    a meta.json file with the version of the layout, the grid files and the stored properties
+
+    Args:
+        path (str): Directory of the table. Created if it does not exist
+        mixture (MixtureEoS): EoS of the mixture
+        coefficients (list): NASA coefficients of the components in database format [[[Tmin, Tmax], [a1, ..., a7], [b1, b2]], ...]
+        T (np.ndarray): Strictly increasing temperatures of the grid in K
+        P (np.ndarray): Strictly increasing pressures of the grid in Pa
+        phase (str): Root of the EoS. Optional. Default "stable"
+        monotone (bool): Keep the interpolant monotone between nodes. Optional. Default False
+
+    Returns:
+        str: Directory of the table
+    """
+
+    T, P = np.asarray(T, dtype=float), np.asarray(P, dtype=float)
+    if T.ndim != 1 or P.ndim != 1 or T.size < 2 or P.size < 2:
+        raise ValueError(f"Grid must be one-dimensional with at least 2 nodes. Given T {T.shape}, P {P.shape}")
+    if np.any(np.diff(T) <= 0) or np.any(np.diff(P) <= 0):
+        raise ValueError(f"Grid must be strictly increasing")
+    if len(coefficients) != mixture.ys.size:
+        raise ValueError(f"Number of NASA coefficients {len(coefficients)} does not match number of components {mixture.ys.size}")
+
+    TT, PP = np.meshgrid(T, P, indexing="ij")
+    residual = mixture.residual_properties(TT, PP, phase=phase)
+
+    ys = mixture.ys
+    ideal = nasa.compute_species(T, coefficients)
+    cp0, h0, s0 = ideal["cp0"] @ ys, ideal["h0"] @ ys, ideal["s0"] @ ys
+    s_mixing = -np.sum(ys[ys > 0] * np.log(ys[ys > 0]))
+
+    values = {
+        "Z": residual["Z"],
+        "rho": residual["rho"],
+        "h": (R * T * h0)[:, np.newaxis] + residual["H_dep"],
+        "s": R * (s0[:, np.newaxis] + s_mixing - np.log(PP / P0)) + residual["S_dep"],
+        "cp": (R * cp0)[:, np.newaxis] + residual["Cp_dep"]
+    }
+
+    os.makedirs(path, exist_ok=True)
+    np.save(os.path.join(path, "T.npy"), T)
+    np.save(os.path.join(path, "P.npy"), P)
+    for name, f in values.items():
+        f_T = __slopes__(f, T, 0, monotone)
+        f_P = __slopes__(f, P, 1, monotone)
+        f_TP = np.zeros_like(f) if monotone else __slopes__(f_T, P, 1, False)
+        np.save(os.path.join(path, f"{name}.npy"), np.stack([f, f_T, f_P, f_TP]))
+
+    meta = {
+        "version": TABLE_VERSION,
+        "grid": {"T": "T.npy", "P": "P.npy"},
+        "properties": {name: f"{name}.npy" for name in values},
+        "units": {"T": "K", "P": "Pa", "Z": "-", "rho": "kg/m^3", "h": "J/mol", "s": "J/(mol K)", "cp": "J/(mol K)"},
+        "phase": phase,
+        "monotone": monotone,
+        "mole_fractions": ys.tolist()
+    }
+    with open(os.path.join(path, "meta.json"), "w") as fp:
+        json.dump(meta, fp, indent=4)
+
+    return path
+
+
+class PropertyTable:
+
+    """
+    Memory-mapped T-P property table with bicubic Hermite interpolation
+
+    Tables are opened read-only with np.load(mmap_mode="r"), so processes that open the same table share the pages
+    of the files instead of copying them. Pickling keeps only the path, a table passed to a worker process is reopened there
+
+    Args:
+        path (str): Directory of the table written by build_table
+
+    Attributes:
+        T, P (np.ndarray): Grid of the table
+        properties (tuple): Names of the stored properties
+        meta (dict): Content of meta.json
+    """
+
+    def __init__(self, path: str):
+
+        self.__path = os.path.abspath(path)
+        with open(os.path.join(self.__path, "meta.json"), "r") as fp:
+            self.__meta = json.load(fp)
+
+        if self.__meta.get("version") != TABLE_VERSION:
+            raise ValueError(f"Table version {self.__meta.get('version')} is not supported. Supported version {TABLE_VERSION}")
+
+        self.__T = np.load(os.path.join(self.__path, self.__meta["grid"]["T"]), mmap_mode="r")
+        self.__P = np.load(os.path.join(self.__path, self.__meta["grid"]["P"]), mmap_mode="r")
+        self.__data = {
+            name: np.load(os.path.join(self.__path, file), mmap_mode="r")
+            for name, file in self.__meta["properties"].items()
+        }
+
+    def __reduce__(self):
+        return (self.__class__, (self.__path,))
+
+    @property
+    def path(self):
+        return self.__path
+
+    @property
+    def T(self):
+        return self.__T
+
+    @property
+    def P(self):
+        return self.__P
+
+    @property
+    def properties(self):
+        return tuple(self.__data)
+
+    @property
+    def meta(self):
+        return self.__meta
+
+    def __call__(self, T: np.ndarray, P: np.ndarray, properties: List[str]=None, derivatives: bool=False) -> dict:
+
+        """
+        Interpolates the properties at the given states. States outside of the grid are clamped to its boundary and flagged
+
+        Args:
+            T (np.ndarray): Temperatures in K. Broadcast against P
+            P (np.ndarray): Pressures in Pa. Broadcast against T
+            properties (list): Names of the properties. Optional. Default None, all stored properties
+            derivatives (bool): Return the derivatives of the properties with respect to T and P as "d<name>_dT" and "d<name>_dP". Optional. Default False
+
+        Returns:
+            dict: Interpolated properties and out_of_range flags of the broadcast shape of T and P
+        """
+
+        names = self.properties if properties is None else properties
+        for name in names:
+            if name not in self.__data:
+                raise ValueError(f"Property {name} is not stored in the table. Available properties {self.properties}")
+
+        T, P = np.broadcast_arrays(np.asarray(T, dtype=float), np.asarray(P, dtype=float))
+        Tg, Pg = self.__T, self.__P
+        out_of_range = (T < Tg[0]) | (T > Tg[-1]) | (P < Pg[0]) | (P > Pg[-1])
+        T, P = np.clip(T, Tg[0], Tg[-1]), np.clip(P, Pg[0], Pg[-1])
+
+        i = np.clip(np.searchsorted(Tg, T, side="right") - 1, 0, Tg.size - 2)
+        j = np.clip(np.searchsorted(Pg, P, side="right") - 1, 0, Pg.size - 2)
+        hT, hP = Tg[i + 1] - Tg[i], Pg[j + 1] - Pg[j]
+        t, u = (T - Tg[i]) / hT, (P - Pg[j]) / hP
+
+        # Hermite basis for the values and the scaled derivatives at both ends of the cell, and their derivatives
+        t2, u2 = t * t, u * u
+        At = (2 * t2 * t - 3 * t2 + 1, -2 * t2 * t + 3 * t2)
+        Ct = ((t2 * t - 2 * t2 + t) * hT, (t2 * t - t2) * hT)
+        Au = (2 * u2 * u - 3 * u2 + 1, -2 * u2 * u + 3 * u2)
+        Cu = ((u2 * u - 2 * u2 + u) * hP, (u2 * u - u2) * hP)
+        if derivatives:
+            dAt = ((6 * t2 - 6 * t) / hT, (-6 * t2 + 6 * t) / hT)
+            dCt = (3 * t2 - 4 * t + 1, 3 * t2 - 2 * t)
+            dAu = ((6 * u2 - 6 * u) / hP, (-6 * u2 + 6 * u) / hP)
+            dCu = (3 * u2 - 4 * u + 1, 3 * u2 - 2 * u)
+
+        result = {}
+        for name in names:
+            data = self.__data[name]
+            value = np.zeros(T.shape)
+            if derivatives:
+                d_dT, d_dP = np.zeros(T.shape), np.zeros(T.shape)
+            for p in (0, 1):
+                for q in (0, 1):
+                    f, f_T, f_P, f_TP = (data[k, i + p, j + q] for k in range(4))
+                    value += (At[p] * f + Ct[p] * f_T) * Au[q] + (At[p] * f_P + Ct[p] * f_TP) * Cu[q]
+                    if derivatives:
+                        d_dT += (dAt[p] * f + dCt[p] * f_T) * Au[q] + (dAt[p] * f_P + dCt[p] * f_TP) * Cu[q]
+                        d_dP += (At[p] * f + Ct[p] * f_T) * dAu[q] + (At[p] * f_P + Ct[p] * f_TP) * dCu[q]
+            result[name] = value
+            if derivatives:
+                result[f"d{name}_dT"] = d_dT
+                result[f"d{name}_dP"] = d_dP
+
+        result["out_of_range"] = out_of_range
+        return result
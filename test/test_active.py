@@ -0,0 +1,56 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.active import ActiveSet
+from fluid.eos import MixtureEoS
+
+
+TCS = [647.1, 190.6, 305.32, 369.8, 425.12, 469.7, 562.05]
+PCS = [22.064e6, 46e5, 48.72e5, 42.48e5, 37.96e5, 33.7e5, 48.95e5]
+MWS = [18.02e-3, 16.04e-3, 30.07e-3, 44.1e-3, 58.12e-3, 72.15e-3, 78.12e-3]
+WS = [0.344, 0.011, 0.099, 0.152, 0.199, 0.251, 0.212]
+VCS = [55.9e-6, 98.6e-6, 145.5e-6, 200e-6, 255e-6, 313e-6, 259e-6]
+ZS = np.array([0.0, 0.85, 0.07, 0.04, 0.0, 0.0, 0.04])
+
+
+@pytest.mark.parametrize("phase", ["vapour", "liquid"])
+def test_infinite_dilution(phase):
+
+    k_ij = np.full((7, 7), 0.02)
+    np.fill_diagonal(k_ij, 0.0)
+    active = ActiveSet(TCS, PCS, MWS, WS, VCS, k_ij=k_ij)
+    T, P = np.array([250.0, 300.0, 400.0]), np.array([2e6, 5e6, 1e7])
+
+    # Components of zero fraction are at infinite dilution in the mixture of all components
+    reference = MixtureEoS(ZS, TCS, PCS, MWS, WS, VCS, k_ij=k_ij).residual_properties(T, P, phase=phase)
+    properties = active.residual_properties(T, P, ZS, phase=phase)
+    np.testing.assert_allclose(properties["ln_phi"], reference["ln_phi"], rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(properties["Z"], reference["Z"], rtol=1e-12)
+
+    pruned = active.residual_properties(T, P, ZS, phase=phase, fill=np.nan)["ln_phi"]
+    assert np.all(np.isnan(pruned[:, ZS == 0])) and np.array_equal(pruned[:, ZS > 0], properties["ln_phi"][:, ZS > 0])
+
+
+def test_mixing_rules():
+
+    active = ActiveSet(TCS, PCS, MWS, WS, VCS, cache_size=2)
+    viscosities = np.linspace(1e-5, 2e-5, 7)
+    for k in range(4):
+        assert np.isfinite(active.wilke(np.roll(ZS, k), viscosities))
+    assert np.isfinite(active.prausnitz_gunn(ZS)["Tc_mix"])
+
+    # The cache of the mixing rules is bounded, Wilke's rule does not build Prausnitz-Gunn objects
+    mixers = active._ActiveSet__mixers
+    assert len(mixers) == 2
+    assert [type(mixer).__name__ for mixer in mixers.values()] == ["WilkeMixer", "PrausnitzGunn"]
+
+    with pytest.raises(ValueError):
+        ActiveSet(TCS, PCS, MWS, WS).prausnitz_gunn(ZS)
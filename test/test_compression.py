@@ -0,0 +1,66 @@
+import os
+import sys
+import json
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.eos import MixtureEoS
+from fluid.compression import compression_path
+
+
+# Natural gas: methane, ethane, propane, carbon dioxide
+THERMO = ["CH4", "C2H6", "C3H8", "CO2"]
+TCS = [190.6, 305.32, 369.8, 304.13]
+PCS = [46e5, 48.72e5, 42.48e5, 73.75e5]
+MWS = [16.04e-3, 30.07e-3, 44.1e-3, 44.01e-3]
+WS = [0.011, 0.099, 0.152, 0.225]
+YS = [0.85, 0.08, 0.04, 0.03]
+
+
+@pytest.fixture
+def case():
+    with open(os.path.join(PYTHON_PATH, "lib", "thermo.json"), "r") as fp:
+        database = json.load(fp)
+    mixture = MixtureEoS(YS, TCS, PCS, MWS, WS)
+    coefficients = [database[key]["coefficients"] for key in THERMO]
+    return mixture, coefficients, np.array([300.0, 310.0]), np.array([2e5, 3e5]), np.array([6e5, 12e5])
+
+
+def test_efficiency_from_discharge_temperature(case):
+
+    mixture, coefficients, T1, P1, P2 = case
+    forward = compression_path(mixture, coefficients, T1, P1, P2, efficiency=[0.75, 0.8])
+    assert np.all(forward["converged"])
+    inverse = compression_path(mixture, coefficients, T1, P1, P2, T2=forward["T2"])
+    assert np.all(inverse["converged"])
+    np.testing.assert_allclose(inverse["polytropic_efficiency"], [0.75, 0.8], rtol=1e-7)
+
+
+def test_efficiency_not_converged(case):
+
+    # The returned efficiency is the one of the returned path even when the iteration runs out
+    mixture, coefficients, T1, P1, P2 = case
+    T2 = compression_path(mixture, coefficients, T1, P1, P2, efficiency=[0.75, 0.8])["T2"]
+    with pytest.warns(RuntimeWarning):
+        inverse = compression_path(mixture, coefficients, T1, P1, P2, T2=T2, max_iter=1)
+    assert not np.any(inverse["converged"])
+    path = compression_path(mixture, coefficients, T1, P1, P2, efficiency=inverse["polytropic_efficiency"])
+    np.testing.assert_array_equal(path["T_path"], inverse["T_path"])
+    np.testing.assert_array_equal(path["polytropic_head"], inverse["polytropic_head"])
+
+
+def test_module_is_not_a_package():
+
+    # A module level __path__ would make the module look like a package to pydoc and the import system
+    import pydoc
+    import importlib.util
+    import fluid.compression
+    assert not hasattr(fluid.compression, "__path__")
+    assert "compression_path" in pydoc.render_doc(fluid.compression, renderer=pydoc.plaintext)
+    assert importlib.util.find_spec("fluid.compression").submodule_search_locations is None
@@ -0,0 +1,94 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.const import R
+from fluid.eos import MixtureEoS
+
+
+# n-Butane
+TC, PC, OMEGA, MW = 425.1, 37.96e5, 0.200, 58.12e-3
+VC = MW / 228.0
+
+
+def reference_volumes(eos, T, P):
+
+    """
+    Molar volumes of the largest and the smallest roots from the textbook form of the EoS solved by np.roots
+    """
+
+    if eos == "peng_robinson":
+        kappa = 0.37464 + 1.54226 * OMEGA - 0.26993 * OMEGA**2
+        a = 0.45724 * (R * TC)**2 / PC * (1 + kappa * (1 - np.sqrt(T / TC)))**2
+        b = 0.07780 * R * TC / PC
+        # P = R * T / (v - b) - a / (v**2 + 2 * b * v - b**2)
+        coeffs = [P, P * b - R * T, -3 * P * b**2 - 2 * R * T * b + a, P * b**3 + R * T * b**2 - a * b]
+    else:
+        b = 0.08664 * R * TC / PC
+        a = 0.42747 * (R * TC)**2 / PC
+        c = 0.0
+        if eos == "standard":
+            a *= np.sqrt(TC / T)
+        elif eos == "soave":
+            m = 0.480 + 1.574 * OMEGA - 0.176 * OMEGA**2
+            a *= (1 + m * (1 - np.sqrt(T / TC)))**2
+        elif eos == "aungier":
+            c = R * TC / (PC + a / (VC * (VC + b))) + b - VC
+            a *= (T / TC)**-(0.4986 + 1.1735 * OMEGA + 0.4754 * OMEGA**2)
+        # P = R * T / (v - b + c) - a / (v * (v + b)) with d = b - c
+        d = b - c
+        coeffs = [P, P * (b - d) - R * T, -P * b * d - R * T * b + a, -a * d]
+
+    roots = np.roots(coeffs)
+    v = np.sort(roots[np.abs(roots.imag) < 1e-12 * np.abs(roots)].real)
+    return v[-1], v[0]
+
+
+@pytest.mark.parametrize("eos", ["standard", "soave", "aungier", "peng_robinson"])
+def test_compressibility_reference(eos):
+
+    mixture = MixtureEoS([1.0], [TC], [PC], [MW], [OMEGA], [VC], eos=eos)
+    for T, P in [(300.0, 1e5), (350.0, 9.4573e5), (400.0, 2e6), (500.0, 5e6), (600.0, 20e6)]:
+        v_vapour, v_liquid = reference_volumes(eos, T, P)
+        vapour = mixture.residual_properties(T, P, phase="vapour")["Z"]
+        liquid = mixture.residual_properties(T, P, phase="liquid")["Z"]
+        assert np.isclose(vapour, P * v_vapour / (R * T), rtol=1e-9)
+        assert np.isclose(liquid, P * v_liquid / (R * T), rtol=1e-9)
+
+
+@pytest.mark.parametrize("eos, v_vapour, v_liquid", [
+    ("standard", 2555.0, 133.3),
+    ("soave", 2520.0, 127.8),
+    ("peng_robinson", 2486.0, 112.6)
+])
+def test_saturated_butane(eos, v_vapour, v_liquid):
+
+    # Smith, Van Ness, Abbott. Introduction to Chemical Engineering Thermodynamics, 7th ed., Example 3.9.
+    # Saturated n-butane at 350 K and 9.4573 bar, molar volumes in cm^3/mol
+    T, P = 350.0, 9.4573e5
+    mixture = MixtureEoS([1.0], [TC], [PC], [MW], [OMEGA], eos=eos)
+    vapour = mixture.residual_properties(T, P, phase="vapour")["Z"] * R * T / P * 1e6
+    liquid = mixture.residual_properties(T, P, phase="liquid")["Z"] * R * T / P * 1e6
+    assert np.isclose(vapour, v_vapour, rtol=1e-3)
+    assert np.isclose(liquid, v_liquid, rtol=1e-3)
+
+
+def test_mixture_diagonal_and_covolume():
+
+    # van der Waals one-fluid mixing including the diagonal terms and b_i from Tc_i / Pc_i
+    ys, Tcs, Pcs, ws = [0.6, 0.4], [190.6, 425.1], [4.599e6, 3.796e6], [0.012, 0.200]
+    mixture = MixtureEoS(ys, Tcs, Pcs, [16.04e-3, 58.12e-3], ws, k_ij=[[0.0, 0.02], [0.02, 0.0]], eos="peng_robinson")
+    T = 320.0
+    kappa = 0.37464 + 1.54226 * np.array(ws) - 0.26993 * np.array(ws)**2
+    a = 0.45724 * (R * np.array(Tcs))**2 / np.array(Pcs) * (1 + kappa * (1 - np.sqrt(T / np.array(Tcs))))**2
+    a_mix = sum(ys[i] * ys[j] * (1 - (0.02 if i != j else 0.0)) * np.sqrt(a[i] * a[j]) for i in range(2) for j in range(2))
+    b_mix = sum(y * 0.07780 * R * Tc / Pc for y, Tc, Pc in zip(ys, Tcs, Pcs))
+    assert np.isclose(mixture.a_mix(T), a_mix, rtol=1e-12)
+    assert np.isclose(mixture.b_mix, b_mix, rtol=1e-12)
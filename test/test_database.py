@@ -0,0 +1,36 @@
+import os
+import sys
+import json
+import pickle
+import numpy as np
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.database import compile_database, Database
+
+
+def test_round_trip(tmp_path):
+
+    source = os.path.join(PYTHON_PATH, "lib", "thermo.json")
+    with open(source, "r") as fp:
+        expected = json.load(fp)
+
+    database = Database(compile_database(source, str(tmp_path / "thermo")))
+    assert isinstance(database._Database__columns["a"], np.memmap)
+    assert len(database._Database__species) == 0
+    assert list(database) == list(expected)
+
+    keys = list(expected)
+    assert database.coefficients(keys) == [expected[key]["coefficients"] or None for key in keys]
+    for key in keys:
+        species = database[key]
+        for name in ("workbody", "molecular_weight", "heat_of_formation", "coefficients"):
+            assert species[name] == expected[key][name], (key, name)
+    assert len(database._Database__species) == len(expected)
+
+    clone = pickle.loads(pickle.dumps(database))
+    assert clone.path == database.path and clone["CH4"] == database["CH4"]
@@ -0,0 +1,75 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.eos import MixtureEoS
+from fluid.envelope import phase_envelope, __residuals__
+
+
+# Natural gas of methane, ethane, propane and n-butane
+ZS = [0.85, 0.08, 0.05, 0.02]
+TCS = [190.6, 305.32, 369.8, 425.12]
+PCS = [46e5, 48.72e5, 42.48e5, 37.96e5]
+MWS = [16.04e-3, 30.07e-3, 44.1e-3, 58.12e-3]
+WS = [0.011, 0.099, 0.152, 0.199]
+
+
+@pytest.fixture(scope="module")
+def mixture():
+    return MixtureEoS(ZS, TCS, PCS, MWS, WS)
+
+
+@pytest.fixture(scope="module")
+def envelope(mixture):
+    return phase_envelope(mixture)
+
+
+def __crossing__(envelope):
+
+    # The equilibrium ratios change sign at the critical point, the dew branch is traced first
+    sign = np.sign(np.log(envelope["K"][:, 0]))
+    crossing = np.flatnonzero(sign[1:] != sign[:-1])
+    assert crossing.size == 1
+    return int(crossing[0])
+
+
+def test_points_solve_the_equations(mixture, envelope):
+
+    X = np.column_stack([np.log(envelope["K"]), np.log(envelope["T"]), np.log(envelope["P"])])
+    feed = np.arange(len(ZS))
+    k = __crossing__(envelope)
+    dew = __residuals__(mixture, X[:k + 1], feed, 1.0, ("vapour", "liquid"))
+    bubble = __residuals__(mixture, X[k + 1:], feed, 1.0, ("liquid", "vapour"))
+    assert np.max(np.abs(dew)) < 1e-9 and np.max(np.abs(bubble)) < 1e-9
+    assert envelope["P"][0] == pytest.approx(1e5) and envelope["P"][-1] < 1e5
+
+
+def test_critical_point(envelope):
+
+    k = __crossing__(envelope)
+    T_c, P_c = envelope["critical"]
+    T, P = envelope["T"][k:k + 2], envelope["P"][k:k + 2]
+    assert T.min() <= T_c <= T.max()
+    assert P.min() <= P_c <= P.max()
+
+
+def test_extrema(envelope):
+
+    T, P = envelope["T"], envelope["P"]
+    T_t, P_t = envelope["cricondentherm"]
+    T_b, P_b = envelope["cricondenbar"]
+
+    # The refined extrema are at least the traced ones and close to them, on the same part of the line
+    k, j = int(np.argmax(T)), int(np.argmax(P))
+    assert T.max() <= T_t <= T.max() + 0.1
+    assert P.max() <= P_b <= 1.01 * P.max()
+    assert P[k - 1:k + 2].min() <= P_t <= P[k - 1:k + 2].max()
+    assert T[j - 1:j + 2].min() <= T_b <= T[j - 1:j + 2].max()
+    assert envelope["critical"][0] < T_t and envelope["critical"][1] < P_b
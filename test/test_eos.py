@@ -0,0 +1,131 @@
+import os
+import sys
+import dataclasses
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.const import R
+from fluid.cubic import PENG_ROBINSON
+from fluid.eos import MixtureEoS, redlich_kwong, redlich_kwong_batch, peng_robinson, peng_robinson_batch
+
+
+# Methane, ethane, propane, nitrogen, carbon dioxide
+TCS = [190.6, 305.3, 369.8, 126.2, 304.1]
+PCS = [4.599e6, 4.872e6, 4.248e6, 3.394e6, 7.377e6]
+MWS = [16.04e-3, 30.07e-3, 44.10e-3, 28.01e-3, 44.01e-3]
+WS = [0.012, 0.099, 0.152, 0.037, 0.225]
+VCS = [98.6e-6, 145.5e-6, 200.0e-6, 89.2e-6, 94.0e-6]
+YS = np.array([0.70, 0.12, 0.08, 0.04, 0.06])
+K_IJ = np.array([
+    [0.000, 0.003, 0.012, 0.030, 0.100],
+    [0.003, 0.000, 0.001, 0.050, 0.130],
+    [0.012, 0.001, 0.000, 0.090, 0.135],
+    [0.030, 0.050, 0.090, 0.000, -0.020],
+    [0.100, 0.130, 0.135, -0.020, 0.000]
+])
+STATES = [(250.0, 2e6, "vapour"), (300.0, 8e6, "vapour"), (400.0, 20e6, "vapour"), (200.0, 10e6, "liquid")]
+
+
+def g_residual(mixture, T, P, ns, phase):
+
+    """
+    n * G_res / (R * T) from the molar departure functions
+    """
+
+    p = mixture.residual_properties(T, P, ns / np.sum(ns), phase=phase)
+    return np.sum(ns) * (p["H_dep"] - T * p["S_dep"]) / (R * T)
+
+
+@pytest.mark.parametrize("eos", ["standard", "soave", "aungier", "peng_robinson"])
+@pytest.mark.parametrize("T, P, phase", STATES)
+def test_fugacity_coefficients_derivative(eos, T, P, phase):
+
+    # ln phi_i = d(n * G_res / (R * T)) / dn_i at constant T and P
+    mixture = MixtureEoS(YS, TCS, PCS, MWS, WS, VCS, k_ij=K_IJ, eos=eos)
+    ln_phi = mixture.residual_properties(T, P, phase=phase)["ln_phi"]
+    h = 1e-6
+    for i in range(YS.size):
+        dn = np.zeros(YS.size)
+        dn[i] = h
+        derivative = (g_residual(mixture, T, P, YS + dn, phase) - g_residual(mixture, T, P, YS - dn, phase)) / (2 * h)
+        assert np.isclose(ln_phi[i], derivative, rtol=1e-8, atol=1e-10)
+    # Gibbs-Duhem, the mixture value is the mole fraction average
+    assert np.isclose(ln_phi @ YS, g_residual(mixture, T, P, YS, phase), rtol=1e-10, atol=1e-12)
+
+
+@pytest.mark.parametrize("eos", ["standard", "soave", "aungier", "peng_robinson"])
+@pytest.mark.parametrize("T, P, phase", STATES)
+def test_departures_temperature_derivatives(eos, T, P, phase):
+
+    mixture = MixtureEoS(YS, TCS, PCS, MWS, WS, VCS, k_ij=K_IJ, eos=eos)
+    p = mixture.residual_properties(T, P, phase=phase)
+    h = 1e-5 * T
+    plus, minus = [mixture.residual_properties(T + d, P, phase=phase) for d in (h, -h)]
+
+    # G_res = H_dep - T * S_dep, S_dep = -dG_res/dT, Cp_dep = dH_dep/dT at constant P
+    G_plus, G_minus = [q["H_dep"] - (T + d) * q["S_dep"] for q, d in ((plus, h), (minus, -h))]
+    assert np.isclose(p["S_dep"], -(G_plus - G_minus) / (2 * h), rtol=1e-7, atol=1e-8)
+    assert np.isclose(p["Cp_dep"], (plus["H_dep"] - minus["H_dep"]) / (2 * h), rtol=1e-7, atol=1e-8)
+    assert np.isclose(p["Cp_dep"], T * (plus["S_dep"] - minus["S_dep"]) / (2 * h), rtol=1e-7, atol=1e-8)
+
+
+def test_batched_compositions():
+
+    mixture = MixtureEoS(YS, TCS, PCS, MWS, WS, VCS, k_ij=K_IJ)
+    rng = np.random.default_rng(0)
+    xs = rng.dirichlet(np.ones(YS.size), size=4)
+    batch = mixture.residual_properties(300.0, 5e6, xs)
+    for k, x in enumerate(xs):
+        single = mixture.residual_properties(300.0, 5e6, x)
+        for name in ("Z", "rho", "ln_phi", "H_dep", "S_dep", "Cp_dep", "Cv_dep"):
+            np.testing.assert_allclose(batch[name][k], single[name], rtol=1e-13)
+
+
+def test_same_temperature_keeps_attraction():
+
+    calls = []
+    model = dataclasses.replace(PENG_ROBINSON, alpha=lambda *args, **kwargs: calls.append(args) or PENG_ROBINSON.alpha(*args, **kwargs))
+    mixture = MixtureEoS(YS, TCS, PCS, MWS, WS, k_ij=K_IJ, eos=model)
+
+    a_mix = mixture.a_mix(300.0)
+    assert len(calls) == 1
+    assert mixture.a_mix(300.0) == a_mix and len(calls) == 1
+    mixture(300.0, [1e6, 5e6, 1e7])
+    assert len(calls) == 1
+
+    # A new isotherm recomputes the alpha terms and replaces the cached one
+    a_new = mixture.a_mix(350.0)
+    assert len(calls) == 2 and a_new != a_mix
+    assert mixture.a_mix(350.0) == a_new and len(calls) == 2
+    mixture.a_mix(300.0)
+    assert len(calls) == 3
+
+    # Arrays of temperatures are neither served from nor stored in the cache
+    mixture.a_mix(np.array([300.0, 350.0]))
+    mixture.a_mix(300.0)
+    assert len(calls) == 4
+
+
+@pytest.mark.parametrize("eos", ["standard", "soave", "aungier", "peng_robinson"])
+def test_batch_matches_scalar(eos):
+
+    T, P = np.array([[250.0], [300.0], [400.0]]), np.array([2e6, 8e6, 20e6])
+    if eos == "peng_robinson":
+        Z, rho, w_mix = peng_robinson_batch(T, P, YS, TCS, PCS, MWS, WS, k_ij=K_IJ)
+        scalar = lambda T, P: peng_robinson(T, P, YS, TCS, PCS, MWS, WS, k_ij=K_IJ)
+    else:
+        Z, rho, w_mix = redlich_kwong_batch(T, P, YS, TCS, PCS, MWS, WS, VCS, k_ij=K_IJ, eos=eos)
+        scalar = lambda T, P: redlich_kwong(T, P, YS, TCS, PCS, MWS, WS, VCS, k_ij=K_IJ, eos=eos)
+
+    assert Z.shape == rho.shape == (3, 3)
+    for (i, j) in np.ndindex(Z.shape):
+        Z_s, rho_s, w_s = scalar(T[i, 0], P[j])
+        assert Z[i, j] == pytest.approx(Z_s, rel=1e-13)
+        assert rho[i, j] == pytest.approx(rho_s, rel=1e-13)
+        assert w_mix == w_s
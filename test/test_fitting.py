@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+import fluid.nasa as nasa
+from fluid.fitting import refit
+
+
+BREAKPOINTS = [200.0, 1000.0, 6000.0]
+T_REF = 298.15
+
+
+@pytest.fixture(scope="module")
+def source():
+
+    # N2 polynomials of the library match at the range boundaries
+    with open(os.path.join(PYTHON_PATH, "lib", "thermo.json"), "r") as fp:
+        return [json.load(fp)["N2"]["coefficients"]]
+
+
+def __ranges__(coefficients, k, T):
+
+    # Properties of the polynomial of range k evaluated at T, also outside of the range
+    t, a, b = coefficients[0][k]
+    return nasa.evaluate(T, np.array(a + b))
+
+
+@pytest.mark.parametrize("terms, rtol", [(9, 1e-3), (7, 5e-3)])
+def test_refit(source, terms, rtol):
+
+    coefficients = refit(source, BREAKPOINTS, terms=terms)
+    assert [r[0] for r in coefficients[0]] == [[200.0, 1000.0], [1000.0, 6000.0]]
+
+    T = np.linspace(200.0, 6000.0, 1000)
+    original, fitted = nasa.SpeciesNASA(source), nasa.SpeciesNASA(coefficients)
+    np.testing.assert_allclose(fitted(T)["cp0"], original(T)["cp0"], rtol=rtol)
+
+    # Heat capacity and its derivative, enthalpy and entropy are continuous at the boundary
+    Tb, dT = BREAKPOINTS[1], 1e-3
+    below, above = __ranges__(coefficients, 0, Tb), __ranges__(coefficients, 1, Tb)
+    assert below["cp0"] == pytest.approx(above["cp0"], rel=1e-10)
+    assert below["h0"] * Tb == pytest.approx(above["h0"] * Tb, rel=1e-10)
+    assert below["s0"] == pytest.approx(above["s0"], rel=1e-10)
+    slope_below = (__ranges__(coefficients, 0, Tb + dT)["cp0"] - __ranges__(coefficients, 0, Tb - dT)["cp0"]) / (2 * dT)
+    slope_above = (__ranges__(coefficients, 1, Tb + dT)["cp0"] - __ranges__(coefficients, 1, Tb - dT)["cp0"]) / (2 * dT)
+    assert slope_below == pytest.approx(slope_above, rel=1e-5)
+    assert fitted.continuous[0]
+
+    # Reference enthalpy and entropy are kept
+    assert fitted(T_REF)["h0"][0] * T_REF == pytest.approx(original(T_REF)["h0"][0] * T_REF, rel=1e-12)
+    assert fitted(T_REF)["s0"][0] == pytest.approx(original(T_REF)["s0"][0], rel=1e-12)
+
+    if terms == 7:
+        for t, a, b in coefficients[0]:
+            assert a[0] == 0.0 and a[1] == 0.0
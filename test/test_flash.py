@@ -0,0 +1,95 @@
+import os
+import sys
+import json
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.eos import MixtureEoS
+from fluid.flash import rachford_rice, pt_flash, ph_flash, ps_flash, __energy__
+
+
+# Wet gas: water, methane, ethane, propane, n-butane, n-pentane, benzene
+TCS = [647.1, 190.6, 305.32, 369.8, 425.12, 469.7, 562.05]
+PCS = [22.064e6, 46e5, 48.72e5, 42.48e5, 37.96e5, 33.7e5, 48.95e5]
+MWS = [18.02e-3, 16.04e-3, 30.07e-3, 44.1e-3, 58.12e-3, 72.15e-3, 78.12e-3]
+WS = [0.344, 0.011, 0.099, 0.152, 0.199, 0.251, 0.212]
+ZS = np.array([0.01, 0.85, 0.07, 0.04, 0.02, 0.007, 0.003])
+THERMO = ["H2O", "CH4", "C2H6", "C3H8", "C4H10,n-butane", "C5H12,n-pentane", "C6H6"]
+
+
+@pytest.fixture
+def mixture():
+    return MixtureEoS(ZS, TCS, PCS, MWS, WS)
+
+
+def test_rachford_rice():
+
+    assert np.isclose(rachford_rice([0.5, 0.5], [2.0, 0.5]), 0.5, rtol=1e-12)
+    assert rachford_rice([0.3, 0.7], [3.0, 1.5]) == 1.0
+    assert rachford_rice([0.3, 0.7], [0.9, 0.2]) == 0.0
+
+    # Batch with a negative flash allowed outside [0, 1]
+    zs = np.array([[0.2, 0.3, 0.5], [0.6, 0.3, 0.1]])
+    Ks = np.array([[3.0, 1.2, 0.1], [1.05, 0.9, 0.8]])
+    beta = rachford_rice(zs, Ks)
+    np.testing.assert_allclose(np.sum(zs * (Ks - 1) / (1 + beta[:, np.newaxis] * (Ks - 1)), axis=-1), 0.0, atol=1e-12)
+    assert 0 < beta[0] < 1 and beta[1] < 0
+
+
+def test_two_phase_equilibrium(mixture):
+
+    T, P = np.array([220.0, 250.0, 280.0]), np.full(3, 4e6)
+    flash = pt_flash(mixture, T, P, newton=True)
+    assert np.all(flash["converged"]) and not np.any(flash["stable"])
+    beta = flash["beta"][:, np.newaxis]
+    assert np.all((beta > 0) & (beta < 1))
+
+    # Material balance
+    np.testing.assert_allclose(beta * flash["ys"] + (1 - beta) * flash["xs"], np.broadcast_to(ZS, flash["xs"].shape), atol=1e-12)
+
+    # Equal fugacities of the components in both phases
+    ln_phi_liquid = mixture.residual_properties(T, P, flash["xs"], phase="liquid")["ln_phi"]
+    ln_phi_vapour = mixture.residual_properties(T, P, flash["ys"], phase="vapour")["ln_phi"]
+    np.testing.assert_allclose(np.log(flash["xs"]) + ln_phi_liquid, np.log(flash["ys"]) + ln_phi_vapour, atol=1e-9)
+
+
+def test_single_phase(mixture):
+
+    # Superheated gas
+    flash = pt_flash(mixture, [400.0, 600.0], [1e5, 5e6])
+    assert np.all(flash["stable"]) and np.all(flash["beta"] == 1.0) and np.all(flash["converged"])
+    np.testing.assert_array_equal(flash["ys"], np.broadcast_to(ZS, flash["ys"].shape))
+
+    # Subcooled liquid propane and n-butane
+    liquid = MixtureEoS([0.5, 0.5], TCS[3:5], PCS[3:5], MWS[3:5], WS[3:5])
+    flash = pt_flash(liquid, 300.0, 1e6)
+    assert flash["stable"] and flash["beta"] == 0.0
+    assert np.isclose(flash["Z_liquid"], liquid.residual_properties(300.0, 1e6, phase="liquid")["Z"])
+
+
+def test_two_phase_energy_round_trip(mixture):
+
+    with open(os.path.join(PYTHON_PATH, "lib", "thermo.json"), "r") as fp:
+        database = json.load(fp)
+    coefficients = [database[key]["coefficients"] for key in THERMO]
+
+    T, P = np.array([220.0, 250.0, 280.0]), np.full(3, 4e6)
+    flash = pt_flash(mixture, T, P)
+    assert np.all((flash["beta"] > 0) & (flash["beta"] < 1))
+    properties = {}
+    for kind in ("h", "s"):
+        f_vapour, _, _ = __energy__(mixture, coefficients, T, P, flash["ys"], "vapour", kind)
+        f_liquid, _, _ = __energy__(mixture, coefficients, T, P, flash["xs"], "liquid", kind)
+        properties[kind] = flash["beta"] * f_vapour + (1 - flash["beta"]) * f_liquid
+
+    # The PH and PS flashes return the temperature and the solution of the PT flash
+    for result in (ph_flash(mixture, coefficients, P, properties["h"]), ps_flash(mixture, coefficients, P, properties["s"])):
+        assert np.all(result["converged"])
+        np.testing.assert_allclose(result["T"], T, rtol=1e-7)
+        np.testing.assert_allclose(result["beta"], flash["beta"], rtol=1e-6)
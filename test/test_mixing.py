@@ -0,0 +1,82 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.mixing import wilke, WilkeMixer, prausnitz_gunn, prausnitz_gunn_batch, PrausnitzGunn
+
+
+# Methane, ethane, propane, nitrogen and carbon dioxide
+TCS = [190.6, 305.32, 369.8, 126.2, 304.13]
+VCS = [98.6e-6, 145.5e-6, 200e-6, 89.2e-6, 94.1e-6]
+WS = [0.011, 0.099, 0.152, 0.037, 0.224]
+MWS = [16.04e-3, 30.07e-3, 44.1e-3, 28.01e-3, 44.01e-3]
+VISCOSITIES = [1.1e-5, 9.3e-6, 8.2e-6, 1.78e-5, 1.5e-5]
+
+
+def reference_wilke(ys, xs, MWs):
+
+    # Textbook Wilke's rule, phi_ii = 1 is part of the denominator
+    n = len(ys)
+    x_mix = 0.0
+    for i in range(n):
+        if ys[i] == 0:
+            continue
+        denominator = sum(
+            ys[j] * (1 + (xs[i] / xs[j])**0.5 * (MWs[j] / MWs[i])**0.25)**2 / np.sqrt(8 * (1 + MWs[i] / MWs[j]))
+            for j in range(n)
+        )
+        x_mix += ys[i] * xs[i] / denominator
+    return x_mix
+
+
+def compositions():
+
+    rng = np.random.default_rng(0)
+    ys = rng.dirichlet(np.ones(len(TCS)), size=5)
+    pure = np.eye(len(TCS))[[0, 3]]
+    sparse = np.array([[0.9, 0.0, 0.0, 0.1, 0.0]])
+    return np.vstack([ys, pure, sparse])
+
+
+def test_wilke():
+
+    ys = compositions()
+    batch = WilkeMixer(MWS)(ys, VISCOSITIES)
+    for k, y in enumerate(ys):
+        assert batch[k] == pytest.approx(wilke(y, VISCOSITIES, MWS), rel=1e-14)
+        assert batch[k] == pytest.approx(reference_wilke(y, VISCOSITIES, MWS), rel=1e-12)
+
+    # A pure component keeps its property, phi_ii = 1
+    assert batch[5] == pytest.approx(VISCOSITIES[0], rel=1e-14)
+    assert batch[6] == pytest.approx(VISCOSITIES[3], rel=1e-14)
+
+    # Properties of the components at every state broadcast against the compositions
+    xs = np.array(VISCOSITIES) * np.array([[1.0], [1.5]])
+    assert WilkeMixer(MWS)(ys[0], xs)[1] == pytest.approx(1.5 * batch[0], rel=1e-14)
+
+
+@pytest.mark.parametrize("Tc_method", ["kay", "binary"])
+@pytest.mark.parametrize("Vc_method", ["kay", "binary"])
+def test_prausnitz_gunn(Tc_method, Vc_method):
+
+    ys = compositions()
+    batch = prausnitz_gunn_batch(ys, TCS, VCS, WS, MWS, Tc_method, Vc_method)
+    for k, y in enumerate(ys):
+        scalar = prausnitz_gunn(y, TCS, VCS, WS, MWS, Tc_method, Vc_method)
+        for key, value in scalar.items():
+            assert batch[key][k] == pytest.approx(value, rel=1e-13), key
+
+
+def test_prausnitz_gunn_unknown_method():
+
+    with pytest.raises(ValueError):
+        PrausnitzGunn(TCS, VCS, WS, MWS, Tc_method="lee_kesler")
+    with pytest.raises(ValueError):
+        prausnitz_gunn_batch(compositions(), TCS, VCS, WS, MWS, Vc_method="lee_kesler")
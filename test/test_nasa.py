@@ -0,0 +1,61 @@
+import os
+import sys
+import json
+import warnings
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.nasa import SpeciesNASA, MixtureNASA, temperature_from_enthalpy, temperature_from_entropy
+
+
+@pytest.fixture(scope="module")
+def database():
+
+    with open(os.path.join(PYTHON_PATH, "lib", "thermo.json"), "r") as fp:
+        return json.load(fp)
+
+
+def test_round_trip(database):
+
+    # N2 matches at the range boundaries 1000 K and 6000 K
+    species = SpeciesNASA([database["N2"]["coefficients"]])
+    assert species.continuous[0] and species.monotonic[0]
+    mixture = MixtureNASA(species, [1.0])
+
+    T = np.concatenate([np.linspace(200.0, 20000.0, 500), [1000.0, 6000.0]])
+    properties = mixture(T)
+    np.testing.assert_allclose(temperature_from_enthalpy(properties["h0"] * T, mixture), T, rtol=1e-10)
+    np.testing.assert_allclose(temperature_from_entropy(properties["s0"], mixture, T0=1.1 * T), T, rtol=1e-10)
+    np.testing.assert_allclose(temperature_from_entropy(species(T)["s0"], species)[:, 0], T, rtol=1e-10)
+
+
+def test_discontinuous_polynomials(database):
+
+    # Enthalpy of CH4 jumps at 1000 K, the target of 900 K is met again in the upper range
+    coefficients = [database["CH4"]["coefficients"], database["N2"]["coefficients"]]
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        species = SpeciesNASA(coefficients)
+    assert not species.continuous[0] and species.continuous[1]
+    with pytest.warns(RuntimeWarning, match=r"do not match .* \[0\]"):
+        SpeciesNASA(coefficients, warn=True)
+
+    T = np.array([900.0, 3000.0])
+    enthalpy = species(T)["h0"] * T[:, np.newaxis]
+    result = temperature_from_enthalpy(enthalpy, species)
+    assert np.isnan(result[0, 0])
+    np.testing.assert_allclose(result[1], T[1], rtol=1e-10)
+    np.testing.assert_allclose(result[:, 1], T, rtol=1e-10)
+
+
+def test_outside_of_valid_range(database):
+
+    mixture = MixtureNASA([database["N2"]["coefficients"]], [1.0])
+    T = np.array([150.0, 25000.0])
+    assert np.all(np.isnan(temperature_from_enthalpy(mixture(T)["h0"] * T, mixture)))
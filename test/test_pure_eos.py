@@ -0,0 +1,49 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.pure_eos import redlich_kwong, redlich_kwong_batch, peng_robinson, peng_robinson_batch
+
+
+# Methane, ethane, propane and n-butane
+MWS = [16.04e-3, 30.07e-3, 44.1e-3, 58.12e-3]
+TCS = [190.6, 305.32, 369.8, 425.12]
+PCS = [46e5, 48.72e5, 42.48e5, 37.96e5]
+RHOCS = [162.66, 206.18, 220.48, 227.85]
+WS = [0.011, 0.099, 0.152, 0.199]
+
+# States of shape (2, 3) broadcast from T of shape (2, 1) and P of shape (3,)
+T = np.array([[250.0], [450.0]])
+P = np.array([1e5, 2e6, 8e6])
+
+
+def __check__(batch, scalar):
+
+    Z, rho = batch
+    T_b, P_b = np.broadcast_arrays(T, P)
+    assert Z.shape == rho.shape == (len(MWS),) + T_b.shape
+    for i in range(len(MWS)):
+        for k in np.ndindex(T_b.shape):
+            Z_s, rho_s = scalar(i, T_b[k], P_b[k])
+            assert Z[i][k] == pytest.approx(Z_s, rel=1e-12), (i, k)
+            assert rho[i][k] == pytest.approx(rho_s, rel=1e-12), (i, k)
+
+
+@pytest.mark.parametrize("model", ["standard", "soave", "aungier"])
+def test_redlich_kwong_batch(model):
+
+    batch = redlich_kwong_batch(T, P, MWS, TCS, PCS, RHOCS, WS, model=model)
+    __check__(batch, lambda i, T, P: redlich_kwong(T, P, MWS[i], TCS[i], PCS[i], RHOCS[i], WS[i], model=model))
+
+
+def test_peng_robinson_batch():
+
+    batch = peng_robinson_batch(T, P, MWS, TCS, PCS, WS)
+    __check__(batch, lambda i, T, P: peng_robinson(T, P, MWS[i], TCS[i], PCS[i], WS[i]))
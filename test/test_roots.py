@@ -0,0 +1,93 @@
+import os
+import sys
+import numpy as np
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.roots import cubic_roots, cubic_continuation
+from fluid.eos import MixtureEoS
+
+
+def real_roots(coeffs):
+    roots = np.roots(coeffs)
+    return np.sort(roots[np.abs(roots.imag) <= 1e-6 * np.maximum(np.abs(roots), 1.0)].real)
+
+
+def test_random_cubics():
+
+    rng = np.random.default_rng(0)
+    coeffs = rng.uniform(-10.0, 10.0, size=(1000, 4))
+    x_max, x_min = cubic_roots(coeffs.T)
+    for k, c in enumerate(coeffs):
+        expected = real_roots(c)
+        assert np.isclose(x_max[k], expected[-1], rtol=1e-9, atol=1e-9)
+        assert np.isclose(x_min[k], expected[0], rtol=1e-9, atol=1e-9)
+
+
+def test_three_real_roots():
+
+    rng = np.random.default_rng(1)
+    roots = np.sort(rng.uniform(-5.0, 5.0, size=(1000, 3)), axis=1)
+    coeffs = np.array([np.poly(r) for r in roots])
+    x_max, x_min = cubic_roots(coeffs.T)
+    np.testing.assert_allclose(x_max, [real_roots(c)[-1] for c in coeffs], rtol=1e-8, atol=1e-8)
+    np.testing.assert_allclose(x_min, [real_roots(c)[0] for c in coeffs], rtol=1e-8, atol=1e-8)
+    np.testing.assert_allclose(x_max, roots[:, -1], rtol=1e-8, atol=1e-8)
+    np.testing.assert_allclose(x_min, roots[:, 0], rtol=1e-8, atol=1e-8)
+
+
+def test_near_double_root():
+
+    # Compressibility-like cubics with a double root split by eps, once above and once below the single root
+    for eps in (1e-3, 1e-5, 1e-7, 0.0):
+        for roots in ([0.05, 0.3 - eps, 0.3 + eps], [0.05 - eps, 0.05 + eps, 0.9]):
+            x_max, x_min = cubic_roots(np.poly(roots))
+            assert np.isclose(x_max, max(roots), atol=1e-6)
+            assert np.isclose(x_min, min(roots), atol=1e-6)
+
+
+def test_badly_scaled_roots():
+
+    # Liquid roots of compressibility cubics at very low pressure are many orders of magnitude below the vapour root
+    for scale in (1e-4, 1e-8, 1e-14, 1e-20):
+        for roots in ([0.0085 * scale, 1.0 - 0.84 * scale, 0.0012 * scale], [-2.0, 0.5 * scale, 0.07 * scale]):
+            x_max, x_min = cubic_roots(np.poly(roots))
+            assert np.isclose(x_max, max(roots), rtol=1e-10, atol=0.0)
+            assert np.isclose(x_min, min(roots), rtol=1e-10, atol=0.0)
+
+
+def test_single_real_root():
+
+    # (x - 2) * (x**2 + 1)
+    x_max, x_min = cubic_roots([1.0, -2.0, 1.0, -2.0])
+    assert np.isclose(x_max, 2.0) and np.isclose(x_min, 2.0)
+
+
+def test_continuation_ascending_isotherm():
+
+    # n-Butane at 350 K, saturation pressure 9.4573 bar. The vapour branch is followed into the metastable region up to its spinodal
+    mixture = MixtureEoS([1.0], [425.1], [37.96e5], [58.12e-3], [0.200])
+    T, P = 350.0, np.linspace(1e5, 3e6, 2000)
+    Z, _, _ = mixture.sweep(T, P)
+    Z_vapour, Z_liquid = [mixture.residual_properties(T, P, phase=phase)["Z"] for phase in ("vapour", "liquid")]
+    two = Z_vapour - Z_liquid > 1e-6
+    assert np.any(two & (P > 9.4573e5))
+    np.testing.assert_array_equal(Z[two], Z_vapour[two])
+
+    # Descending from the compressed liquid the liquid branch is kept
+    Z, _, _ = mixture.sweep(T, P[::-1])
+    np.testing.assert_array_equal(Z[two[::-1]], Z_liquid[::-1][two[::-1]])
+
+
+def test_continuation_start_and_switch():
+
+    # Roots 0.1, 0.5, 1.0 with the largest root moving towards the middle one until the branch vanishes
+    roots = [[0.1, 0.5, 1.0 - s] for s in np.linspace(0.0, 0.45, 10)] + [[0.1, 0.1, 0.1]]
+    coeffs = np.array([np.poly(r) for r in roots]).T
+    np.testing.assert_allclose(cubic_continuation(coeffs)[:-1], [r[2] for r in roots[:-1]])
+    np.testing.assert_allclose(cubic_continuation(coeffs, x0=0.0)[:-1], 0.1)
+    np.testing.assert_allclose(cubic_continuation(coeffs, lower=0.2)[:-1], [r[2] for r in roots[:-1]])
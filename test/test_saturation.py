@@ -0,0 +1,57 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.saturation import antoine_pressure, saturation_pressure, SaturationPressure
+
+
+# Water and hydrogen sulfide, Antoine coefficients for mmHg and Celsius
+TCS = [647.1, 373.5]
+PCS = [22.064e6, 8.963e6]
+WS = [0.344, 0.1]
+ANTOINE = [[8.07131, 1730.63, 233.426, (273.15, 373.15)], [7.05496, 1315.92, 237.731]]
+
+
+def test_antoine_range():
+
+    P = antoine_pressure([100.0, 373.15, 400.0], 8.07131, 1730.63, 233.426, 273.15, 373.15)
+    assert np.isnan(P[0]) and np.isnan(P[2])
+    assert np.isclose(P[1], 101325.0, rtol=1e-3)
+
+
+def test_seed_outside_antoine_range():
+
+    # Out of the validity range of the Antoine coefficients the iteration is seeded by Wilson's correlation
+    T = np.array([100.0, 150.0, 200.0, 300.0, 500.0, 640.0])
+    with_antoine = saturation_pressure(T, TCS[:1], PCS[:1], WS[:1], ANTOINE[:1])[0]
+    without = saturation_pressure(T, TCS[:1], PCS[:1], WS[:1])[0]
+    assert np.all(np.isfinite(with_antoine)) and np.all(with_antoine > 0)
+    np.testing.assert_allclose(with_antoine, without, rtol=1e-8)
+
+
+def test_cached_tables():
+
+    saturation = SaturationPressure(TCS, PCS, WS, ANTOINE)
+    T = np.linspace(0.35, 0.99, 9)[np.newaxis, :] * np.array(TCS)[:, np.newaxis]
+    cached = np.array([saturation(T[i], [i])[0] for i in range(len(TCS))])
+    direct = np.array([saturation_pressure(T[i], TCS[i:i + 1], PCS[i:i + 1], WS[i:i + 1])[0] for i in range(len(TCS))])
+    assert saturation.cached == (0, 1)
+    np.testing.assert_allclose(cached, direct, rtol=1e-5)
+
+
+def test_malformed_antoine_coefficients():
+
+    # Entry of benzene in test/thermo_lib.py with the validity range repeated in Celsius
+    benzene = [6.90565, 1211.033, 220.790, 8, 103, (281, 376)]
+    for antoine in ([ANTOINE[0], benzene], [ANTOINE[0], [7.05496, 1315.92, 237.731, (197,)]], [ANTOINE[0]]):
+        with pytest.raises(ValueError, match="component 1" if len(antoine) == 2 else "components"):
+            saturation_pressure(300.0, TCS, PCS, WS, antoine)
+    with pytest.raises(ValueError, match="component 1"):
+        SaturationPressure(TCS, PCS, WS, [ANTOINE[0], benzene])
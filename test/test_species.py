@@ -0,0 +1,73 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.const import R
+from fluid.species import SpeciesRegistry, formula
+
+
+@pytest.fixture(scope="module")
+def registry():
+    return SpeciesRegistry.from_json(os.path.join(PYTHON_PATH, "lib", "fluid_lib.json"), aliases={"natural gas": "Methane"})
+
+
+def test_formula():
+
+    assert formula("H4C") == "CH4"
+    assert formula("i-C4H10") == "C4H10"
+    assert formula("C4H8,isobutene") == "C4H8"
+    assert formula("OH2") == "H2O"
+    assert formula("Methane") is None
+
+
+def test_names_and_aliases(registry):
+
+    methane = registry.index("Methane")
+    assert registry.records[methane]["symbol"] == "CH4"
+    assert registry.index("  METHANE ") == methane
+    assert registry.index("natural gas") == methane
+
+    registry.add_alias("C1", "CH4")
+    assert registry.index("c1") == methane
+    with pytest.raises(KeyError):
+        registry.add_alias("C0", "Unobtainium")
+
+
+def test_formula_lookup(registry):
+
+    # A formula in another order of the elements resolves by the canonical formula
+    assert registry.index("H4C") == registry.index("Methane")
+    assert registry.index("H2S") == registry.index("HydrogenSulfide")
+
+    # The butene isomers share the formula, the key raises with all candidates
+    with pytest.raises(ValueError, match="ambiguous") as error:
+        registry.index("C4H8")
+    for name in ("1-Butene", "2-Butene", "IsoButene"):
+        assert name in str(error.value)
+    assert "C4H8" not in registry
+
+
+def test_unknown(registry):
+
+    with pytest.raises(KeyError):
+        registry.index("Unobtainium")
+    with pytest.raises(KeyError):
+        registry.index("Xe5Q")
+    assert "Unobtainium" not in registry
+
+
+def test_gather(registry):
+
+    keys = ["Methane", "Ethane", "n-Propane"]
+    columns = registry.gather(keys, ["Tc", "mw"])
+    np.testing.assert_allclose(columns["Tc"], [registry.records[registry.index(k)]["Tc"] for k in keys])
+    np.testing.assert_allclose(columns["mw"], [R / registry.records[registry.index(k)]["Rg"] for k in keys])
+    with pytest.raises(ValueError):
+        registry.gather(keys, ["symbol"])
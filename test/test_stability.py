@@ -0,0 +1,65 @@
+import os
+import sys
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.eos import MixtureEoS
+from fluid.flash import pt_flash
+from fluid.stability import stability_test
+
+
+# Wet gas: water, methane, ethane, propane, n-butane, n-pentane, benzene
+TCS = np.array([647.1, 190.6, 305.32, 369.8, 425.12, 469.7, 562.05])
+PCS = np.array([22.064e6, 46e5, 48.72e5, 42.48e5, 37.96e5, 33.7e5, 48.95e5])
+MWS = np.array([18.02e-3, 16.04e-3, 30.07e-3, 44.1e-3, 58.12e-3, 72.15e-3, 78.12e-3])
+WS = np.array([0.344, 0.011, 0.099, 0.152, 0.199, 0.251, 0.212])
+ZS = np.array([0.01, 0.85, 0.07, 0.04, 0.02, 0.007, 0.003])
+
+
+def test_unstable_vapour_trial_with_active_liquid_trial():
+
+    # Dry part of the gas at 200 K. The vapour-like trial proves instability while the liquid-like trial is still
+    # iterating with a positive tangent plane distance, the state must not be reported stable
+    zs = ZS[1:] / ZS[1:].sum()
+    mixture = MixtureEoS(zs, TCS[1:], PCS[1:], MWS[1:], WS[1:])
+    T, P = np.full(2, 200.0), np.array([3.16e6, 3.98e6])
+    test = stability_test(mixture, T, P)
+    assert not np.any(test["stable"])
+    assert np.all(test["tm"][:, 0] < -1e-8) and np.all(test["tm"][:, 1] > 0)
+
+    # Equilibrium ratios come from the unstable vapour-like trial
+    W = test["W"][:, 0] / test["W"][:, 0].sum(axis=-1, keepdims=True)
+    np.testing.assert_allclose(test["K"], W / zs)
+    flash = pt_flash(mixture, T, P)
+    assert np.all((flash["beta"] > 0) & (flash["beta"] < 1))
+
+
+def test_wet_gas_trial_selection():
+
+    # The vapour-like trial of the wet gas is stable, the equilibrium ratios come from the aqueous liquid-like trial
+    mixture = MixtureEoS(ZS, TCS, PCS, MWS, WS)
+    T, P = np.array([220.0, 250.0, 280.0]), np.full(3, 4e6)
+    test = stability_test(mixture, T, P)
+    assert not np.any(test["stable"])
+    assert np.all(test["tm"][:, 0] > -1e-8) and np.all(test["tm"][:, 1] < -1e-8)
+    W = test["W"][:, 1] / test["W"][:, 1].sum(axis=-1, keepdims=True)
+    np.testing.assert_allclose(test["K"], ZS / W)
+
+    flash = pt_flash(mixture, T, P)
+    np.testing.assert_allclose(flash["beta"], [0.99000318, 0.99004325, 0.99037959], rtol=1e-6)
+    assert np.all(flash["xs"][:, 0] > 0.999)
+
+
+def test_no_states_and_no_iterations():
+
+    mixture = MixtureEoS(ZS, TCS, PCS, MWS, WS)
+    test = stability_test(mixture, np.array([]), np.array([]))
+    assert test["stable"].shape == (0,) and test["tm"].shape == (0, 2) and test["K"].shape == (0, ZS.size)
+    with pytest.raises(ValueError):
+        stability_test(mixture, 300.0, 5e6, max_iter=0)
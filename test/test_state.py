@@ -0,0 +1,48 @@
+import os
+import sys
+import numpy as np
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.eos import MixtureEoS
+from fluid.state import MixtureState
+
+
+TCS = [647.1, 190.6, 305.32, 369.8, 425.12]
+PCS = [22.064e6, 46e5, 48.72e5, 42.48e5, 37.96e5]
+MWS = [18.02e-3, 16.04e-3, 30.07e-3, 44.1e-3, 58.12e-3]
+WS = [0.344, 0.011, 0.099, 0.152, 0.199]
+ZS = [0.01, 0.85, 0.07, 0.04, 0.03]
+
+
+def test_rank_one_updates():
+
+    mixture = MixtureEoS(ZS, TCS, PCS, MWS, WS)
+    state = MixtureState(mixture, 300.0)
+    state.update({0: 0.05, 3: 0.0})
+    ys = np.array(state.ys)
+    reference = MixtureEoS(ys, TCS, PCS, MWS, WS)
+    assert np.isclose(state.a_mix, reference.attraction(300.0)[0], rtol=1e-12)
+    assert np.isclose(state.b_mix, reference.b_mix, rtol=1e-12)
+
+
+def test_same_temperature_keeps_state():
+
+    calls = []
+    mixture = MixtureEoS(ZS, TCS, PCS, MWS, WS)
+    attraction = mixture.attraction
+    mixture.attraction = lambda *args, **kwargs: calls.append(args) or attraction(*args, **kwargs)
+
+    state = MixtureState(mixture, 300.0)
+    state.set(1, 0.5)
+    a_mix = state.a_mix
+    state.refresh = lambda: calls.append("refresh")
+    state.set_temperature(300.0)
+    assert len(calls) == 1 and state.a_mix == a_mix
+
+    state.set_temperature(350.0)
+    assert len(calls) == 3
@@ -0,0 +1,29 @@
+import os
+import sys
+import numpy as np
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.mixing import prausnitz_gunn
+from fluid.sweep import composition_sweep
+
+
+TCS = [190.6, 305.32, 369.8]
+PCS = [46e5, 48.72e5, 42.48e5]
+MWS = [16.04e-3, 30.07e-3, 44.1e-3]
+WS = [0.011, 0.099, 0.152]
+VCS = [98.6e-6, 145.5e-6, 200e-6]
+
+
+def test_prausnitz_gunn_methods():
+
+    ys = np.array([[0.8, 0.15, 0.05], [0.5, 0.3, 0.2]])
+    sweep = composition_sweep(ys, 300.0, 5e6, TCS, PCS, MWS, WS, VCS, Tc_method="binary", Vc_method="binary")
+    for k, y in enumerate(ys):
+        reference = prausnitz_gunn(y, *[np.array(x) for x in (TCS, VCS, WS, MWS)], "binary", "binary")
+        for key in ("Tc_mix", "Pc_mix", "Vc_mix"):
+            assert np.isclose(sweep[key][k], reference[key], rtol=1e-12)
@@ -0,0 +1,86 @@
+import os
+import sys
+import json
+import pickle
+import numpy as np
+import pytest
+
+
+PYTHON_PATH = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), os.pardir
+))
+sys.path.append(PYTHON_PATH)
+
+from fluid.eos import MixtureEoS
+from fluid.table import build_table, PropertyTable
+
+
+THERMO = ["CH4", "C2H6", "C3H8"]
+T_GRID = np.linspace(250.0, 400.0, 16)
+P_GRID = np.linspace(1e5, 1e7, 11)
+
+
+@pytest.fixture(scope="module")
+def mixture():
+    return MixtureEoS([0.9, 0.07, 0.03], [190.6, 305.32, 369.8], [46e5, 48.72e5, 42.48e5], [16.04e-3, 30.07e-3, 44.1e-3], [0.011, 0.099, 0.152])
+
+
+@pytest.fixture(scope="module")
+def table(mixture, tmp_path_factory):
+
+    with open(os.path.join(PYTHON_PATH, "lib", "thermo.json"), "r") as fp:
+        database = json.load(fp)
+    coefficients = [database[key]["coefficients"] for key in THERMO]
+    return PropertyTable(build_table(str(tmp_path_factory.mktemp("table")), mixture, coefficients, T_GRID, P_GRID))
+
+
+def test_nodes(mixture, table):
+
+    T, P = np.meshgrid(T_GRID, P_GRID, indexing="ij")
+    result = table(T, P)
+    reference = mixture.residual_properties(T, P, phase="stable")
+    np.testing.assert_allclose(result["Z"], reference["Z"], rtol=1e-14)
+    np.testing.assert_allclose(result["rho"], reference["rho"], rtol=1e-14)
+    assert not np.any(result["out_of_range"])
+
+
+def test_between_nodes(mixture, table):
+
+    # Cell centres are the farthest states from the nodes
+    T, P = np.meshgrid(0.5 * (T_GRID[1:] + T_GRID[:-1]), 0.5 * (P_GRID[1:] + P_GRID[:-1]), indexing="ij")
+    result = table(T, P, ["Z", "rho"])
+    reference = mixture.residual_properties(T, P, phase="stable")
+    np.testing.assert_allclose(result["Z"], reference["Z"], rtol=1e-3)
+    np.testing.assert_allclose(result["rho"], reference["rho"], rtol=3e-3)
+
+
+def test_derivatives(table):
+
+    # States off the nodes, the central differences stay within a cell
+    T, P = np.meshgrid(np.linspace(256.0, 394.0, 9), np.linspace(2.5e5, 9.8e6, 7), indexing="ij")
+    result = table(T, P, ["Z"], derivatives=True)
+    dT, dP = 1e-3, 1.0
+    dZ_dT = (table(T + dT, P, ["Z"])["Z"] - table(T - dT, P, ["Z"])["Z"]) / (2 * dT)
+    dZ_dP = (table(T, P + dP, ["Z"])["Z"] - table(T, P - dP, ["Z"])["Z"]) / (2 * dP)
+    np.testing.assert_allclose(result["dZ_dT"], dZ_dT, rtol=1e-6, atol=1e-12)
+    np.testing.assert_allclose(result["dZ_dP"], dZ_dP, rtol=1e-6, atol=1e-18)
+
+
+def test_out_of_range(table):
+
+    T = np.array([200.0, 300.0, 300.0, 450.0, 300.0])
+    P = np.array([5e6, 5e4, 5e6, 5e6, 2e7])
+    result = table(T, P, ["Z"])
+    np.testing.assert_array_equal(result["out_of_range"], [True, True, False, True, True])
+
+    # States outside of the grid are clamped to its boundary
+    np.testing.assert_allclose(result["Z"][0], table(250.0, 5e6, ["Z"])["Z"])
+
+
+def test_pickle(table):
+
+    clone = pickle.loads(pickle.dumps(table))
+    assert clone.path == table.path
+    assert isinstance(clone.T, np.memmap)
+    T, P = np.array([260.0, 333.0]), np.array([3e5, 7.7e6])
+    np.testing.assert_array_equal(clone(T, P)["h"], table(T, P)["h"])